@@ -0,0 +1,76 @@
+"""
+Measures the wire path under the connector (aio-pika / aiormq channels, frames, publisher confirms, acks) against the
+in-process broker emulator, so results are reproducible offline: messages are published with confirms and consumed by
+the compiled consumer pipeline of the controller.
+
+Usage: PYTHONPATH=src:. python scripts/benchmarks/connector_wire.py [messages] [prefetch count]
+"""
+
+import asyncio
+import sys
+import time
+
+import aio_pika
+from aio_pika.abc import AbstractIncomingMessage
+
+from asynchron.amqp.connector import AmqpConnector
+from asynchron.amqp.controller import AioPikaBasedAmqpController
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpServerBindings
+from asynchron.core.consumer import CallableMessageConsumer
+from asynchron.core.message import MessageDecoder
+from tests.amqp_broker import AmqpBrokerEmulator
+
+BATCH_SIZE = 100
+
+
+class BodyDecoder(MessageDecoder[AbstractIncomingMessage, bytes]):
+    def decode(self, message: AbstractIncomingMessage) -> bytes:
+        return message.body
+
+
+async def run(count: int, prefetch_count: int) -> None:
+    async with AmqpBrokerEmulator() as broker, \
+            AmqpConnector(AmqpServerBindings(connection_url=broker.url)) as connector:
+        consumed = 0
+        done = asyncio.Event()
+
+        async def handle(body: bytes) -> None:
+            nonlocal consumed
+            consumed += 1
+            if consumed == count:
+                done.set()
+
+        controller = AioPikaBasedAmqpController(connector)
+        controller.bind_consumer(
+            decoder=BodyDecoder(),
+            consumer=CallableMessageConsumer(handle),
+            bindings=AmqpConsumerBindings("bench", ("bench",), exchange_type="direct", queue_name="bench",
+                                          prefetch_count=prefetch_count),
+        )
+        await controller.start()
+
+        _, exchange = await connector.create_exchange("bench", "direct")
+        body = b"x" * 256
+
+        started_at = time.perf_counter()
+        for offset in range(0, count, BATCH_SIZE):
+            await asyncio.gather(*(
+                exchange.publish(aio_pika.Message(body=body), "bench")
+                for _ in range(min(BATCH_SIZE, count - offset))
+            ))
+
+        published_at = time.perf_counter()
+        await done.wait()
+        consumed_at = time.perf_counter()
+
+        await controller.stop()
+
+    print(f"published (confirmed): {count / (published_at - started_at):>10.0f} msg/s")
+    print(f"published + consumed:  {count / (consumed_at - started_at):>10.0f} msg/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    ))
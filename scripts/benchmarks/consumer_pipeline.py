@@ -0,0 +1,92 @@
+"""
+Measures per message overhead of the consumer pipeline: nested consumer wrappers versus the compiled pipeline.
+
+Usage: python scripts/benchmarks/consumer_pipeline.py [messages]
+"""
+
+import asyncio
+import sys
+import time
+import typing as t
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from asynchron.amqp.consumer.pipeline import ConsumerPipelineCompiler
+from asynchron.amqp.consumer.processing import ProcessingMessageConsumer
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import CallableMessageConsumer, DecodedMessageConsumer, MessageConsumerFunc
+from asynchron.core.message import MessageDecoder
+
+
+class FakeChannel:
+    is_closed = False
+
+
+class FakeIncomingMessage:
+    channel = FakeChannel()
+    redelivered = False
+    processed = False
+    body = b"{}"
+
+    async def ack(self, multiple: bool = False) -> None:
+        pass
+
+    async def reject(self, requeue: bool = False) -> None:
+        pass
+
+    def process(self, requeue: bool = False, reject_on_redelivered: bool = False,
+                ignore_processed: bool = False) -> "FakeProcessContext":
+        return FakeProcessContext(self)
+
+
+class FakeProcessContext:
+    def __init__(self, message: FakeIncomingMessage) -> None:
+        self.message = message
+
+    async def __aenter__(self) -> FakeIncomingMessage:
+        return self.message
+
+    async def __aexit__(self, *args: object) -> None:
+        if args[0] is None:
+            await self.message.ack()
+        else:
+            await self.message.reject()
+
+
+class BodyDecoder(MessageDecoder[AbstractIncomingMessage, bytes]):
+    def decode(self, message: AbstractIncomingMessage) -> bytes:
+        return message.body
+
+
+async def handle(message: bytes) -> None:
+    pass
+
+
+async def measure(name: str, func: MessageConsumerFunc[AbstractIncomingMessage], count: int) -> float:
+    message = t.cast(AbstractIncomingMessage, FakeIncomingMessage())
+
+    started_at = time.perf_counter()
+    for _ in range(count):
+        await func(message)
+    elapsed = time.perf_counter() - started_at
+
+    print(f"{name:<24} {elapsed / count * 1e9:10.1f} ns/message")
+    return elapsed
+
+
+async def main(count: int) -> None:
+    bindings = AmqpConsumerBindings(exchange_name="bench", binding_keys=("bench",))
+
+    nested = ProcessingMessageConsumer(
+        consumer=DecodedMessageConsumer(decoder=BodyDecoder(), consumer=CallableMessageConsumer(handle)),
+    )
+    compiled = ConsumerPipelineCompiler().compile(BodyDecoder(), CallableMessageConsumer(handle), bindings)
+
+    before = await measure("nested wrappers", nested.consume, count)
+    after = await measure("compiled pipeline", compiled.func, count)
+
+    print(f"speedup                  {before / after:10.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
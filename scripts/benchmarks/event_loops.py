@@ -0,0 +1,103 @@
+"""
+Compares event loop implementations on the consume / publish path: every delivery is handled in its own task (as
+aiormq does), decoded by the compiled pipeline and republished through the exchange publisher.
+
+Usage: python scripts/benchmarks/event_loops.py [messages]
+"""
+
+import asyncio
+import sys
+import time
+import typing as t
+
+from aio_pika.abc import AbstractExchange, AbstractIncomingMessage, AbstractMessage
+
+from asynchron.amqp.consumer.pipeline import ConsumerPipelineCompiler
+from asynchron.amqp.publisher.exchange import ExchangeMessagePublisher
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.application import EventLoopPolicy, get_event_loop_factory
+from asynchron.core.consumer import CallableMessageConsumer
+from asynchron.core.message import MessageDecoder
+
+BATCH_SIZE = 100
+
+
+class FakeChannel:
+    is_closed = False
+
+
+class FakeIncomingMessage:
+    channel = FakeChannel()
+    redelivered = False
+    processed = False
+    body = b"{}"
+    headers_raw: t.Dict[str, object] = {}
+
+    async def ack(self, multiple: bool = False) -> None:
+        await asyncio.sleep(0)
+
+    async def reject(self, requeue: bool = False) -> None:
+        await asyncio.sleep(0)
+
+
+class FakeExchange:
+    async def publish(self, message: AbstractMessage, routing_key: str, *, mandatory: bool = True) -> None:
+        # a frame write, that yields to the loop once
+        await asyncio.sleep(0)
+
+
+class BodyDecoder(MessageDecoder[AbstractIncomingMessage, bytes]):
+    def decode(self, message: AbstractIncomingMessage) -> bytes:
+        return message.body
+
+
+async def run(count: int) -> float:
+    publisher = ExchangeMessagePublisher("bench", True, exchange=t.cast(AbstractExchange, FakeExchange()))
+    outgoing = t.cast(AbstractMessage, object())
+
+    async def handle(body: bytes) -> None:
+        await publisher.publish(outgoing)
+
+    consumer = ConsumerPipelineCompiler().compile(
+        BodyDecoder(),
+        CallableMessageConsumer(handle),
+        AmqpConsumerBindings(exchange_name="bench", binding_keys=("bench",)),
+    )
+    message = t.cast(AbstractIncomingMessage, FakeIncomingMessage())
+    loop = asyncio.get_running_loop()
+
+    started_at = time.perf_counter()
+    for _ in range(count // BATCH_SIZE):
+        await asyncio.gather(*(loop.create_task(consumer.func(message)) for _ in range(BATCH_SIZE)))
+
+    return time.perf_counter() - started_at
+
+
+def measure(name: str, policy: EventLoopPolicy, count: int) -> t.Optional[float]:
+    try:
+        loop = get_event_loop_factory(policy)()
+
+    except ImportError:
+        print(f"{name:<10} not installed")
+        return None
+
+    try:
+        elapsed = loop.run_until_complete(run(count))
+
+    finally:
+        loop.close()
+
+    print(f"{name:<10} {elapsed / count * 1e9:10.1f} ns/message")
+    return elapsed
+
+
+def main(count: int) -> None:
+    baseline = measure("asyncio", "asyncio", count)
+    uvloop = measure("uvloop", "uvloop", count)
+
+    if baseline is not None and uvloop is not None:
+        print(f"speedup    {baseline / uvloop:10.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
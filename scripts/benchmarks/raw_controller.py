@@ -0,0 +1,103 @@
+"""
+Compares the aio-pika based controller with the aiormq based fast path: messages are published with confirms by a
+bound publisher and consumed by a bound consumer, both against the in-process broker emulator.
+
+Usage: PYTHONPATH=src:. python scripts/benchmarks/raw_controller.py [messages] [prefetch count]
+"""
+
+import asyncio
+import sys
+import time
+import typing as t
+
+import aio_pika
+from aio_pika.abc import AbstractMessage
+from pamqp import commands
+
+from asynchron.amqp.connector import AmqpConnector
+from asynchron.amqp.controller import AioPikaBasedAmqpController
+from asynchron.amqp.raw.connector import AiormqConnector
+from asynchron.amqp.raw.controller import AiormqBasedAmqpController
+from asynchron.amqp.raw.message import PropertiesTemplate, RawDelivery, RawMessage
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings, AmqpServerBindings
+from asynchron.core.consumer import CallableMessageConsumer
+from asynchron.core.controller import Controller
+from asynchron.core.message import MessageDecoder, MessageEncoder
+from tests.amqp_broker import AmqpBrokerEmulator
+
+BATCH_SIZE = 100
+
+
+class AioPikaBytesSerializer(MessageDecoder[AbstractMessage, bytes], MessageEncoder[bytes, AbstractMessage]):
+    def decode(self, message: AbstractMessage) -> bytes:
+        return message.body
+
+    def encode(self, message: bytes) -> AbstractMessage:
+        return aio_pika.Message(body=message, content_type="application/octet-stream")
+
+
+class RawBytesSerializer(MessageDecoder[RawDelivery, bytes], MessageEncoder[bytes, RawMessage]):
+    properties = PropertiesTemplate(commands.Basic.Properties(content_type="application/octet-stream"))
+
+    def decode(self, message: RawDelivery) -> bytes:
+        return message.body.obj  # type: ignore[return-value]
+
+    def encode(self, message: bytes) -> RawMessage:
+        return RawMessage(message, self.properties)
+
+
+async def measure(
+        name: str,
+        controller: Controller[t.Any, AmqpConsumerBindings, t.Any, AmqpPublisherBindings],
+        serializer: t.Any,
+        count: int,
+        prefetch_count: int,
+) -> None:
+    consumed = 0
+    done = asyncio.Event()
+
+    async def handle(body: bytes) -> None:
+        nonlocal consumed
+        consumed += 1
+        if consumed == count:
+            done.set()
+
+    controller.bind_consumer(serializer, CallableMessageConsumer(handle),
+                             AmqpConsumerBindings("bench", ("bench",), exchange_type="direct", queue_name=name,
+                                                  prefetch_count=prefetch_count))
+    publisher = controller.bind_publisher(serializer, AmqpPublisherBindings("bench", "bench", exchange_type="direct"))
+    await controller.start()
+
+    body = b"x" * 256
+    started_at = time.perf_counter()
+    for offset in range(0, count, BATCH_SIZE):
+        await asyncio.gather(*(publisher.publish(body) for _ in range(min(BATCH_SIZE, count - offset))))
+
+    published_at = time.perf_counter()
+    await done.wait()
+    consumed_at = time.perf_counter()
+
+    await controller.stop()
+
+    print(f"{name:<8} published (confirmed): {count / (published_at - started_at):>10.0f} msg/s, "
+          f"published + consumed: {count / (consumed_at - started_at):>10.0f} msg/s")
+
+
+async def run(count: int, prefetch_count: int) -> None:
+    async with AmqpBrokerEmulator() as broker:
+        bindings = AmqpServerBindings(connection_url=broker.url)
+
+        async with AmqpConnector(bindings) as connector:
+            await measure("aio-pika", AioPikaBasedAmqpController(connector), AioPikaBytesSerializer(), count,
+                          prefetch_count)
+
+        async with AiormqConnector(bindings) as raw_connector:
+            await measure("aiormq", AiormqBasedAmqpController(raw_connector), RawBytesSerializer(), count,
+                          prefetch_count)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    ))
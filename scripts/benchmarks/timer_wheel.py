@@ -0,0 +1,57 @@
+"""
+Compares memory and time of scheduling messages with a loop timer per message and with the timer wheel of the
+scheduled publisher. Messages are scheduled within an hour and are not published.
+
+Usage: PYTHONPATH=src python scripts/benchmarks/timer_wheel.py [messages]
+"""
+
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+import typing as t
+
+from asynchron.core.publisher import MessagePublisher
+from asynchron.core.scheduler import ScheduledMessagePublisher
+
+
+class NullPublisher(MessagePublisher[int]):
+    async def publish(self, message: int) -> None:
+        pass
+
+
+async def measure(name: str, schedule: t.Callable[[int, float], t.Awaitable[None]], delays: t.Sequence[float]) -> None:
+    tracemalloc.start()
+    started_at = time.perf_counter()
+
+    for message, delay in enumerate(delays):
+        await schedule(message, delay)
+
+    elapsed = time.perf_counter() - started_at
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:>12}: {len(delays) / elapsed:12.0f} msg/s, {memory / len(delays):6.1f} B/msg")
+
+
+async def main(count: int) -> None:
+    rnd = random.Random(42)
+    delays = [rnd.uniform(1.0, 3600.0) for _ in range(count)]
+    loop = asyncio.get_running_loop()
+    handles: t.List[asyncio.TimerHandle] = []
+
+    async def call_later(message: int, delay: float) -> None:
+        handles.append(loop.call_later(delay, print, message))
+
+    await measure("call_later", call_later, delays)
+    for handle in handles:
+        handle.cancel()
+    handles.clear()
+
+    scheduled = ScheduledMessagePublisher(NullPublisher())
+    await measure("timer wheel", scheduled.publish_after, delays)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
@@ -0,0 +1,81 @@
+__all__ = (
+    "QueueLeaderLocator",
+    "MappingQueueLeaderLocator",
+    "ManagementApiQueueLeaderLocator",
+)
+
+import abc
+import asyncio
+import base64
+import json
+import typing as t
+import urllib.parse
+import urllib.request
+
+
+class QueueLeaderLocator(metaclass=abc.ABCMeta):
+    """Locates the cluster node, that leads a queue, consumers of the queue are connected to that node."""
+
+    @abc.abstractmethod
+    async def locate(self, queue_name: str) -> t.Optional[str]:
+        """Returns connection url of the node or none, when the node is not known."""
+        raise NotImplementedError
+
+
+class MappingQueueLeaderLocator(QueueLeaderLocator):
+    def __init__(self, node_urls: t.Mapping[str, str]) -> None:
+        self.__node_urls = node_urls
+
+    async def locate(self, queue_name: str) -> t.Optional[str]:
+        return self.__node_urls.get(queue_name)
+
+
+class ManagementApiQueueLeaderLocator(QueueLeaderLocator):
+    """
+    Reads the leader (quorum queues) or the node (classic queues) of a queue from the RabbitMQ management HTTP API.
+    Node names, like `rabbit@node-1`, are mapped to connection urls. Lookup errors are treated as unknown nodes.
+    """
+
+    def __init__(
+            self,
+            api_url: str,
+            node_urls: t.Mapping[str, str],
+            vhost: str = "/",
+            timeout: float = 5.0,
+    ) -> None:
+        parsed_url = urllib.parse.urlsplit(api_url)
+        # credentials are sent in the authorization header, urllib doesn't take them from the url.
+        self.__api_url = urllib.parse.urlunsplit(parsed_url._replace(netloc=parsed_url.netloc.rpartition("@")[2]))
+        # url credentials are percent-encoded, the header carries them as they are.
+        username = urllib.parse.unquote(parsed_url.username or "guest")
+        password = urllib.parse.unquote(parsed_url.password or "guest")
+        self.__authorization = "Basic " + base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+        self.__node_urls = node_urls
+        self.__vhost = vhost
+        self.__timeout = timeout
+
+    async def locate(self, queue_name: str) -> t.Optional[str]:
+        try:
+            queue = await asyncio.get_running_loop().run_in_executor(None, self.__get_queue, queue_name)
+
+        except (OSError, ValueError):
+            return None
+
+        node_name = queue.get("leader") or queue.get("node")
+
+        return self.__node_urls.get(node_name) if isinstance(node_name, str) else None
+
+    def __get_queue(self, queue_name: str) -> t.Mapping[str, object]:
+        request = urllib.request.Request(
+            url=f"{self.__api_url.rstrip('/')}/api/queues/{urllib.parse.quote(self.__vhost, safe='')}/"
+                f"{urllib.parse.quote(queue_name, safe='')}",
+            headers={"Authorization": self.__authorization},
+        )
+
+        with urllib.request.urlopen(request, timeout=self.__timeout) as response:
+            queue = json.load(response)
+
+        if not isinstance(queue, dict):
+            raise ValueError("Unexpected queue info", queue)
+
+        return queue
@@ -4,39 +4,105 @@ __all__ = (
 
 import abc
 import asyncio
+import functools as ft
 import typing as t
 from types import TracebackType
 
 import aio_pika
 from aio_pika.abc import (
     AbstractChannel,
+    AbstractConnection,
     AbstractExchange,
     AbstractIncomingMessage,
     AbstractQueue,
     AbstractRobustConnection,
 )
+from aio_pika.exceptions import CONNECTION_EXCEPTIONS
+from pamqp.common import Arguments
 
+from asynchron.amqp.cluster import MappingQueueLeaderLocator, QueueLeaderLocator
+from asynchron.amqp.rpc import DIRECT_REPLY_TO_QUEUE
 from asynchron.core.amqp import AmqpServerBindings
 from asynchron.core.consumer import MessageConsumerFunc
 
 T = t.TypeVar("T")
 
+FailoverCallback = t.Callable[[T], None]
+
+
+class _PlacedConsumer:
+    """Queue of a consumer placement, a consumer, that fails over while paused, is not consuming the new queue."""
+
+    __slots__ = ("queue", "is_paused",)
+
+    def __init__(self) -> None:
+        self.queue: t.Optional[AbstractQueue] = None
+        self.is_paused = False
+
+
+class _Placement:
+    """Channel objects created on a cluster node, they are created again on another node, when the node drops."""
+
+    __slots__ = ("queue_name", "consumer", "fail_over",)
+
+    def __init__(
+            self,
+            queue_name: t.Optional[str],
+            consumer: t.Optional[_PlacedConsumer],
+            fail_over: t.Callable[["_Placement"], t.Awaitable[None]],
+    ) -> None:
+        self.queue_name = queue_name
+        self.consumer = consumer
+        self.fail_over = fail_over
+
+
+class _Node:
+    __slots__ = ("url", "connection", "placements",)
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.connection: t.Optional[AbstractConnection] = None
+        self.placements: t.List[_Placement] = []
+
 
 class AmqpConnector(t.AsyncContextManager["AmqpConnector"], metaclass=abc.ABCMeta):
+    """
+    Connects to a single broker with a robust connection or to each node of a cluster, when `node_urls` are set. In a
+    cluster consumers are placed on the node, that leads their queue, other channels are spread across nodes. When a
+    node drops, its channels, exchanges and consumers are created on another node (`on_failover` callbacks get the new
+    objects) and the node is reconnected in background.
+    """
+
     def __init__(
             self,
             bindings: AmqpServerBindings,
+            leader_locator: t.Optional[QueueLeaderLocator] = None,
+            reconnect_interval: float = 5.0,
     ) -> None:
         self.__bindings = bindings
+        self.__leader_locator = leader_locator if leader_locator is not None \
+            else MappingQueueLeaderLocator(bindings.queue_node_urls) if bindings.queue_node_urls else None
+        self.__reconnect_interval = reconnect_interval
 
         self.__lock: t.Optional[asyncio.Lock] = None
         self.__connection: t.Optional[AbstractRobustConnection] = None
+        self.__nodes: t.Dict[str, _Node] = {}
+        self.__node_counter = 0
+        self.__tasks: t.Set["asyncio.Task[None]"] = set()
+
+    @property
+    def is_clustered(self) -> bool:
+        return bool(self.__bindings.node_urls)
 
     async def __aenter__(self) -> "AmqpConnector":
         lock = self.__lock = (self.__lock or asyncio.Lock())
 
         async with lock:
-            if self.__connection is None:
+            if self.is_clustered:
+                if not self.__nodes:
+                    await self.__connect_nodes()
+
+            elif self.__connection is None:
                 self.__connection = await aio_pika.connect_robust(self.__bindings.connection_url)
 
         return self
@@ -47,9 +113,26 @@ class AmqpConnector(t.AsyncContextManager["AmqpConnector"], metaclass=abc.ABCMet
             __exc_value: t.Optional[BaseException],
             __traceback: t.Optional[TracebackType],
     ) -> t.Optional[bool]:
+        connections: t.List[AbstractConnection] = []
+
         if self.__connection is not None:
-            connection, self.__connection = self.__connection, None
+            connections.append(self.__connection)
+            self.__connection = None
 
+        nodes, self.__nodes = self.__nodes, {}
+        for node in nodes.values():
+            if node.connection is not None:
+                connections.append(node.connection)
+                node.connection = None
+
+        tasks = tuple(self.__tasks)
+        for task in tasks:
+            task.cancel()
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for connection in connections:
             if __exc_type is not None:
                 await connection.close(__exc_type)
 
@@ -58,26 +141,30 @@ class AmqpConnector(t.AsyncContextManager["AmqpConnector"], metaclass=abc.ABCMet
 
         return None
 
-    async def create_channel(self, prefetch_count: t.Optional[int]) -> AbstractChannel:
-        if self.__connection is None:
-            raise RuntimeError()
-
-        channel = await self.__connection.channel()
-        await channel.set_qos(prefetch_count=prefetch_count or 0)
-
-        return channel
+    async def create_channel(
+            self,
+            prefetch_count: t.Optional[int],
+            on_failover: t.Optional[FailoverCallback[AbstractChannel]] = None,
+    ) -> AbstractChannel:
+        return await self.__open(None, ft.partial(self.__create_channel, prefetch_count=prefetch_count), on_failover)
 
     async def create_exchange(
             self,
             exchange_name: t.Optional[str] = None,
             exchange_type: t.Optional[t.Literal["fanout", "direct", "topic", "headers"]] = None,
             prefetch_count: t.Optional[int] = None,
+            on_failover: t.Optional[FailoverCallback[t.Tuple[AbstractChannel, AbstractExchange]]] = None,
+            exchange_durable: bool = False,
+            exchange_auto_delete: bool = False,
     ) -> t.Tuple[AbstractChannel, AbstractExchange]:
-        channel = await self.create_channel(prefetch_count)
+        async def create(connection: AbstractConnection) -> t.Tuple[AbstractChannel, AbstractExchange]:
+            channel = await self.__create_channel(connection, prefetch_count)
+            exchange = await channel.declare_exchange(exchange_name or "", exchange_type or "direct",
+                                                      durable=exchange_durable, auto_delete=exchange_auto_delete)
 
-        exchange = await channel.declare_exchange(exchange_name or "", exchange_type or "direct")
+            return channel, exchange
 
-        return channel, exchange
+        return await self.__open(None, create, on_failover)
 
     async def create_consumer(
             self,
@@ -87,25 +174,269 @@ class AmqpConnector(t.AsyncContextManager["AmqpConnector"], metaclass=abc.ABCMet
             exchange_type: t.Optional[t.Literal["fanout", "direct", "topic", "headers"]] = None,
             queue_name: t.Optional[str] = None,
             prefetch_count: t.Optional[int] = None,
+            on_failover: t.Optional[FailoverCallback[t.Tuple[AbstractChannel, AbstractQueue, t.Optional[str]]]] = None,
+            exchange_durable: bool = False,
+            exchange_auto_delete: bool = False,
+            queue_durable: bool = False,
+            queue_exclusive: bool = False,
+            queue_auto_delete: bool = False,
+            queue_arguments: t.Optional[t.Mapping[str, object]] = None,
     ) -> t.Tuple[AbstractChannel, AbstractQueue, str]:
-        channel, exchange = await self.create_exchange(
-            exchange_name=exchange_name,
-            exchange_type=exchange_type,
-            prefetch_count=prefetch_count,
-        )
+        """Consumers, that are paused, fail over without a consumer tag and consume the new queue, when resumed."""
+
+        placed = _PlacedConsumer()
 
-        queue = await channel.declare_queue(queue_name or "")
+        async def create(connection: AbstractConnection) -> t.Tuple[AbstractChannel, AbstractQueue, t.Optional[str]]:
+            channel = await self.__create_channel(connection, prefetch_count)
+            exchange = await channel.declare_exchange(exchange_name or "", exchange_type or "direct",
+                                                      durable=exchange_durable, auto_delete=exchange_auto_delete)
 
-        for binding_key in binding_keys:
-            await queue.bind(exchange, binding_key)
+            queue = await channel.declare_queue(queue_name or "", durable=queue_durable, exclusive=queue_exclusive,
+                                                auto_delete=queue_auto_delete,
+                                                arguments=t.cast(Arguments, dict(queue_arguments or {})))
 
-        consumer_tag = await queue.consume(consumer)
+            for binding_key in binding_keys:
+                await queue.bind(exchange, binding_key)
+
+            placed.queue = queue
+            consumer_tag = await queue.consume(consumer) if not placed.is_paused else None
+
+            return channel, queue, consumer_tag
+
+        channel, queue, consumer_tag = await self.__open(queue_name, create, on_failover, placed)
+        if consumer_tag is None:
+            raise RuntimeError()
 
         return channel, queue, consumer_tag
 
+    async def create_reply_consumer(
+            self,
+            consumer: MessageConsumerFunc[AbstractIncomingMessage],
+            on_failover: t.Optional[FailoverCallback[t.Tuple[AbstractChannel, AbstractQueue, str]]] = None,
+    ) -> t.Tuple[AbstractChannel, AbstractQueue, str]:
+        placed = _PlacedConsumer()
+
+        async def create(connection: AbstractConnection) -> t.Tuple[AbstractChannel, AbstractQueue, str]:
+            channel = await self.__create_channel(connection, None)
+
+            # direct reply-to pseudo queue can't be declared and must be consumed in no ack mode.
+            queue = placed.queue = await channel.get_queue(DIRECT_REPLY_TO_QUEUE, ensure=False)
+            consumer_tag = await queue.consume(consumer, no_ack=True)
+
+            return channel, queue, consumer_tag
+
+        return await self.__open(None, create, on_failover, placed)
+
+    async def create_retry_queues(
+            self,
+            queue_name: str,
+            retry_delays: t.Sequence[int],
+            on_failover: t.Optional[FailoverCallback[
+                t.Tuple[AbstractChannel, AbstractExchange, t.Sequence[str], str]
+            ]] = None,
+    ) -> t.Tuple[AbstractChannel, AbstractExchange, t.Sequence[str], str]:
+        async def create(
+                connection: AbstractConnection,
+        ) -> t.Tuple[AbstractChannel, AbstractExchange, t.Sequence[str], str]:
+            channel = await self.__create_channel(connection, None)
+
+            retry_queue_names: t.List[str] = []
+            for delay in retry_delays:
+                retry_queue = await channel.declare_queue(
+                    name=f"{queue_name}.retry.{delay}",
+                    durable=True,
+                    arguments={
+                        "x-message-ttl": delay,
+                        # expired messages are routed back to the origin queue only, not to other queues of the
+                        # exchange.
+                        "x-dead-letter-exchange": "",
+                        "x-dead-letter-routing-key": queue_name,
+                    },
+                )
+                retry_queue_names.append(retry_queue.name)
+
+            parking_queue = await channel.declare_queue(name=f"{queue_name}.parking", durable=True)
+
+            return channel, channel.default_exchange, retry_queue_names, parking_queue.name
+
+        return await self.__open(None, create, on_failover)
+
     async def remove_consumer(
             self,
             queue: AbstractQueue,
-            consumer_tag: str,
+            consumer_tag: t.Optional[str],
     ) -> None:
+        """Removes a consumer of the queue, consumers, that are paused, have no consumer tag."""
+
+        for node in self.__nodes.values():
+            node.placements = [
+                placement
+                for placement in node.placements
+                if placement.consumer is None or placement.consumer.queue is not queue
+            ]
+
+        if consumer_tag is not None:
+            await queue.cancel(consumer_tag)
+
+    async def pause_consumer(self, queue: AbstractQueue, consumer_tag: str) -> None:
+        """Cancels a consumer of the queue, in a cluster it keeps its placement and fails over paused."""
+
+        placed = self.__get_placed_consumer(queue)
+        if placed is not None:
+            placed.is_paused = True
+
         await queue.cancel(consumer_tag)
+
+    async def resume_consumer(
+            self,
+            queue: AbstractQueue,
+            consumer: MessageConsumerFunc[AbstractIncomingMessage],
+    ) -> str:
+        placed = self.__get_placed_consumer(queue)
+        if placed is not None:
+            placed.is_paused = False
+
+        return await queue.consume(consumer)
+
+    def __get_placed_consumer(self, queue: AbstractQueue) -> t.Optional[_PlacedConsumer]:
+        for node in self.__nodes.values():
+            for placement in node.placements:
+                if placement.consumer is not None and placement.consumer.queue is queue:
+                    return placement.consumer
+
+        return None
+
+    async def __create_channel(
+            self,
+            connection: AbstractConnection,
+            prefetch_count: t.Optional[int],
+    ) -> AbstractChannel:
+        channel = await connection.channel()
+        await channel.set_qos(prefetch_count=prefetch_count or 0)
+
+        return channel
+
+    async def __open(
+            self,
+            queue_name: t.Optional[str],
+            create: t.Callable[[AbstractConnection], t.Awaitable[T]],
+            on_failover: t.Optional[FailoverCallback[T]],
+            consumer: t.Optional[_PlacedConsumer] = None,
+    ) -> T:
+        if not self.is_clustered:
+            if self.__connection is None:
+                raise RuntimeError()
+
+            return await create(self.__connection)
+
+        if not self.__nodes:
+            raise RuntimeError()
+
+        async def fail_over(placement: _Placement) -> None:
+            result = await self.__place(placement, create)
+
+            if on_failover is not None:
+                on_failover(result)
+
+        return await self.__place(_Placement(queue_name, consumer, fail_over), create)
+
+    async def __place(self, placement: _Placement, create: t.Callable[[AbstractConnection], t.Awaitable[T]]) -> T:
+        while True:
+            node = await self.__select_node(placement.queue_name)
+            connection = t.cast(AbstractConnection, node.connection)
+
+            try:
+                result = await create(connection)
+
+            except CONNECTION_EXCEPTIONS:
+                # the node dropped meanwhile, other errors are not related to the node.
+                if node.connection is connection and not connection.is_closed:
+                    raise
+
+                await asyncio.sleep(self.__reconnect_interval)
+                continue
+
+            if node.connection is not connection:
+                continue
+
+            node.placements.append(placement)
+
+            return result
+
+    async def __select_node(self, queue_name: t.Optional[str]) -> _Node:
+        if queue_name and self.__leader_locator is not None:
+            node_url = await self.__leader_locator.locate(queue_name)
+            node = self.__nodes.get(node_url) if node_url is not None else None
+
+            if node is not None and node.connection is not None:
+                return node
+
+        while True:
+            nodes = [node for node in self.__nodes.values() if node.connection is not None]
+
+            if nodes:
+                self.__node_counter += 1
+                return nodes[self.__node_counter % len(nodes)]
+
+            await asyncio.sleep(self.__reconnect_interval)
+
+    async def __connect_nodes(self) -> None:
+        nodes = {
+            url: _Node(url)
+            for url in (self.__bindings.connection_url, *self.__bindings.node_urls)
+        }
+
+        results = await asyncio.gather(*(self.__connect_node(node) for node in nodes.values()),
+                                       return_exceptions=True)
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if len(errors) == len(results):
+            raise errors[0]
+
+        self.__nodes = nodes
+
+        for node in nodes.values():
+            if node.connection is None:
+                self.__spawn(self.__reconnect(node))
+
+    async def __connect_node(self, node: _Node) -> None:
+        connection = await aio_pika.connect(node.url)
+        connection.close_callbacks.add(ft.partial(self.__on_node_closed, node, connection))
+        node.connection = connection
+
+    def __on_node_closed(self, node: _Node, connection: AbstractConnection, *_: object) -> None:
+        if node.connection is not connection:
+            return
+
+        node.connection = None
+        placements, node.placements = node.placements, []
+
+        self.__spawn(self.__fail_over(placements))
+        self.__spawn(self.__reconnect(node))
+
+    async def __fail_over(self, placements: t.Sequence[_Placement]) -> None:
+        for placement in placements:
+            try:
+                await placement.fail_over(placement)
+
+            except Exception as err:
+                # a placement, that can't be created again, is dropped, others still fail over.
+                asyncio.get_running_loop().call_exception_handler({
+                    "message": f"Failover of channel objects failed, queue: {placement.queue_name!r}",
+                    "exception": err,
+                })
+
+    async def __reconnect(self, node: _Node) -> None:
+        while node.connection is None:
+            await asyncio.sleep(self.__reconnect_interval)
+
+            try:
+                await self.__connect_node(node)
+
+            except CONNECTION_EXCEPTIONS:
+                continue
+
+    def __spawn(self, coroutine: t.Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coroutine)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
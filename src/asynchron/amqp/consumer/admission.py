@@ -0,0 +1,91 @@
+__all__ = (
+    "AdmissionCheck",
+    "compile_admission",
+)
+
+import calendar
+import time
+import typing as t
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from asynchron.core.amqp import AmqpConsumerBindings
+
+AdmissionCheck = t.Callable[[AbstractIncomingMessage], bool]
+
+
+def compile_admission(bindings: AmqpConsumerBindings) -> t.Optional[AdmissionCheck]:
+    """
+    Compiles admission predicates of consumer bindings (admitted header values, admitted app ids and max age since the
+    timestamp property) into a single check of raw message properties, that runs before the message is decoded.
+    Returns none, when bindings declare no predicates.
+    """
+
+    predicates: t.List[AdmissionCheck] = []
+
+    for name, values in bindings.admitted_headers or ():
+        predicates.append(_compile_header_check(name, frozenset(values)))
+
+    if bindings.admitted_app_ids is not None:
+        predicates.append(_compile_app_id_check(frozenset(bindings.admitted_app_ids)))
+
+    if bindings.max_timestamp_age is not None:
+        predicates.append(_compile_age_check(bindings.max_timestamp_age))
+
+    if not predicates:
+        return None
+
+    if len(predicates) == 1:
+        return predicates[0]
+
+    checks = tuple(predicates)
+
+    def admit(message: AbstractIncomingMessage) -> bool:
+        for check in checks:
+            if not check(message):
+                return False
+
+        return True
+
+    return admit
+
+
+def _compile_header_check(name: str, values: t.FrozenSet[str]) -> AdmissionCheck:
+    def admit_header(message: AbstractIncomingMessage) -> bool:
+        value = message.headers_raw.get(name)
+        if value is None:
+            return False
+
+        # strings may be received as long strings (bytes) or forwarded as other field values.
+        if isinstance(value, (bytes, bytearray)):
+            value = value.decode("utf-8", "replace")
+
+        return (value if isinstance(value, str) else str(value)) in values
+
+    return admit_header
+
+
+def _compile_app_id_check(app_ids: t.FrozenSet[str]) -> AdmissionCheck:
+    def admit_app_id(message: AbstractIncomingMessage) -> bool:
+        return message.app_id in app_ids
+
+    return admit_app_id
+
+
+def _compile_age_check(max_age: int) -> AdmissionCheck:
+    max_age_seconds = max_age / 1000
+    now = time.time
+
+    def admit_fresh(message: AbstractIncomingMessage) -> bool:
+        timestamp = message.timestamp
+        if timestamp is None:
+            return True
+
+        # timestamps have a second resolution and are decoded as naive UTC datetimes, the message TTL applies, when it
+        # is shorter.
+        age = now() - calendar.timegm(timestamp.utctimetuple())
+        expiration = message.expiration
+
+        return age <= (min(max_age_seconds, expiration) if isinstance(expiration, (int, float)) else max_age_seconds)
+
+    return admit_fresh
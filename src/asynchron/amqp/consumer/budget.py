@@ -0,0 +1,165 @@
+__all__ = (
+    "InFlightByteBudget",
+)
+
+import asyncio
+import typing as t
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from asynchron.amqp.consumer.pipeline import ConsumerMiddleware
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.metrics import Metrics, get_enabled_metrics
+
+
+class _PausableConsumer:
+    __slots__ = ("labels", "pause", "resume", "is_paused", "lock",)
+
+    def __init__(
+            self,
+            labels: t.Collection[str],
+            pause: t.Callable[[], t.Awaitable[None]],
+            resume: t.Callable[[], t.Awaitable[None]],
+    ) -> None:
+        self.labels = labels
+        self.pause = pause
+        self.resume = resume
+        self.is_paused = False
+        self.lock = asyncio.Lock()
+
+
+class InFlightByteBudget(ConsumerMiddleware):
+    """
+    Counts bytes of message bodies, that are being consumed, globally and per consumer binding. When the global budget
+    or the budget of a binding (`max_in_flight_bytes`) is exceeded, registered consumers of affected bindings are
+    paused and then resumed, when in-flight bytes drop below the low-water mark (a ratio of the budget).
+    """
+
+    def __init__(
+            self,
+            max_bytes: t.Optional[int] = None,
+            low_water_ratio: float = 0.5,
+            metrics: t.Optional[Metrics] = None,
+    ) -> None:
+        if not 0.0 <= low_water_ratio < 1.0:
+            raise ValueError("Invalid low water ratio", low_water_ratio)
+
+        self.__max_bytes = max_bytes
+        self.__low_water_ratio = low_water_ratio
+        self.__metrics = get_enabled_metrics(metrics)
+
+        self.__in_flight_bytes = 0
+        self.__in_flight_bytes_by_label: t.Dict[str, int] = {}
+        self.__is_exceeded = False
+        self.__exceeded_labels: t.Set[str] = set()
+
+        self.__consumers: t.List[_PausableConsumer] = []
+        self.__consumers_by_label: t.Dict[str, t.List[_PausableConsumer]] = {}
+        self.__tasks: t.Set["asyncio.Task[None]"] = set()
+        self.__is_closed = False
+
+    @property
+    def in_flight_bytes(self) -> int:
+        return self.__in_flight_bytes
+
+    def is_enabled_for(self, bindings: AmqpConsumerBindings) -> bool:
+        return self.__max_bytes is not None or bindings.max_in_flight_bytes is not None
+
+    def register(
+            self,
+            labels: t.Collection[str],
+            pause: t.Callable[[], t.Awaitable[None]],
+            resume: t.Callable[[], t.Awaitable[None]],
+    ) -> None:
+        """Registers a consumer of bindings with the labels, a consumer is paused when any of its bindings is."""
+
+        consumer = _PausableConsumer(labels, pause, resume)
+        self.__consumers.append(consumer)
+        for label in labels:
+            self.__consumers_by_label.setdefault(label, []).append(consumer)
+
+        self.__is_closed = False
+
+    async def close(self) -> None:
+        """Stops pausing and resuming of consumers and waits for running transitions."""
+
+        self.__is_closed = True
+        self.__consumers.clear()
+        self.__consumers_by_label.clear()
+
+        tasks = tuple(self.__tasks)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def before_consume(self, bindings: AmqpConsumerBindings, message: AbstractIncomingMessage) -> object:
+        self.__update(bindings, message.body_size)
+        return None
+
+    def after_consume(
+            self,
+            bindings: AmqpConsumerBindings,
+            message: AbstractIncomingMessage,
+            state: object,
+            error: t.Optional[BaseException],
+    ) -> None:
+        self.__update(bindings, -message.body_size)
+
+    def __update(self, bindings: AmqpConsumerBindings, size: int) -> None:
+        label = bindings.label
+        self.__in_flight_bytes += size
+        in_flight_bytes = self.__in_flight_bytes_by_label[label] = self.__in_flight_bytes_by_label.get(label, 0) + size
+
+        if self.__metrics is not None:
+            self.__metrics.set("budget_in_flight_bytes", "", self.__in_flight_bytes)
+            self.__metrics.set("budget_in_flight_bytes", label, in_flight_bytes)
+
+        if self.__max_bytes is not None:
+            is_exceeded = self.__is_over(self.__in_flight_bytes, self.__max_bytes, self.__is_exceeded)
+            if is_exceeded is not self.__is_exceeded:
+                self.__is_exceeded = is_exceeded
+                self.__schedule(self.__consumers)
+
+        if bindings.max_in_flight_bytes is not None:
+            was_exceeded = label in self.__exceeded_labels
+            is_exceeded = self.__is_over(in_flight_bytes, bindings.max_in_flight_bytes, was_exceeded)
+            if is_exceeded is not was_exceeded:
+                if is_exceeded:
+                    self.__exceeded_labels.add(label)
+
+                else:
+                    self.__exceeded_labels.discard(label)
+
+                self.__schedule(self.__consumers_by_label.get(label, ()))
+
+    def __is_over(self, value: int, budget: int, was_exceeded: bool) -> bool:
+        return value > budget if not was_exceeded else value > budget * self.__low_water_ratio
+
+    def __schedule(self, consumers: t.Iterable[_PausableConsumer]) -> None:
+        if self.__is_closed:
+            return
+
+        for consumer in consumers:
+            task = asyncio.ensure_future(self.__apply(consumer))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+
+    async def __apply(self, consumer: _PausableConsumer) -> None:
+        async with consumer.lock:
+            if self.__is_closed:
+                return
+
+            should_pause = self.__is_exceeded or any(label in self.__exceeded_labels for label in consumer.labels)
+            if should_pause is consumer.is_paused:
+                return
+
+            if should_pause:
+                await consumer.pause()
+
+                if self.__metrics is not None:
+                    for label in consumer.labels:
+                        self.__metrics.increment("budget_pauses", label)
+
+            else:
+                await consumer.resume()
+
+            consumer.is_paused = should_pause
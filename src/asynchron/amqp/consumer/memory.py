@@ -0,0 +1,154 @@
+__all__ = (
+    "AllocationSite",
+    "BindingMemoryReport",
+    "MemoryAttributionMiddleware",
+)
+
+import random
+import tracemalloc
+import typing as t
+from dataclasses import dataclass
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from asynchron.amqp.consumer.pipeline import ConsumerMiddleware
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.metrics import Metrics, get_enabled_metrics
+
+
+@dataclass(frozen=True)
+class AllocationSite:
+    filename: str
+    lineno: int
+    size_diff: int
+    count_diff: int
+
+
+@dataclass(frozen=True)
+class BindingMemoryReport:
+    binding: str
+    sampled_handlers: int
+    allocated_bytes: int
+    in_flight_bytes: int
+    top_sites: t.Sequence[AllocationSite]
+
+
+class _BindingMemory:
+    __slots__ = ("sampled_handlers", "allocated_bytes", "in_flight_bytes", "sites",)
+
+    def __init__(self) -> None:
+        self.sampled_handlers = 0
+        self.allocated_bytes = 0
+        self.in_flight_bytes = 0
+        self.sites: t.Dict[t.Tuple[str, int], t.List[int]] = {}
+
+
+class MemoryAttributionMiddleware(ConsumerMiddleware):
+    """
+    Diagnostic middleware, that attributes memory growth to consumer bindings. A sample of handler executions is
+    surrounded with tracemalloc snapshots and allocation growth is aggregated per binding and allocation site. Bodies of
+    messages, that are being consumed, are counted as in-flight bytes of the binding.
+
+    Snapshots are taken in process wide scope, so allocations of concurrently running handlers are attributed to
+    sampled handlers as well; lower concurrency or sample more to get cleaner reports.
+    """
+
+    def __init__(
+            self,
+            sample_ratio: float = 0.01,
+            traceback_limit: int = 1,
+            metrics: t.Optional[Metrics] = None,
+    ) -> None:
+        self.__sample_ratio = sample_ratio
+        self.__traceback_limit = traceback_limit
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__random = random.random
+        self.__bindings: t.Dict[str, _BindingMemory] = {}
+        self.__is_tracing_started = False
+        self.__filters = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        )
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.__traceback_limit)
+            self.__is_tracing_started = True
+
+    def stop(self) -> None:
+        if self.__is_tracing_started:
+            tracemalloc.stop()
+            self.__is_tracing_started = False
+
+    def before_consume(self, bindings: AmqpConsumerBindings, message: AbstractIncomingMessage) -> object:
+        label = bindings.label
+        memory = self.__bindings.get(label)
+        if memory is None:
+            memory = self.__bindings[label] = _BindingMemory()
+
+        memory.in_flight_bytes += message.body_size
+        if self.__metrics is not None:
+            self.__metrics.set("in_flight_bytes", label, memory.in_flight_bytes)
+
+        if self.__random() >= self.__sample_ratio or not tracemalloc.is_tracing():
+            return None
+
+        return tracemalloc.take_snapshot().filter_traces(self.__filters)
+
+    def after_consume(
+            self,
+            bindings: AmqpConsumerBindings,
+            message: AbstractIncomingMessage,
+            state: object,
+            error: t.Optional[BaseException],
+    ) -> None:
+        label = bindings.label
+        memory = self.__bindings[label]
+
+        memory.in_flight_bytes -= message.body_size
+        if self.__metrics is not None:
+            self.__metrics.set("in_flight_bytes", label, memory.in_flight_bytes)
+
+        if state is None or not tracemalloc.is_tracing():
+            return
+
+        before = t.cast(tracemalloc.Snapshot, state)
+        after = tracemalloc.take_snapshot().filter_traces(self.__filters)
+        memory.sampled_handlers += 1
+
+        for stat in after.compare_to(before, "lineno"):
+            if stat.size_diff == 0 and stat.count_diff == 0:
+                continue
+
+            frame = stat.traceback[0]
+            site = memory.sites.setdefault((frame.filename, frame.lineno), [0, 0])
+            site[0] += stat.size_diff
+            site[1] += stat.count_diff
+            memory.allocated_bytes += stat.size_diff
+
+        if self.__metrics is not None:
+            self.__metrics.set("sampled_allocated_bytes", label, memory.allocated_bytes)
+
+    def report(self, limit: int = 10) -> t.Sequence[BindingMemoryReport]:
+        """Returns bindings ordered by allocation growth with their top allocation sites."""
+
+        reports = [
+            BindingMemoryReport(
+                binding=label,
+                sampled_handlers=memory.sampled_handlers,
+                allocated_bytes=memory.allocated_bytes,
+                in_flight_bytes=memory.in_flight_bytes,
+                top_sites=tuple(
+                    AllocationSite(filename=filename, lineno=lineno, size_diff=size_diff, count_diff=count_diff)
+                    for (filename, lineno), (size_diff, count_diff) in sorted(
+                        memory.sites.items(),
+                        key=lambda item: item[1][0],
+                        reverse=True,
+                    )[:limit]
+                ),
+            )
+            for label, memory in self.__bindings.items()
+        ]
+        reports.sort(key=lambda report: report.allocated_bytes, reverse=True)
+
+        return reports
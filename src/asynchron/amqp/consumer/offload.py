@@ -0,0 +1,121 @@
+__all__ = (
+    "RawMessage",
+    "RawMessageDecoder",
+    "ExecutorMessageConsumer",
+    "offload_handler",
+    "offload_decoding",
+)
+
+import asyncio
+import functools
+import typing as t
+from concurrent.futures import Executor
+from dataclasses import dataclass
+
+from aio_pika.abc import AbstractIncomingMessage
+from pamqp.common import FieldTable
+
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import MessageConsumer, SyncCallableMessageConsumer, SyncMessageConsumerFunc
+from asynchron.core.message import MessageDecoder
+
+T = t.TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RawMessage:
+    """Picklable part of a delivered message, decoders see it in worker processes instead of the delivery."""
+
+    body: bytes
+    content_type: t.Optional[str] = None
+    content_encoding: t.Optional[str] = None
+    headers_raw: t.Optional[FieldTable] = None
+    correlation_id: t.Optional[str] = None
+    reply_to: t.Optional[str] = None
+    message_id: t.Optional[str] = None
+    user_id: t.Optional[str] = None
+    app_id: t.Optional[str] = None
+    routing_key: t.Optional[str] = None
+
+    @property
+    def body_size(self) -> int:
+        return len(self.body)
+
+
+class RawMessageDecoder(MessageDecoder[AbstractIncomingMessage, RawMessage]):
+    def decode(self, message: AbstractIncomingMessage) -> RawMessage:
+        return RawMessage(
+            body=message.body,
+            content_type=message.content_type,
+            content_encoding=message.content_encoding,
+            headers_raw=dict(message.headers_raw) if message.headers_raw else None,
+            correlation_id=message.correlation_id,
+            reply_to=message.reply_to,
+            message_id=message.message_id,
+            user_id=message.user_id,
+            app_id=message.app_id,
+            routing_key=message.routing_key,
+        )
+
+
+class ExecutorMessageConsumer(MessageConsumer[T]):
+    """Runs a blocking function in the executor, the awaiting pipeline acks / rejects on the event loop."""
+
+    def __init__(
+            self,
+            executor: Executor,
+            func: SyncMessageConsumerFunc[T],
+    ) -> None:
+        self.__executor = executor
+        self.__func = func
+
+    async def consume(self, message: T) -> None:
+        await asyncio.get_running_loop().run_in_executor(self.__executor, self.__func, message)
+
+
+def _decode_and_consume(
+        decoder: MessageDecoder[RawMessage, T],
+        func: SyncMessageConsumerFunc[T],
+        message: RawMessage,
+) -> None:
+    func(decoder.decode(message))
+
+
+def offload_handler(
+        consumer: MessageConsumer[T],
+        bindings: AmqpConsumerBindings,
+        executor: Executor,
+) -> MessageConsumer[T]:
+    """Replaces the consumer of the binding with one, that runs the handler in a thread executor."""
+
+    if not isinstance(consumer, SyncCallableMessageConsumer):
+        raise ValueError("Offloaded handlers must be sync callables", bindings)
+
+    return ExecutorMessageConsumer(executor, consumer.func)
+
+
+def offload_decoding(
+        decoder: MessageDecoder[AbstractIncomingMessage, T],
+        consumer: MessageConsumer[T],
+        bindings: AmqpConsumerBindings,
+        executor: Executor,
+) -> t.Tuple[MessageDecoder[AbstractIncomingMessage, RawMessage], MessageConsumer[RawMessage]]:
+    """
+    Replaces decoder and consumer of the binding with stages, that run in a process executor. The message is passed
+    as raw body bytes and headers, so decoding runs in the worker process as well and decoder and handler have to be
+    picklable (e.g. module level functions).
+    """
+
+    if not isinstance(consumer, SyncCallableMessageConsumer):
+        raise ValueError("Offloaded handlers must be sync callables", bindings)
+
+    if bindings.ordering_key_field is not None:
+        raise ValueError("Messages can't be ordered by a field, when decoded in a process pool", bindings)
+
+    # decoder expects an incoming message, raw messages carry all the fields that decoders read.
+    raw_decoder = t.cast(MessageDecoder[RawMessage, T], decoder)
+
+    return RawMessageDecoder(), ExecutorMessageConsumer(
+        executor,
+        functools.partial(_decode_and_consume, raw_decoder, consumer.func),
+    )
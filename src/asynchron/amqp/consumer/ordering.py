@@ -0,0 +1,96 @@
+__all__ = (
+    "KeyOrderedScheduler",
+)
+
+import asyncio
+import typing as t
+from collections import deque
+
+K = t.TypeVar("K", bound=t.Hashable)
+T = t.TypeVar("T")
+
+
+class _KeyQueue(t.Generic[T]):
+    __slots__ = ("items", "pending",)
+
+    def __init__(self, item: T) -> None:
+        self.items: t.Deque[T] = deque((item,))
+        self.pending: t.Deque[t.Tuple[T, "asyncio.Future[None]"]] = deque()
+
+
+class KeyOrderedScheduler(t.Generic[K, T]):
+    """
+    Processes submitted items in parallel across keys, while items of the same key are processed strictly in the
+    order they were submitted. Each active key has its own worker task and a bounded queue, `submit` waits when the
+    queue of the key is full.
+    """
+
+    def __init__(
+            self,
+            process: t.Callable[[T], t.Awaitable[None]],
+            queue_size: int,
+    ) -> None:
+        if queue_size < 1:
+            raise ValueError("Queue size must be positive", queue_size)
+
+        self.__process = process
+        self.__queue_size = queue_size
+
+        self.__queues: t.Dict[K, _KeyQueue[T]] = {}
+        self.__workers: t.Set["asyncio.Task[None]"] = set()
+
+    @property
+    def active_keys(self) -> int:
+        return len(self.__queues)
+
+    async def submit(self, key: K, item: T) -> None:
+        queue = self.__queues.get(key)
+
+        if queue is None:
+            queue = self.__queues[key] = _KeyQueue(item)
+            worker = asyncio.create_task(self.__work(key, queue))
+            self.__workers.add(worker)
+            worker.add_done_callback(self.__workers.discard)
+
+        elif not queue.pending and len(queue.items) < self.__queue_size:
+            queue.items.append(item)
+
+        else:
+            # Waiting items are moved to the queue by the worker in FIFO order, so ordering is kept under pressure.
+            waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+            queue.pending.append((item, waiter))
+            await waiter
+
+    async def drain(self) -> None:
+        while self.__workers:
+            await asyncio.wait(tuple(self.__workers))
+
+    async def __work(self, key: K, queue: _KeyQueue[T]) -> None:
+        items, pending = queue.items, queue.pending
+
+        try:
+            while items:
+                item = items.popleft()
+
+                if pending:
+                    pending_item, waiter = pending.popleft()
+                    items.append(pending_item)
+                    if not waiter.done():
+                        waiter.set_result(None)
+
+                try:
+                    await self.__process(item)
+
+                except Exception as err:
+                    asyncio.get_running_loop().call_exception_handler({
+                        "message": f"Key ordered processing failed, key: {key!r}",
+                        "exception": err,
+                    })
+
+        finally:
+            del self.__queues[key]
+
+            # the worker is cancelled (e.g. on shutdown), submitters waiting for the full queue are cancelled too.
+            while pending:
+                _, waiter = pending.popleft()
+                waiter.cancel()
@@ -0,0 +1,588 @@
+__all__ = (
+    "ConsumerMiddleware",
+    "CompiledMessageConsumer",
+    "ConsumerPipelineCompiler",
+)
+
+import abc
+import time
+import typing as t
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from asynchron.amqp.consumer.admission import AdmissionCheck, compile_admission
+from asynchron.amqp.consumer.ordering import KeyOrderedScheduler
+from asynchron.amqp.consumer.retry import DelayedRetry
+from asynchron.amqp.consumer.routing import TopicRoutingTrie
+from asynchron.amqp.latency import ORIGIN_PUBLISHED_AT_HEADER, PUBLISHED_AT_HEADER, get_header_timestamp_ns
+from asynchron.amqp.tracing import ConsumerTracing, SpanContext, Tracer
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import CallableMessageConsumer, MessageConsumer, MessageConsumerFunc
+from asynchron.core.message import MessageDecoder
+from asynchron.core.metrics import Metrics, get_enabled_metrics
+from asynchron.strict_typing import gather_with_errors, get_or_default
+
+T = t.TypeVar("T")
+
+BeforeConsumeHook = t.Callable[[AmqpConsumerBindings, AbstractIncomingMessage], object]
+AfterConsumeHook = t.Callable[
+    [AmqpConsumerBindings, AbstractIncomingMessage, object, t.Optional[BaseException]],
+    None,
+]
+
+
+class ConsumerMiddleware(metaclass=abc.ABCMeta):
+    """
+    A flat hook around the consumer pipeline of a binding. Middlewares are not wrapped around each other, the
+    compiled pipeline calls `before_consume` hooks in registration order and `after_consume` hooks in reverse order.
+    Only overridden hooks are called.
+    """
+
+    def before_consume(self, bindings: AmqpConsumerBindings, message: AbstractIncomingMessage) -> object:
+        return None
+
+    def after_consume(
+            self,
+            bindings: AmqpConsumerBindings,
+            message: AbstractIncomingMessage,
+            state: object,
+            error: t.Optional[BaseException],
+    ) -> None:
+        pass
+
+
+class CompiledMessageConsumer(MessageConsumer[AbstractIncomingMessage]):
+    __slots__ = ("__func", "__drains",)
+
+    def __init__(
+            self,
+            func: MessageConsumerFunc[AbstractIncomingMessage],
+            drains: t.Sequence[t.Callable[[], t.Awaitable[None]]] = (),
+    ) -> None:
+        self.__func = func
+        self.__drains = drains
+
+    @property
+    def func(self) -> MessageConsumerFunc[AbstractIncomingMessage]:
+        return self.__func
+
+    async def consume(self, message: AbstractIncomingMessage) -> None:
+        await self.__func(message)
+
+    async def drain(self) -> None:
+        """Waits for messages, that were accepted by the pipeline, but are still processed in background."""
+
+        for drain in self.__drains:
+            await drain()
+
+
+class ConsumerPipelineCompiler:
+    """
+    Compiles process context (ack / reject), decode, handle and middleware stages of a consumer binding into a single
+    coroutine function, which is passed to aio-pika as a consumer callback.
+    """
+
+    def __init__(
+            self,
+            middlewares: t.Sequence[ConsumerMiddleware] = (),
+            is_processing_enabled: bool = True,
+            requeue_on_exception: bool = False,
+            reject_on_redelivered: bool = False,
+            ignore_processed: bool = False,
+            default_ordering_queue_size: int = 100,
+            metrics: t.Optional[Metrics] = None,
+            tracer: t.Optional[Tracer] = None,
+    ) -> None:
+        self.__middlewares = list(middlewares)
+        self.__is_processing_enabled = is_processing_enabled
+        self.__requeue_on_exception = requeue_on_exception
+        self.__reject_on_redelivered = reject_on_redelivered
+        self.__ignore_processed = ignore_processed
+        self.__default_ordering_queue_size = default_ordering_queue_size
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__tracer = tracer
+
+    @property
+    def requeue_on_exception(self) -> bool:
+        return self.__requeue_on_exception
+
+    def add_middleware(self, middleware: ConsumerMiddleware) -> None:
+        self.__middlewares.append(middleware)
+
+    def compile(
+            self,
+            decoder: MessageDecoder[AbstractIncomingMessage, T],
+            consumer: MessageConsumer[T],
+            bindings: AmqpConsumerBindings,
+            is_processing_enabled: t.Optional[bool] = None,
+            retry: t.Optional[DelayedRetry] = None,
+            middlewares: t.Sequence[ConsumerMiddleware] = (),
+    ) -> CompiledMessageConsumer:
+        is_enabled: bool = get_or_default(is_processing_enabled, self.__is_processing_enabled)
+        tracing = ConsumerTracing(self.__tracer, bindings.label) if self.__tracer is not None else None
+        compiled = self.__compile_consumer(decoder, consumer, bindings, is_enabled, retry, middlewares, tracing)
+
+        if self.__metrics is not None or bindings.max_message_age is not None:
+            compiled = self.__compile_age_check(compiled, bindings, is_enabled)
+
+        admit = compile_admission(bindings)
+        if admit is not None:
+            compiled = self.__compile_admission(compiled, admit, bindings, is_enabled)
+
+        if tracing is not None:
+            compiled = CompiledMessageConsumer(tracing.wrap_consume(compiled.func), (compiled.drain,))
+
+        return compiled
+
+    def compile_router(
+            self,
+            exchange_type: t.Optional[t.Literal["fanout", "direct", "topic", "headers"]],
+            routes: t.Sequence[t.Tuple[AmqpConsumerBindings, CompiledMessageConsumer]],
+            label: str = "",
+    ) -> CompiledMessageConsumer:
+        """
+        Compiles a dispatcher for a single queue, that consolidates several consumer bindings of one exchange. Each
+        message is passed to consumers of all bindings, that match its routing key. Consumers of routes must be
+        compiled with disabled processing, the dispatcher settles the message once, after all matched consumers
+        complete.
+
+        Matched consumers run independently, a failed one doesn't stop the others. The message is acked, when all of
+        them succeed, otherwise it is rejected (and requeued, if enabled) and the first error is raised. So delivery is
+        at least once per consumer: consumers, that succeeded, get the requeued message again.
+        """
+
+        match: t.Callable[[str], t.Sequence[MessageConsumerFunc[AbstractIncomingMessage]]]
+
+        if exchange_type == "fanout":
+            everyone = tuple({id(consumer): consumer.func for _, consumer in routes}.values())
+
+            def match(routing_key: str) -> t.Sequence[MessageConsumerFunc[AbstractIncomingMessage]]:
+                return everyone
+
+        elif exchange_type is None or exchange_type == "direct":
+            funcs_by_key: t.Dict[str, t.Dict[int, MessageConsumerFunc[AbstractIncomingMessage]]] = {}
+            for bindings, consumer in routes:
+                for binding_key in bindings.binding_keys:
+                    funcs_by_key.setdefault(binding_key, {})[id(consumer)] = consumer.func
+
+            exact = {key: tuple(funcs.values()) for key, funcs in funcs_by_key.items()}
+
+            def match(routing_key: str) -> t.Sequence[MessageConsumerFunc[AbstractIncomingMessage]]:
+                return exact.get(routing_key, ())
+
+        elif exchange_type == "topic":
+            trie: TopicRoutingTrie[MessageConsumerFunc[AbstractIncomingMessage]] = TopicRoutingTrie()
+            for bindings, consumer in routes:
+                for binding_key in bindings.binding_keys:
+                    trie.add(binding_key, consumer.func)
+
+            match = trie.match
+
+        else:
+            raise ValueError("Messages can't be routed in process for exchange type", exchange_type)
+
+        is_processing_enabled = self.__is_processing_enabled
+        ack = self.__compile_ack()
+        reject = self.__compile_reject()
+        discard = self.__compile_discard()
+
+        metrics = self.__metrics
+        if metrics is not None:
+            ack = _measure(ack, metrics, label, "settle_seconds", "acked", "settle_failed")
+            reject = _measure(reject, metrics, label, "settle_seconds", "nacked", "settle_failed")
+            discard = _measure(discard, metrics, label, "settle_seconds", "unrouted", "settle_failed")
+
+        async def dispatch(message: AbstractIncomingMessage) -> None:
+            funcs = match(message.routing_key or "")
+
+            if not funcs:
+                if is_processing_enabled:
+                    await discard(message)
+
+                return
+
+            error: t.Optional[BaseException] = None
+
+            # a single consumer is awaited inline, without scheduling a task.
+            if len(funcs) == 1:
+                try:
+                    await funcs[0](message)
+
+                except BaseException as err:
+                    error = err
+
+            else:
+                for result in await gather_with_errors(func(message) for func in funcs):
+                    if error is None and isinstance(result, BaseException):
+                        error = result
+
+            if error is not None:
+                if is_processing_enabled:
+                    await reject(message)
+
+                raise error
+
+            if is_processing_enabled:
+                await ack(message)
+
+        return CompiledMessageConsumer(dispatch)
+
+    def __compile_consumer(
+            self,
+            decoder: MessageDecoder[AbstractIncomingMessage, T],
+            consumer: MessageConsumer[T],
+            bindings: AmqpConsumerBindings,
+            is_processing_enabled: bool,
+            retry: t.Optional[DelayedRetry],
+            middlewares: t.Sequence[ConsumerMiddleware],
+            tracing: t.Optional[ConsumerTracing],
+    ) -> CompiledMessageConsumer:
+        decode: t.Callable[[AbstractIncomingMessage], T] = decoder.decode
+        # subclasses may override consume, only the plain callable consumer is unwrapped.
+        handle = consumer.func if type(consumer) is CallableMessageConsumer else consumer.consume
+
+        hooked = tuple(
+            middleware
+            for middleware in (*self.__middlewares, *middlewares)
+            if type(middleware).before_consume is not ConsumerMiddleware.before_consume
+            or type(middleware).after_consume is not ConsumerMiddleware.after_consume
+        )
+        befores = tuple(middleware.before_consume for middleware in hooked)
+        afters = tuple(middleware.after_consume for middleware in reversed(hooked))
+
+        ignore_processed = self.__ignore_processed
+        ack = self.__compile_ack()
+        reject = self.__compile_reject(retry)
+
+        metrics = self.__metrics
+        if metrics is not None:
+            decode = _measure_decode(decode, metrics, bindings.label)
+            handle = _measure(handle, metrics, bindings.label, "handle_seconds", None, "consume_failed")
+            ack = _measure(ack, metrics, bindings.label, "settle_seconds", "acked", "settle_failed")
+            reject = _measure(reject, metrics, bindings.label, "settle_seconds", "nacked", "settle_failed")
+
+        if tracing is not None:
+            decode = tracing.wrap_decode(decode)
+            handle = tracing.wrap_handle(handle)
+
+        if bindings.ordering_key_header is not None or bindings.ordering_key_field is not None:
+            return self.__compile_key_ordered(decode, handle, befores, afters, bindings, is_processing_enabled, ack,
+                                              reject, tracing)
+
+        if not is_processing_enabled and not befores and not afters:
+            async def consume_unprocessed(message: AbstractIncomingMessage) -> None:
+                await handle(decode(message))
+
+            return CompiledMessageConsumer(consume_unprocessed)
+
+        if not befores and not afters and metrics is None:
+            async def consume_processed(message: AbstractIncomingMessage) -> None:
+                try:
+                    await handle(decode(message))
+
+                except BaseException:
+                    await reject(message)
+                    raise
+
+                if not ignore_processed or not message.processed:
+                    await message.ack()
+
+            return CompiledMessageConsumer(consume_processed)
+
+        async def consume_with_middlewares(message: AbstractIncomingMessage) -> None:
+            states = [before(bindings, message) for before in befores]
+            error: t.Optional[BaseException] = None
+
+            # after hooks run once per before hook, even when settling fails (e.g. the channel is closed).
+            try:
+                try:
+                    await handle(decode(message))
+
+                except BaseException as err:
+                    error = err
+                    if is_processing_enabled:
+                        await reject(message)
+
+                    raise
+
+                if is_processing_enabled:
+                    await ack(message)
+
+            finally:
+                for after, state in zip(afters, reversed(states)):
+                    after(bindings, message, state, error)
+
+        return CompiledMessageConsumer(consume_with_middlewares)
+
+    def __compile_key_ordered(
+            self,
+            decode: t.Callable[[AbstractIncomingMessage], T],
+            handle: MessageConsumerFunc[T],
+            befores: t.Sequence[BeforeConsumeHook],
+            afters: t.Sequence[AfterConsumeHook],
+            bindings: AmqpConsumerBindings,
+            is_processing_enabled: bool,
+            ack: MessageConsumerFunc[AbstractIncomingMessage],
+            reject: MessageConsumerFunc[AbstractIncomingMessage],
+            tracing: t.Optional[ConsumerTracing],
+    ) -> CompiledMessageConsumer:
+        """
+        Messages are decoded in delivery order, then handled and settled by a worker of the message key, so messages
+        with the same key are handled sequentially and messages with different keys are handled in parallel.
+        """
+
+        header = bindings.ordering_key_header
+        field = bindings.ordering_key_field
+
+        async def process(item: t.Tuple[AbstractIncomingMessage, T, t.Optional[SpanContext]]) -> None:
+            message, decoded, span = item
+
+            if tracing is None:
+                return await process_decoded(message, decoded)
+
+            # the worker task doesn't share the context of the consuming task.
+            token = tracing.attach(span)
+            try:
+                await process_decoded(message, decoded)
+
+            finally:
+                tracing.detach(token)
+
+        async def process_decoded(message: AbstractIncomingMessage, decoded: T) -> None:
+            states = [before(bindings, message) for before in befores]
+            error: t.Optional[BaseException] = None
+
+            # after hooks run once per before hook, even when settling fails (e.g. the channel is closed).
+            try:
+                try:
+                    await handle(decoded)
+
+                except BaseException as err:
+                    error = err
+                    if is_processing_enabled:
+                        await reject(message)
+
+                    raise
+
+                if is_processing_enabled:
+                    await ack(message)
+
+            finally:
+                for after, state in zip(afters, reversed(states)):
+                    after(bindings, message, state, error)
+
+        scheduler: KeyOrderedScheduler[
+            t.Hashable,
+            t.Tuple[AbstractIncomingMessage, T, t.Optional[SpanContext]],
+        ] = KeyOrderedScheduler(
+            process=process,
+            queue_size=get_or_default(bindings.ordering_queue_size, self.__default_ordering_queue_size),
+        )
+        submit = scheduler.submit
+
+        async def consume_key_ordered(message: AbstractIncomingMessage) -> None:
+            try:
+                decoded = decode(message)
+                key = _get_ordering_key(
+                    (message.headers or {}).get(header) if header is not None
+                    else getattr(decoded, t.cast(str, field), None)
+                )
+
+            except BaseException:
+                if is_processing_enabled:
+                    await reject(message)
+
+                raise
+
+            await submit(key, (message, decoded, tracing.get_consumed() if tracing is not None else None))
+
+        return CompiledMessageConsumer(consume_key_ordered, (scheduler.drain,))
+
+    def __compile_age_check(
+            self,
+            consumer: CompiledMessageConsumer,
+            bindings: AmqpConsumerBindings,
+            is_processing_enabled: bool,
+    ) -> CompiledMessageConsumer:
+        """
+        Observes queueing delay (since publish by the last hop) and end-to-end age (since publish by the first hop) of
+        stamped messages and skips messages, that are older than max message age of the binding.
+        """
+
+        func = consumer.func
+        label = bindings.label
+        max_age_ns = bindings.max_message_age * 1_000_000 if bindings.max_message_age is not None else None
+        discard = self.__compile_discard()
+        metrics = self.__metrics
+        time_ns = time.time_ns
+
+        async def consume_fresh(message: AbstractIncomingMessage) -> None:
+            now = time_ns()
+            headers = message.headers_raw
+            origin_published_at = get_header_timestamp_ns(headers, ORIGIN_PUBLISHED_AT_HEADER)
+
+            if metrics is not None:
+                published_at = get_header_timestamp_ns(headers, PUBLISHED_AT_HEADER)
+                if published_at is not None:
+                    metrics.observe("queueing_delay_seconds", label, max(0, now - published_at) / 1e9)
+
+                if origin_published_at is not None:
+                    metrics.observe("age_seconds", label, max(0, now - origin_published_at) / 1e9)
+
+            if max_age_ns is not None and origin_published_at is not None and now - origin_published_at > max_age_ns:
+                if metrics is not None:
+                    metrics.increment("expired", label)
+
+                if is_processing_enabled:
+                    await discard(message)
+
+                return
+
+            await func(message)
+
+        return CompiledMessageConsumer(consume_fresh, (consumer.drain,))
+
+    def __compile_admission(
+            self,
+            consumer: CompiledMessageConsumer,
+            admit: AdmissionCheck,
+            bindings: AmqpConsumerBindings,
+            is_processing_enabled: bool,
+    ) -> CompiledMessageConsumer:
+        """Settles messages, that are not admitted by predicates of the binding, without decoding them."""
+
+        func = consumer.func
+        label = bindings.label
+        settle = self.__compile_discard() if bindings.inadmissible_action == "reject" else self.__compile_ack()
+        metrics = self.__metrics
+
+        async def consume_admitted(message: AbstractIncomingMessage) -> None:
+            if admit(message):
+                return await func(message)
+
+            if metrics is not None:
+                metrics.increment("inadmissible", label)
+
+            if is_processing_enabled:
+                await settle(message)
+
+        return CompiledMessageConsumer(consume_admitted, (consumer.drain,))
+
+    def __compile_ack(self) -> MessageConsumerFunc[AbstractIncomingMessage]:
+        ignore_processed = self.__ignore_processed
+
+        async def ack(message: AbstractIncomingMessage) -> None:
+            if not ignore_processed or not message.processed:
+                await message.ack()
+
+        return ack
+
+    def __compile_discard(self) -> MessageConsumerFunc[AbstractIncomingMessage]:
+        async def discard(message: AbstractIncomingMessage) -> None:
+            await message.reject(requeue=False)
+
+        return discard
+
+    def __compile_reject(self, retry: t.Optional[DelayedRetry] = None) -> MessageConsumerFunc[AbstractIncomingMessage]:
+        """Inlines the error branch of `aio_pika.IncomingMessage.process` context manager with precomputed settings."""
+
+        requeue = self.__requeue_on_exception
+        reject_on_redelivered = self.__reject_on_redelivered
+        ignore_processed = self.__ignore_processed
+
+        async def reject(message: AbstractIncomingMessage) -> None:
+            if (ignore_processed and message.processed) or message.channel.is_closed:
+                return
+
+            await message.reject(requeue=requeue and not (reject_on_redelivered and message.redelivered))
+
+        if retry is None:
+            return reject
+
+        republish = retry.retry
+
+        async def retry_later(message: AbstractIncomingMessage) -> None:
+            if (ignore_processed and message.processed) or message.channel.is_closed:
+                return
+
+            try:
+                await republish(message)
+
+            except Exception:
+                await message.reject(requeue=requeue)
+                raise
+
+            await message.ack()
+
+        return retry_later
+
+
+def _get_ordering_key(value: object) -> t.Hashable:
+    # header byte strings are decoded as bytearray, tables and arrays can't be keys.
+    if isinstance(value, bytearray):
+        return bytes(value)
+
+    try:
+        hash(value)
+
+    except TypeError:
+        raise ValueError("Ordering key must be hashable", value) from None
+
+    return value
+
+
+def _measure_decode(
+        decode: t.Callable[[AbstractIncomingMessage], T],
+        metrics: Metrics,
+        label: str,
+) -> t.Callable[[AbstractIncomingMessage], T]:
+    increment = metrics.increment
+    observe = metrics.observe
+    perf_counter = time.perf_counter
+
+    def measured_decode(message: AbstractIncomingMessage) -> T:
+        increment("consumed", label)
+        started_at = perf_counter()
+
+        try:
+            return decode(message)
+
+        except BaseException:
+            increment("consume_failed", label)
+            raise
+
+        finally:
+            observe("decode_seconds", label, perf_counter() - started_at)
+
+    return measured_decode
+
+
+def _measure(
+        func: MessageConsumerFunc[T],
+        metrics: Metrics,
+        label: str,
+        histogram: str,
+        succeeded: t.Optional[str],
+        failed: str,
+) -> MessageConsumerFunc[T]:
+    increment = metrics.increment
+    observe = metrics.observe
+    perf_counter = time.perf_counter
+
+    async def measured(message: T) -> None:
+        started_at = perf_counter()
+
+        try:
+            await func(message)
+
+        except BaseException:
+            increment(failed, label)
+            raise
+
+        finally:
+            observe(histogram, label, perf_counter() - started_at)
+
+        if succeeded is not None:
+            increment(succeeded, label)
+
+    return measured
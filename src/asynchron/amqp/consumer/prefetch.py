@@ -0,0 +1,139 @@
+__all__ = (
+    "AdaptivePrefetchTuner",
+)
+
+import asyncio
+import time
+import typing as t
+
+from aio_pika.abc import AbstractChannel, AbstractIncomingMessage
+from aio_pika.exceptions import CONNECTION_EXCEPTIONS
+
+from asynchron.amqp.consumer.pipeline import ConsumerMiddleware
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.metrics import Metrics, get_enabled_metrics
+
+
+class AdaptivePrefetchTuner(ConsumerMiddleware):
+    """
+    Adjusts channel QoS prefetch count of a consumer binding at runtime with AIMD: prefetch is increased by a step
+    when the consumer is saturated (in-flight count reaches the prefetch) and is decreased multiplicatively when
+    average handler latency or event loop lag exceeds its threshold.
+    """
+
+    def __init__(
+            self,
+            bindings: AmqpConsumerBindings,
+            min_prefetch_count: int,
+            max_prefetch_count: int,
+            interval: float = 1.0,
+            latency_threshold: float = 1.0,
+            loop_lag_threshold: float = 0.1,
+            increase_step: int = 1,
+            decrease_factor: float = 0.5,
+            metrics: t.Optional[Metrics] = None,
+    ) -> None:
+        if not 0 < min_prefetch_count <= max_prefetch_count:
+            raise ValueError("Invalid prefetch count bounds", min_prefetch_count, max_prefetch_count)
+
+        self.__bindings = bindings
+        self.__min_prefetch_count = min_prefetch_count
+        self.__max_prefetch_count = max_prefetch_count
+        self.__interval = interval
+        self.__latency_threshold = latency_threshold
+        self.__loop_lag_threshold = loop_lag_threshold
+        self.__increase_step = increase_step
+        self.__decrease_factor = decrease_factor
+        self.__metrics = get_enabled_metrics(metrics)
+
+        self.__prefetch_count = min(max(bindings.prefetch_count or min_prefetch_count, min_prefetch_count),
+                                    max_prefetch_count)
+        self.__in_flight = 0
+        self.__in_flight_peak = 0
+        self.__completed = 0
+        self.__latency_sum = 0.0
+
+        self.__channel: t.Optional[AbstractChannel] = None
+        self.__task: t.Optional["asyncio.Task[None]"] = None
+
+    @property
+    def prefetch_count(self) -> int:
+        return self.__prefetch_count
+
+    def before_consume(self, bindings: AmqpConsumerBindings, message: AbstractIncomingMessage) -> object:
+        self.__in_flight += 1
+        if self.__in_flight > self.__in_flight_peak:
+            self.__in_flight_peak = self.__in_flight
+
+        return time.perf_counter()
+
+    def after_consume(
+            self,
+            bindings: AmqpConsumerBindings,
+            message: AbstractIncomingMessage,
+            state: object,
+            error: t.Optional[BaseException],
+    ) -> None:
+        self.__in_flight -= 1
+        self.__completed += 1
+        self.__latency_sum += time.perf_counter() - t.cast(float, state)
+
+    def attach(self, channel: AbstractChannel) -> None:
+        self.__channel = channel
+
+        if self.__metrics is not None:
+            self.__metrics.set("prefetch_count", self.__bindings.label, self.__prefetch_count)
+
+        # the task of a previous channel may have ended, e.g. when the tuner is attached again after a failover.
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.create_task(self.__run())
+
+    async def detach(self) -> None:
+        task, self.__task = self.__task, None
+        self.__channel = None
+
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def tune(self, loop_lag: float) -> int:
+        """Calculates prefetch count for the next window from observations of the current window and resets them."""
+
+        latency = self.__latency_sum / self.__completed if self.__completed else 0.0
+        current = self.__prefetch_count
+
+        if loop_lag > self.__loop_lag_threshold or latency > self.__latency_threshold:
+            value = max(self.__min_prefetch_count, int(current * self.__decrease_factor))
+
+        elif self.__in_flight_peak >= current:
+            value = min(self.__max_prefetch_count, current + self.__increase_step)
+
+        else:
+            value = current
+
+        self.__in_flight_peak = self.__in_flight
+        self.__completed = 0
+        self.__latency_sum = 0.0
+
+        return value
+
+    async def __run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            started_at = loop.time()
+            await asyncio.sleep(self.__interval)
+            value = self.tune(max(0.0, loop.time() - started_at - self.__interval))
+
+            if value != self.__prefetch_count and self.__channel is not None:
+                try:
+                    await self.__channel.set_qos(prefetch_count=value)
+
+                # the channel is closed or being reopened, the value is applied in a next window.
+                except CONNECTION_EXCEPTIONS:
+                    continue
+
+                self.__prefetch_count = value
+
+                if self.__metrics is not None:
+                    self.__metrics.set("prefetch_count", self.__bindings.label, value)
@@ -2,9 +2,12 @@ __all__ = (
     "ProcessingMessageConsumer",
 )
 
+import typing as t
+
 from aio_pika.abc import AbstractIncomingMessage
 
 from asynchron.core.consumer import MessageConsumer
+from asynchron.core.metrics import Metrics, get_enabled_metrics
 
 
 class ProcessingMessageConsumer(MessageConsumer[AbstractIncomingMessage]):
@@ -14,16 +17,38 @@ class ProcessingMessageConsumer(MessageConsumer[AbstractIncomingMessage]):
             requeue_on_exception: bool = False,
             reject_on_redelivered: bool = False,
             ignore_processed: bool = False,
+            metrics: t.Optional[Metrics] = None,
+            binding: str = "",
     ) -> None:
         self.__consumer = consumer
         self.__requeue_on_exception = requeue_on_exception
         self.__reject_on_redelivered = reject_on_redelivered
         self.__ignore_processed = ignore_processed
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__binding = binding
 
     async def consume(self, message: AbstractIncomingMessage) -> None:
+        if self.__metrics is not None:
+            return await self.__consume_measured(self.__metrics, message)
+
         async with message.process(
                 requeue=self.__requeue_on_exception,
                 reject_on_redelivered=self.__reject_on_redelivered,
                 ignore_processed=self.__ignore_processed,
         ):
             await self.__consumer.consume(message)
+
+    async def __consume_measured(self, metrics: Metrics, message: AbstractIncomingMessage) -> None:
+        try:
+            async with message.process(
+                    requeue=self.__requeue_on_exception,
+                    reject_on_redelivered=self.__reject_on_redelivered,
+                    ignore_processed=self.__ignore_processed,
+            ):
+                await self.__consumer.consume(message)
+
+        except BaseException:
+            metrics.increment("nacked", self.__binding)
+            raise
+
+        metrics.increment("acked", self.__binding)
@@ -0,0 +1,95 @@
+__all__ = (
+    "DelayedRetry",
+)
+
+import typing as t
+
+import aio_pika
+from aio_pika.abc import AbstractExchange, AbstractIncomingMessage, AbstractMessage
+from aio_pika.types import TimeoutType
+
+from asynchron.amqp.publisher.exchange import PublishFunc
+
+
+class DelayedRetry:
+    """
+    Republishes failed messages into retry queues with TTL based backoff tiers. Retry queues dead-letter expired
+    messages back to the origin queue, attempt number is stored in message headers. When attempts are exhausted,
+    the message is moved to the parking queue.
+    """
+
+    ATTEMPT_HEADER: t.Final[str] = "x-retry-attempt"
+
+    def __init__(
+            self,
+            delays: t.Sequence[int],
+            max_attempts: t.Optional[int] = None,
+    ) -> None:
+        if not delays:
+            raise ValueError("At least one retry delay is required")
+
+        self.__delays = tuple(delays)
+        self.__max_attempts = max_attempts if max_attempts is not None else len(self.__delays)
+
+        self.__publish = self.__raise_error
+        self.__retry_queue_names: t.Sequence[str] = ("",) * len(self.__delays)
+        self.__parking_queue_name = ""
+
+    @property
+    def delays(self) -> t.Sequence[int]:
+        return self.__delays
+
+    def attach(
+            self,
+            exchange: AbstractExchange,
+            retry_queue_names: t.Sequence[str],
+            parking_queue_name: str,
+    ) -> None:
+        if len(retry_queue_names) != len(self.__delays):
+            raise ValueError("Retry queue for each delay is required", retry_queue_names, self.__delays)
+
+        self.__publish = t.cast(PublishFunc, exchange.publish)
+        self.__retry_queue_names = retry_queue_names
+        self.__parking_queue_name = parking_queue_name
+
+    async def retry(self, message: AbstractIncomingMessage) -> None:
+        headers = dict(message.headers or {})
+        attempt = int(t.cast(int, headers.get(self.ATTEMPT_HEADER, 0))) + 1
+        headers[self.ATTEMPT_HEADER] = attempt
+
+        if attempt > self.__max_attempts:
+            routing_key = self.__parking_queue_name
+
+        else:
+            routing_key = self.__retry_queue_names[min(attempt, len(self.__retry_queue_names)) - 1]
+
+        await self.__publish(
+            message=aio_pika.Message(
+                body=message.body,
+                headers=headers,
+                content_type=message.content_type,
+                content_encoding=message.content_encoding,
+                delivery_mode=message.delivery_mode,
+                priority=message.priority,
+                correlation_id=message.correlation_id,
+                reply_to=message.reply_to,
+                message_id=message.message_id,
+                timestamp=message.timestamp,
+                type=message.type,
+                user_id=message.user_id,
+                app_id=message.app_id,
+            ),
+            routing_key=routing_key,
+            mandatory=True,
+        )
+
+    async def __raise_error(
+            self,
+            message: AbstractMessage,
+            routing_key: str,
+            *,
+            mandatory: bool = True,
+            immediate: bool = False,
+            timeout: t.Optional[TimeoutType] = None,
+    ) -> None:
+        raise RuntimeError()
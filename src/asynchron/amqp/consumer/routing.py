@@ -0,0 +1,82 @@
+__all__ = (
+    "TopicRoutingTrie",
+)
+
+import typing as t
+
+T = t.TypeVar("T")
+
+
+class _Node(t.Generic[T]):
+    __slots__ = ("children", "values",)
+
+    def __init__(self) -> None:
+        self.children: t.Dict[str, _Node[T]] = {}
+        self.values: t.List[t.Tuple[int, T]] = []
+
+
+class TopicRoutingTrie(t.Generic[T]):
+    """
+    Maps routing keys to values registered by AMQP topic binding patterns, where `*` substitutes exactly one word and
+    `#` substitutes zero or more words. Each value is matched at most once per routing key (in registration order),
+    the same way as the broker delivers a single message copy to a queue with several matching bindings. Match
+    results are cached per routing key, cache is reset when a new pattern is added or when cache size limit is
+    reached.
+    """
+
+    __ONE_WORD: t.Final[str] = "*"
+    __ANY_WORDS: t.Final[str] = "#"
+
+    def __init__(self, cache_size: int = 4096) -> None:
+        self.__root: _Node[T] = _Node()
+        self.__size = 0
+        self.__cache_size = cache_size
+        self.__cache: t.Dict[str, t.Sequence[T]] = {}
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def add(self, pattern: str, value: T) -> None:
+        node = self.__root
+        for word in pattern.split("."):
+            node = node.children.setdefault(word, _Node())
+
+        node.values.append((self.__size, value))
+        self.__size += 1
+        self.__cache.clear()
+
+    def match(self, routing_key: str) -> t.Sequence[T]:
+        cache = self.__cache
+
+        result = cache.get(routing_key)
+        if result is None:
+            matched: t.Dict[int, T] = {}
+            self.__match(self.__root, routing_key.split("."), 0, matched)
+            result = tuple({id(value): value for _, value in sorted(matched.items())}.values())
+
+            if len(cache) >= self.__cache_size:
+                cache.clear()
+
+            cache[routing_key] = result
+
+        return result
+
+    def __match(self, node: _Node[T], words: t.Sequence[str], index: int, matched: t.Dict[int, T]) -> None:
+        children = node.children
+
+        if index == len(words):
+            matched.update(node.values)
+
+        else:
+            exact = children.get(words[index])
+            if exact is not None:
+                self.__match(exact, words, index + 1, matched)
+
+            one_word = children.get(self.__ONE_WORD)
+            if one_word is not None:
+                self.__match(one_word, words, index + 1, matched)
+
+        any_words = children.get(self.__ANY_WORDS)
+        if any_words is not None:
+            for next_index in range(index, len(words) + 1):
+                self.__match(any_words, words, next_index, matched)
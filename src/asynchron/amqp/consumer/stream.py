@@ -0,0 +1,160 @@
+__all__ = (
+    "StreamedMessage",
+    "MessageStream",
+)
+
+import asyncio
+import time
+import typing as t
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from asynchron.amqp.consumer.admission import AdmissionCheck
+from asynchron.amqp.latency import ORIGIN_PUBLISHED_AT_HEADER, get_header_timestamp_ns
+from asynchron.core.message import MessageDecoder
+from asynchron.core.metrics import Metrics, get_enabled_metrics
+
+T = t.TypeVar("T")
+
+
+class StreamedMessage(t.Generic[T]):
+    """A decoded message of a stream, that is settled by the loop, which iterates over the stream."""
+
+    __slots__ = ("__message", "__raw", "__stream",)
+
+    def __init__(self, message: T, raw: AbstractIncomingMessage, stream: "MessageStream[T]") -> None:
+        self.__message = message
+        self.__raw = raw
+        self.__stream = stream
+
+    @property
+    def message(self) -> T:
+        return self.__message
+
+    @property
+    def raw(self) -> AbstractIncomingMessage:
+        return self.__raw
+
+    async def ack(self) -> None:
+        await self.__raw.ack()
+        self.__stream.settled(True)
+
+    async def nack(self, requeue: bool = False) -> None:
+        await self.__raw.reject(requeue=requeue)
+        self.__stream.settled(False)
+
+
+class MessageStream(t.Generic[T]):
+    """
+    Async iterator over decoded messages of a consumer binding. Delivered messages are buffered locally, they stay
+    unacked until the loop settles them, so the buffer is bounded by the prefetch count of the channel and the broker
+    stops delivering, when the loop is slower than the queue. Messages, that can't be decoded, are not admitted or are
+    older than the max message age (since publish by the first hop), are rejected or acked without being yielded.
+    Buffered messages of a closed channel (e.g. after a failover) are skipped, the broker delivers them again.
+    """
+
+    def __init__(
+            self,
+            decoder: MessageDecoder[AbstractIncomingMessage, T],
+            buffer_size: int,
+            admit: t.Optional[AdmissionCheck] = None,
+            is_inadmissible_rejected: bool = False,
+            max_message_age: t.Optional[int] = None,
+            requeue_on_exception: bool = False,
+            metrics: t.Optional[Metrics] = None,
+            binding: str = "",
+    ) -> None:
+        if buffer_size <= 0:
+            raise ValueError("Stream buffer size must be positive", buffer_size)
+
+        self.__decode = decoder.decode
+        self.__buffer_size = buffer_size
+        self.__admit = admit
+        self.__is_inadmissible_rejected = is_inadmissible_rejected
+        self.__max_age_ns = max_message_age * 1_000_000 if max_message_age is not None else None
+        self.__requeue_on_exception = requeue_on_exception
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__binding = binding
+
+        # a closed stream puts none after buffered messages.
+        self.__buffer: t.Optional["asyncio.Queue[t.Optional[StreamedMessage[T]]]"] = None
+        self.__is_closed = False
+
+    @property
+    def buffer_size(self) -> int:
+        """Prefetch count of the channel, the broker doesn't deliver more unsettled messages to the stream."""
+
+        return self.__buffer_size
+
+    def __aiter__(self) -> "MessageStream[T]":
+        return self
+
+    async def __anext__(self) -> StreamedMessage[T]:
+        if self.__is_closed and (self.__buffer is None or self.__buffer.empty()):
+            raise StopAsyncIteration
+
+        buffer = self.__get_buffer()
+
+        while True:
+            message = await buffer.get()
+
+            if message is None:
+                # other iterating loops end as well.
+                buffer.put_nowait(None)
+                raise StopAsyncIteration
+
+            if not message.raw.channel.is_closed:
+                return message
+
+    async def consume(self, message: AbstractIncomingMessage) -> None:
+        if self.__admit is not None and not self.__admit(message):
+            if self.__metrics is not None:
+                self.__metrics.increment("inadmissible", self.__binding)
+
+            if self.__is_inadmissible_rejected:
+                await message.reject(requeue=False)
+
+            else:
+                await message.ack()
+
+            return
+
+        if self.__max_age_ns is not None:
+            origin_published_at = get_header_timestamp_ns(message.headers_raw, ORIGIN_PUBLISHED_AT_HEADER)
+            if origin_published_at is not None and time.time_ns() - origin_published_at > self.__max_age_ns:
+                if self.__metrics is not None:
+                    self.__metrics.increment("expired", self.__binding)
+
+                await message.reject(requeue=False)
+                return
+
+        if self.__metrics is not None:
+            self.__metrics.increment("consumed", self.__binding)
+
+        try:
+            decoded = self.__decode(message)
+
+        except Exception:
+            await message.reject(requeue=self.__requeue_on_exception)
+            self.settled(False)
+            return
+
+        self.__get_buffer().put_nowait(StreamedMessage(decoded, message, self))
+
+    def settled(self, is_acked: bool) -> None:
+        if self.__metrics is not None:
+            self.__metrics.increment("acked" if is_acked else "nacked", self.__binding)
+
+    def close(self) -> None:
+        """Ends iteration after buffered messages."""
+
+        if not self.__is_closed:
+            self.__is_closed = True
+            self.__get_buffer().put_nowait(None)
+
+    def __get_buffer(self) -> "asyncio.Queue[t.Optional[StreamedMessage[T]]]":
+        # the queue is created on the loop of the first delivery or iteration, its size is limited by the broker.
+        if self.__buffer is None:
+            self.__buffer = asyncio.Queue()
+
+        return self.__buffer
@@ -0,0 +1,37 @@
+__all__ = (
+    "WatchdogMiddleware",
+)
+
+import asyncio
+import time
+import typing as t
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from asynchron.amqp.consumer.pipeline import ConsumerMiddleware
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.watchdog import EventLoopWatchdog
+
+# task of the consumer callback and performance counter, when the callback started.
+_TrackingState = t.Tuple[t.Optional["asyncio.Task[object]"], float]
+
+
+class WatchdogMiddleware(ConsumerMiddleware):
+    """Attributes consumer callbacks to their bindings, so the watchdog can report which binding blocks the loop."""
+
+    def __init__(self, watchdog: EventLoopWatchdog) -> None:
+        self.__watchdog = watchdog
+
+    def before_consume(self, bindings: AmqpConsumerBindings, message: AbstractIncomingMessage) -> object:
+        state: _TrackingState = (self.__watchdog.track(bindings.label), time.perf_counter())
+        return state
+
+    def after_consume(
+            self,
+            bindings: AmqpConsumerBindings,
+            message: AbstractIncomingMessage,
+            state: object,
+            error: t.Optional[BaseException],
+    ) -> None:
+        task, started_at = t.cast(_TrackingState, state)
+        self.__watchdog.untrack(task, bindings.label, time.perf_counter() - started_at)
@@ -2,32 +2,113 @@ __all__ = (
     "AioPikaBasedAmqpController",
 )
 
+import asyncio
+import functools as ft
+import os
 import typing as t
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 
-from aio_pika.abc import AbstractIncomingMessage, AbstractMessage, AbstractQueue
+from aio_pika.abc import AbstractChannel, AbstractExchange, AbstractIncomingMessage, AbstractMessage, AbstractQueue
 
 from asynchron.amqp.connector import AmqpConnector
+from asynchron.amqp.consumer.admission import compile_admission
+from asynchron.amqp.consumer.budget import InFlightByteBudget
+from asynchron.amqp.consumer.memory import MemoryAttributionMiddleware
+from asynchron.amqp.consumer.offload import offload_decoding, offload_handler
+from asynchron.amqp.consumer.pipeline import CompiledMessageConsumer, ConsumerMiddleware, ConsumerPipelineCompiler
+from asynchron.amqp.consumer.prefetch import AdaptivePrefetchTuner
+from asynchron.amqp.consumer.retry import DelayedRetry
+from asynchron.amqp.consumer.stream import MessageStream
+from asynchron.amqp.consumer.watchdog import WatchdogMiddleware
+from asynchron.amqp.declaration import get_consumer_declaration
+from asynchron.amqp.latency import LatencyStamper
+from asynchron.amqp.loopback import (
+    LoopbackMessagePublisher,
+    LoopbackRoute,
+    LoopbackRouter,
+    is_deliverable_locally,
+    skip_looped_back,
+)
 from asynchron.amqp.publisher.exchange import ExchangeMessagePublisher
+from asynchron.amqp.publisher.properties import MessagePropertiesTemplate
+from asynchron.amqp.rpc import DirectReplyToClient, ExchangeMessageRequester, ReplyPublisher, RespondingMessageConsumer
+from asynchron.amqp.serializer.context import MessageWithContextDecoder
+from asynchron.amqp.tracing import Tracer
 from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings
 from asynchron.core.consumer import (
-    DecodedMessageConsumer,
     MessageConsumer,
     MessageConsumerFactory,
+    MessageConsumerFunc,
 )
 from asynchron.core.controller import Controller
+from asynchron.core.metrics import Metrics
 from asynchron.core.message import MessageDecoder, MessageEncoder
 from asynchron.core.publisher import (
     EncodedMessagePublisher,
     MessagePublisher,
     MessagePublisherFactory,
 )
+from asynchron.core.requester import EncodedMessageRequester, MessageRequester, MessageResponderFunc
+from asynchron.core.watchdog import EventLoopWatchdog
 from asynchron.strict_typing import get_or_default
 
 T = t.TypeVar("T")
+R = t.TypeVar("R")
 T_contra = t.TypeVar("T_contra", contravariant=True)
 T_co = t.TypeVar("T_co", covariant=True)
 
 
+class _ConsumerFactoryFunc(t.Protocol):
+    def __call__(self, settings: MessageConsumer[T]) -> MessageConsumer[T]: ...
+
+
+class _PublisherFactoryFunc(t.Protocol):
+    def __call__(self, settings: MessagePublisher[T]) -> MessagePublisher[T]: ...
+
+
+class _AttachedLoopback(t.Protocol):
+    def attach(self, routes: t.Sequence[LoopbackRoute]) -> None: ...
+
+    async def drain(self) -> None: ...
+
+
+class _DeclaredStream(t.Protocol):
+    @property
+    def buffer_size(self) -> int: ...
+
+    async def consume(self, message: AbstractIncomingMessage) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class _StartedConsumer:
+    """Queue and tag of a started consumer, they change, when it is paused and resumed or fails over to another node."""
+
+    __slots__ = ("queue", "consumer_tag", "tuner",)
+
+    def __init__(self, tuner: t.Optional[AdaptivePrefetchTuner] = None) -> None:
+        self.queue: t.Optional[AbstractQueue] = None
+        self.consumer_tag: t.Optional[str] = None
+        self.tuner = tuner
+
+    def move(self, moved: t.Tuple[AbstractChannel, AbstractQueue, t.Optional[str]]) -> None:
+        channel, self.queue, self.consumer_tag = moved
+
+        if self.tuner is not None:
+            self.tuner.attach(channel)
+
+
+def _attach_exchange(publisher: ExchangeMessagePublisher, moved: t.Tuple[AbstractChannel, AbstractExchange]) -> None:
+    publisher.attach(moved[1])
+
+
+def _attach_retry(
+        retry: DelayedRetry,
+        moved: t.Tuple[AbstractChannel, AbstractExchange, t.Sequence[str], str],
+) -> None:
+    retry.attach(*moved[1:])
+
+
 class AioPikaBasedAmqpController(
     Controller[AbstractIncomingMessage, AmqpConsumerBindings, AbstractMessage, AmqpPublisherBindings],
 ):
@@ -45,18 +126,74 @@ class AioPikaBasedAmqpController(
             consumer_factory: t.Optional[MessageConsumerFactory[MessageConsumer[T], T]] = None,
             publisher_factory: t.Optional[MessagePublisherFactory[MessagePublisher[T], T]] = None,
             default_mandatory: bool = True,
+            pipeline_compiler: t.Optional[ConsumerPipelineCompiler] = None,
+            consolidated_queue_names: t.Optional[t.Mapping[str, str]] = None,
+            metrics: t.Optional[Metrics] = None,
+            stamper: t.Optional[LatencyStamper] = None,
+            tracer: t.Optional[Tracer] = None,
+            memory_attribution: t.Optional[MemoryAttributionMiddleware] = None,
+            max_in_flight_bytes: t.Optional[int] = None,
+            thread_executor: t.Optional[Executor] = None,
+            process_executor: t.Optional[Executor] = None,
+            max_outstanding_requests: int = 1000,
+            request_timeout: float = 30.0,
+            loopback: bool = False,
+            loopback_forwarding: bool = False,
+            default_stream_prefetch_count: int = 100,
+            watchdog: t.Optional[EventLoopWatchdog] = None,
     ) -> None:
+        # in process deliveries have no broker message to carry the trace context or to attribute memory to.
+        if loopback and (tracer is not None or memory_attribution is not None):
+            raise ValueError("Loopback delivery can't be traced or attributed", tracer, memory_attribution)
+
+        # a given compiler is configured by the caller, consumers would silently miss metrics and traces.
+        if pipeline_compiler is not None and (metrics is not None or tracer is not None):
+            raise ValueError("Metrics and tracer must be passed to the given pipeline compiler", pipeline_compiler)
+
         self.__connector = connector
-        self.__consumer_factory: MessageConsumerFactory[MessageConsumer[T], T] \
-            = consumer_factory or self.DefaultConsumerFactory()
-        self.__publisher_factory: MessagePublisherFactory[MessagePublisher[T], T] \
-            = publisher_factory or self.DefaultPublisherFactory()
+        # factories are given per controller, they keep message types of consumers and publishers of each binding.
+        self.__create_consumer = t.cast(
+            _ConsumerFactoryFunc, (consumer_factory or self.DefaultConsumerFactory()).create_consumer)
+        self.__create_publisher = t.cast(
+            _PublisherFactoryFunc, (publisher_factory or self.DefaultPublisherFactory()).create_publisher)
+        self.__pipeline_compiler = pipeline_compiler or ConsumerPipelineCompiler(metrics=metrics, tracer=tracer)
+        self.__metrics = metrics
+        self.__stamper = stamper
+        self.__tracer = tracer
+        self.__memory_attribution = memory_attribution
+        # consumer callbacks are attributed to their bindings, so the watchdog (and the profiler) report them.
+        self.__watchdog = WatchdogMiddleware(watchdog) if watchdog is not None else None
+        self.__byte_budget = InFlightByteBudget(max_bytes=max_in_flight_bytes, metrics=metrics)
+        # executors for bindings with `handler_executor`, default ones are created on demand and owned.
+        self.__executors: t.Dict[str, Executor] = {}
+        if thread_executor is not None:
+            self.__executors["thread"] = thread_executor
+        if process_executor is not None:
+            self.__executors["process"] = process_executor
+        self.__owned_executors: t.List[Executor] = []
+        self.__rpc_client = DirectReplyToClient(max_outstanding_requests, request_timeout)
+        self.__reply_publisher = ReplyPublisher()
+        self.__is_requesting = False
+        self.__is_responding = False
+        self.__reply_consumer: t.Optional[t.Tuple[AbstractQueue, str]] = None
+        # messages published to bindings of local consumers are passed to them in process; with forwarding they are
+        # published to the broker as well (for other services and durability) and skipped by local consumers.
+        self.__loopback_router = LoopbackRouter() if loopback else None
+        self.__is_loopback_forwarding = loopback_forwarding
+        self.__loopback_publishers: t.Dict[AmqpPublisherBindings, _AttachedLoopback] = {}
+        self.__instance_id = os.urandom(8).hex()
+        self.__default_stream_prefetch_count = default_stream_prefetch_count
 
         self.__default_mandatory = default_mandatory
+        # exchange name -> queue name; bindings of these exchanges share one queue and are dispatched in process.
+        self.__consolidated_queue_names = consolidated_queue_names or {}
 
-        self.__declared_consumers: t.Dict[AmqpConsumerBindings, MessageConsumer[AbstractIncomingMessage]] = {}
+        self.__declared_consumers: t.Dict[AmqpConsumerBindings, CompiledMessageConsumer] = {}
         self.__declared_publishers: t.Dict[AmqpPublisherBindings, ExchangeMessagePublisher] = {}
-        self.__consumer_tags: t.Dict[str, AbstractQueue] = {}
+        self.__declared_retries: t.Dict[AmqpConsumerBindings, DelayedRetry] = {}
+        self.__declared_prefetch_tuners: t.Dict[AmqpConsumerBindings, AdaptivePrefetchTuner] = {}
+        self.__declared_streams: t.Dict[AmqpConsumerBindings, _DeclaredStream] = {}
+        self.__started_consumers: t.List[_StartedConsumer] = []
 
     def bind_consumer(
             self,
@@ -64,11 +201,82 @@ class AioPikaBasedAmqpController(
             consumer: MessageConsumer[T],
             bindings: AmqpConsumerBindings,
     ) -> MessageConsumer[AbstractIncomingMessage]:
-        result = self.__declared_consumers[bindings] = DecodedMessageConsumer(
-            decoder=decoder,
-            consumer=self.__consumer_factory.create_consumer(consumer),
+        return self.__bind_consumer(decoder, consumer, bindings, is_loopback_enabled=True)
+
+    def __bind_consumer(
+            self,
+            decoder: MessageDecoder[AbstractIncomingMessage, T],
+            consumer: MessageConsumer[T],
+            bindings: AmqpConsumerBindings,
+            is_loopback_enabled: bool,
+    ) -> MessageConsumer[AbstractIncomingMessage]:
+        is_consolidated = bindings.exchange_name in self.__consolidated_queue_names
+        if is_consolidated and (bindings.ordering_key_header is not None or bindings.ordering_key_field is not None):
+            raise ValueError("Key ordered consumer bindings can't be consolidated", bindings)
+
+        declaration = get_consumer_declaration(bindings, self.__consolidated_queue_names.get(bindings.exchange_name))
+        if is_consolidated and any(
+                get_consumer_declaration(declared_bindings, self.__consolidated_queue_names[bindings.exchange_name])
+                != declaration
+                for declared_bindings in self.__declared_consumers
+                if declared_bindings.exchange_name == bindings.exchange_name
+        ):
+            raise ValueError("Consolidated consumer bindings must declare the same queue", bindings)
+
+        retry: t.Optional[DelayedRetry] = None
+        if bindings.retry_delays:
+            if is_consolidated or not bindings.queue_name:
+                raise ValueError("Delayed retries require a named and not consolidated queue", bindings)
+
+            retry = self.__declared_retries[bindings] = DelayedRetry(bindings.retry_delays, bindings.retry_attempts)
+
+        middlewares: t.List[ConsumerMiddleware] = []
+        if self.__watchdog is not None:
+            middlewares.append(self.__watchdog)
+
+        if self.__memory_attribution is not None:
+            middlewares.append(self.__memory_attribution)
+
+        if self.__byte_budget.is_enabled_for(bindings):
+            middlewares.append(self.__byte_budget)
+
+        if bindings.min_prefetch_count is not None and bindings.max_prefetch_count is not None:
+            if is_consolidated:
+                raise ValueError("Adaptive prefetch can't be used for consolidated consumer bindings", bindings)
+
+            tuner = self.__declared_prefetch_tuners[bindings] = AdaptivePrefetchTuner(
+                bindings=bindings,
+                min_prefetch_count=bindings.min_prefetch_count,
+                max_prefetch_count=bindings.max_prefetch_count,
+                metrics=self.__metrics,
+            )
+            middlewares.append(tuner)
+
+        created_consumer = self.__create_consumer(consumer)
+        compile_pipeline = ft.partial(
+            self.__pipeline_compiler.compile,
+            bindings=bindings,
+            is_processing_enabled=False if is_consolidated else None,
+            retry=retry,
+            middlewares=middlewares,
         )
 
+        # messages decoded in worker processes are delivered through the broker only.
+        if bindings.handler_executor == "process":
+            raw_decoder, raw_consumer = offload_decoding(decoder, created_consumer, bindings,
+                                                         self.__get_executor("process"))
+            result = self.__declared_consumers[bindings] = compile_pipeline(raw_decoder, raw_consumer)
+
+            return result
+
+        if bindings.handler_executor == "thread":
+            created_consumer = offload_handler(created_consumer, bindings, self.__get_executor("thread"))
+
+        if self.__loopback_router is not None and is_loopback_enabled and is_deliverable_locally(bindings):
+            self.__loopback_router.add(bindings, self.__get_loopback_token(bindings), created_consumer)
+
+        result = self.__declared_consumers[bindings] = compile_pipeline(decoder, created_consumer)
+
         return result
 
     def bind_publisher(
@@ -78,33 +286,285 @@ class AioPikaBasedAmqpController(
     ) -> MessagePublisher[T]:
         exchange = self.__declared_publishers[bindings] = \
             ExchangeMessagePublisher(bindings.routing_key,
-                                     get_or_default(bindings.is_mandatory, self.__default_mandatory))
+                                     get_or_default(bindings.is_mandatory, self.__default_mandatory),
+                                     metrics=self.__metrics,
+                                     binding=bindings.label,
+                                     stamper=self.__stamper,
+                                     tracer=self.__tracer,
+                                     properties=MessagePropertiesTemplate.from_bindings(bindings))
 
-        return self.__publisher_factory.create_publisher(EncodedMessagePublisher(
+        if self.__loopback_router is not None:
+            loopback = self.__loopback_publishers[bindings] = LoopbackMessagePublisher(
+                encoder=encoder,
+                publisher=exchange,
+                is_forwarding=self.__is_loopback_forwarding,
+                metrics=self.__metrics,
+                binding=bindings.label,
+            )
+
+            return self.__create_publisher(loopback)
+
+        return self.__create_publisher(EncodedMessagePublisher(
             encoder=encoder,
             publisher=exchange,
+            metrics=self.__metrics,
+            binding=bindings.label,
         ))
 
+    def bind_requester(
+            self,
+            encoder: MessageEncoder[T, AbstractMessage],
+            decoder: MessageDecoder[AbstractIncomingMessage, R],
+            bindings: AmqpPublisherBindings,
+    ) -> MessageRequester[T, R]:
+        """Requests are published to the exchange and replies are received with direct reply-to."""
+
+        self.__is_requesting = True
+
+        return EncodedMessageRequester(
+            encoder=encoder,
+            decoder=decoder,
+            requester=ExchangeMessageRequester(self.__rpc_client, bindings.exchange_name, bindings.routing_key),
+        )
+
+    def bind_responder(
+            self,
+            decoder: MessageDecoder[AbstractIncomingMessage, T],
+            encoder: MessageEncoder[R, AbstractMessage],
+            responder: MessageResponderFunc[T, R],
+            bindings: AmqpConsumerBindings,
+    ) -> MessageConsumer[AbstractIncomingMessage]:
+        """Binds a consumer, that publishes the result of the responder to `reply_to` of the request."""
+
+        if bindings.ordering_key_field is not None:
+            raise ValueError("Requests can't be ordered by a field", bindings)
+
+        self.__is_responding = True
+
+        return self.__bind_consumer(
+            decoder=MessageWithContextDecoder(decoder),
+            consumer=RespondingMessageConsumer(responder, encoder, self.__reply_publisher),
+            bindings=bindings,
+            is_loopback_enabled=False,
+        )
+
+    def stream(
+            self,
+            decoder: MessageDecoder[AbstractIncomingMessage, T],
+            bindings: AmqpConsumerBindings,
+    ) -> MessageStream[T]:
+        """
+        Binds a consumer, that is iterated over by a loop, instead of callbacks. The prefetch count of the binding (or
+        the default one) limits messages, that are delivered, but not settled by the loop.
+        """
+
+        if bindings.exchange_name in self.__consolidated_queue_names or bindings.ordering_key_header is not None \
+                or bindings.ordering_key_field is not None or bindings.retry_delays \
+                or bindings.min_prefetch_count is not None or bindings.max_prefetch_count is not None \
+                or bindings.max_in_flight_bytes is not None or bindings.handler_executor is not None:
+            raise ValueError("Consumer bindings use features, that aren't supported by streams", bindings)
+
+        get_consumer_declaration(bindings)
+
+        stream = MessageStream(
+            decoder=decoder,
+            buffer_size=get_or_default(bindings.prefetch_count, self.__default_stream_prefetch_count),
+            admit=compile_admission(bindings),
+            is_inadmissible_rejected=bindings.inadmissible_action == "reject",
+            max_message_age=bindings.max_message_age,
+            requeue_on_exception=self.__pipeline_compiler.requeue_on_exception,
+            metrics=self.__metrics,
+            binding=bindings.label,
+        )
+        self.__declared_streams[bindings] = stream
+
+        return stream
+
     async def start(self) -> None:
+        if self.__memory_attribution is not None:
+            self.__memory_attribution.start()
+
+        if self.__loopback_router is not None:
+            for publisher_bindings, loopback in self.__loopback_publishers.items():
+                loopback.attach(self.__loopback_router.match(publisher_bindings))
+
+        # channel objects are attached again, when they fail over to another node of a cluster.
         for publisher_bindings, publisher in self.__declared_publishers.items():
-            _, exchange = await self.__connector.create_exchange(
+            _attach_exchange(publisher, await self.__connector.create_exchange(
                 exchange_name=publisher_bindings.exchange_name,
                 exchange_type=publisher_bindings.exchange_type,
                 prefetch_count=publisher_bindings.prefetch_count,
-            )
-            publisher.attach(exchange)
+                on_failover=ft.partial(_attach_exchange, publisher),
+                exchange_durable=get_or_default(publisher_bindings.is_durable, False),
+                exchange_auto_delete=get_or_default(publisher_bindings.is_auto_delete_enabled, False),
+            ))
+
+        if self.__is_responding:
+            self.__attach_reply_channel(await self.__connector.create_channel(
+                prefetch_count=None,
+                on_failover=self.__attach_reply_channel,
+            ))
+
+        if self.__is_requesting:
+            self.__attach_reply_consumer(await self.__connector.create_reply_consumer(
+                consumer=self.__rpc_client.consume,
+                on_failover=self.__attach_reply_consumer,
+            ))
+
+        for consumer_bindings, retry in self.__declared_retries.items():
+            _attach_retry(retry, await self.__connector.create_retry_queues(
+                queue_name=t.cast(str, consumer_bindings.queue_name),
+                retry_delays=retry.delays,
+                on_failover=ft.partial(_attach_retry, retry),
+            ))
+
+        consolidated_routes: t.Dict[str, t.List[t.Tuple[AmqpConsumerBindings, CompiledMessageConsumer]]] = {}
 
         for consumer_bindings, consumer in self.__declared_consumers.items():
-            _, queue, consumer_tag = await self.__connector.create_consumer(
-                consumer=consumer.consume,
+            if consumer_bindings.exchange_name in self.__consolidated_queue_names:
+                routes = consolidated_routes.setdefault(consumer_bindings.exchange_name, [])
+                routes.append((consumer_bindings, consumer))
+                continue
+
+            tuner = self.__declared_prefetch_tuners.get(consumer_bindings)
+
+            consumer_func = consumer.func
+            if self.__loopback_router is not None and self.__is_loopback_forwarding:
+                consumer_func = skip_looped_back(self.__get_loopback_token(consumer_bindings), consumer_func)
+
+            started = _StartedConsumer(tuner)
+            started.move(await self.__connector.create_consumer(
+                consumer=consumer_func,
                 binding_keys=consumer_bindings.binding_keys,
                 exchange_name=consumer_bindings.exchange_name,
                 exchange_type=consumer_bindings.exchange_type,
                 queue_name=consumer_bindings.queue_name,
-                prefetch_count=consumer_bindings.prefetch_count,
-            )
-            self.__consumer_tags[consumer_tag] = queue
+                prefetch_count=tuner.prefetch_count if tuner is not None else consumer_bindings.prefetch_count,
+                on_failover=started.move,
+                **get_consumer_declaration(consumer_bindings)._asdict(),
+            ))
+            self.__started_consumers.append(started)
+
+            if self.__byte_budget.is_enabled_for(consumer_bindings):
+                self.__register_budget((consumer_bindings,), started, consumer_func)
+
+        for stream_bindings, stream in self.__declared_streams.items():
+            started = _StartedConsumer()
+            started.move(await self.__connector.create_consumer(
+                consumer=stream.consume,
+                binding_keys=stream_bindings.binding_keys,
+                exchange_name=stream_bindings.exchange_name,
+                exchange_type=stream_bindings.exchange_type,
+                queue_name=stream_bindings.queue_name,
+                prefetch_count=stream.buffer_size,
+                on_failover=started.move,
+                **get_consumer_declaration(stream_bindings)._asdict(),
+            ))
+            self.__started_consumers.append(started)
+
+        for exchange_name, routes in consolidated_routes.items():
+            exchange_type = routes[0][0].exchange_type
+            prefetch_counts = [route_bindings.prefetch_count for route_bindings, _ in routes]
+
+            queue_name = self.__consolidated_queue_names[exchange_name]
+            router = self.__pipeline_compiler.compile_router(exchange_type, routes, queue_name)
+
+            router_func = router.func
+            if self.__loopback_router is not None and self.__is_loopback_forwarding:
+                router_func = skip_looped_back(queue_name, router_func)
+
+            started = _StartedConsumer()
+            started.move(await self.__connector.create_consumer(
+                consumer=router_func,
+                binding_keys=sorted({
+                    binding_key
+                    for route_bindings, _ in routes
+                    for binding_key in route_bindings.binding_keys
+                }),
+                exchange_name=exchange_name,
+                exchange_type=exchange_type,
+                queue_name=queue_name,
+                prefetch_count=sum(t.cast(t.List[int], prefetch_counts)) if None not in prefetch_counts else None,
+                on_failover=started.move,
+                **get_consumer_declaration(routes[0][0], queue_name)._asdict(),
+            ))
+            self.__started_consumers.append(started)
+
+            if any(self.__byte_budget.is_enabled_for(route_bindings) for route_bindings, _ in routes):
+                self.__register_budget([route_bindings for route_bindings, _ in routes], started, router_func)
 
     async def stop(self) -> None:
-        for consumer_tag, queue in self.__consumer_tags.items():
-            await self.__connector.remove_consumer(queue, consumer_tag)
+        await self.__byte_budget.close()
+
+        for tuner in self.__declared_prefetch_tuners.values():
+            await tuner.detach()
+
+        started_consumers, self.__started_consumers = self.__started_consumers, []
+        for started in started_consumers:
+            if started.queue is not None:
+                await self.__connector.remove_consumer(started.queue, started.consumer_tag)
+
+        for consumer in self.__declared_consumers.values():
+            await consumer.drain()
+
+        for stream in self.__declared_streams.values():
+            stream.close()
+
+        for loopback in self.__loopback_publishers.values():
+            await loopback.drain()
+
+        # draining handlers may still wait for replies.
+        if self.__reply_consumer is not None:
+            (reply_queue, reply_consumer_tag), self.__reply_consumer = self.__reply_consumer, None
+            await self.__connector.remove_consumer(reply_queue, reply_consumer_tag)
+            self.__rpc_client.detach()
+
+        loop = asyncio.get_running_loop()
+        for executor in self.__owned_executors:
+            await loop.run_in_executor(None, executor.shutdown)
+
+        if self.__memory_attribution is not None:
+            self.__memory_attribution.stop()
+
+    def __attach_reply_channel(self, channel: AbstractChannel) -> None:
+        self.__reply_publisher.attach(channel.default_exchange)
+
+    def __attach_reply_consumer(self, reply_consumer: t.Tuple[AbstractChannel, AbstractQueue, str]) -> None:
+        request_channel, reply_queue, reply_consumer_tag = reply_consumer
+        self.__rpc_client.attach(request_channel)
+        self.__reply_consumer = reply_queue, reply_consumer_tag
+
+    def __get_loopback_token(self, bindings: AmqpConsumerBindings) -> str:
+        # named queues are shared by instances of a service, anonymous queues belong to this instance only.
+        queue_name = self.__consolidated_queue_names.get(bindings.exchange_name, bindings.queue_name)
+        return queue_name or f"{self.__instance_id}/{bindings.label}"
+
+    def __get_executor(self, kind: t.Literal["thread", "process"]) -> Executor:
+        executor = self.__executors.get(kind)
+        if executor is None:
+            executor = self.__executors[kind] = ThreadPoolExecutor() if kind == "thread" else ProcessPoolExecutor()
+            self.__owned_executors.append(executor)
+
+        return executor
+
+    def __register_budget(
+            self,
+            bindings: t.Sequence[AmqpConsumerBindings],
+            started: _StartedConsumer,
+            consumer: MessageConsumerFunc[AbstractIncomingMessage],
+    ) -> None:
+        """
+        Consumer is paused by cancelling it on the queue and is resumed by consuming the queue again, a consumer, that
+        fails over to another node while paused, stays paused.
+        """
+
+        async def pause() -> None:
+            queue, consumer_tag, started.consumer_tag = started.queue, started.consumer_tag, None
+            if queue is not None and consumer_tag is not None:
+                await self.__connector.pause_consumer(queue, consumer_tag)
+
+        async def resume() -> None:
+            if started.queue is not None and started.consumer_tag is None:
+                started.consumer_tag = await self.__connector.resume_consumer(started.queue, consumer)
+
+        self.__byte_budget.register([consumer_bindings.label for consumer_bindings in bindings], pause, resume)
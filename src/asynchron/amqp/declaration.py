@@ -0,0 +1,54 @@
+__all__ = (
+    "ConsumerDeclaration",
+    "get_consumer_declaration",
+)
+
+import typing as t
+
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.strict_typing import get_or_default
+
+
+class ConsumerDeclaration(t.NamedTuple):
+    """Flags and arguments of the exchange and the queue of a consumer, as they are passed to the connector."""
+
+    exchange_durable: bool
+    exchange_auto_delete: bool
+    queue_durable: bool
+    queue_exclusive: bool
+    queue_auto_delete: bool
+    queue_arguments: t.Mapping[str, object]
+
+
+def get_consumer_declaration(
+        bindings: AmqpConsumerBindings,
+        queue_name: t.Optional[str] = None,
+) -> ConsumerDeclaration:
+    """
+    Quorum queues are durable by default, they must be named, replicated queues can't be exclusive, auto deleted,
+    transient or lazy. Invalid combinations are rejected before they are declared on the broker.
+    """
+
+    declaration = ConsumerDeclaration(
+        exchange_durable=get_or_default(bindings.is_exchange_durable, False),
+        exchange_auto_delete=get_or_default(bindings.is_exchange_auto_delete_enabled, False),
+        queue_durable=get_or_default(bindings.is_durable, bindings.queue_type == "quorum"),
+        queue_exclusive=get_or_default(bindings.is_exclusive, False),
+        queue_auto_delete=get_or_default(bindings.is_auto_delete_enabled, False),
+        queue_arguments=bindings.queue_arguments,
+    )
+
+    if bindings.queue_type == "quorum":
+        if not (queue_name or bindings.queue_name):
+            raise ValueError("Quorum queue must be named", bindings)
+
+        if declaration.queue_exclusive or declaration.queue_auto_delete or not declaration.queue_durable:
+            raise ValueError("Quorum queue must be durable, not exclusive and not auto deleted", bindings)
+
+        if bindings.queue_mode == "lazy" or bindings.overflow == "reject-publish-dlx":
+            raise ValueError("Lazy mode and reject-publish-dlx overflow apply to classic queues only", bindings)
+
+    if bindings.max_length is not None and bindings.max_length < 0:
+        raise ValueError("Max queue length must not be negative", bindings)
+
+    return declaration
@@ -0,0 +1,63 @@
+__all__ = (
+    "PUBLISHED_AT_HEADER",
+    "ORIGIN_PUBLISHED_AT_HEADER",
+    "HOPS_HEADER",
+    "LatencyStamper",
+    "get_header_timestamp_ns",
+)
+
+import time
+import typing as t
+
+from aio_pika.abc import AbstractMessage
+
+# nanoseconds since epoch, when the message was published by the last hop.
+PUBLISHED_AT_HEADER: t.Final[str] = "x-published-at"
+# nanoseconds since epoch, when the message was published by the first hop. Kept, when headers are forwarded.
+ORIGIN_PUBLISHED_AT_HEADER: t.Final[str] = "x-origin-published-at"
+# comma separated names of services, that published the message.
+HOPS_HEADER: t.Final[str] = "x-hops"
+
+
+class LatencyStamper:
+    """Stamps publish timestamps (and a hop name) into headers of outgoing messages."""
+
+    def __init__(
+            self,
+            hop_name: t.Optional[str] = None,
+    ) -> None:
+        self.__hop_name = hop_name
+
+    def stamp(self, message: AbstractMessage) -> None:
+        now = time.time_ns()
+        # NOTE: `headers` setter of aio-pika message replaces raw headers, but not the proxy, so raw headers are
+        #  updated in place.
+        headers = message.headers_raw
+        headers[PUBLISHED_AT_HEADER] = now
+
+        if ORIGIN_PUBLISHED_AT_HEADER not in headers:
+            headers[ORIGIN_PUBLISHED_AT_HEADER] = now
+
+        if self.__hop_name is not None:
+            hops = headers.get(HOPS_HEADER)
+            if isinstance(hops, (bytes, bytearray)):
+                hops = hops.decode("utf-8")
+
+            headers[HOPS_HEADER] = f"{hops},{self.__hop_name}" if hops else self.__hop_name
+
+
+def get_header_timestamp_ns(headers: t.Optional[t.Mapping[str, object]], name: str) -> t.Optional[int]:
+    """Returns stamped timestamp, headers may come from the broker (int) or be forwarded as strings by a service."""
+
+    if not headers:
+        return None
+
+    value = headers.get(name)
+    if value is None:
+        return None
+
+    try:
+        return int(t.cast(t.Union[int, str, bytes], value))
+
+    except ValueError:
+        return None
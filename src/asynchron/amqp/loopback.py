@@ -0,0 +1,170 @@
+__all__ = (
+    "LOOPBACK_HEADER",
+    "LoopbackRouter",
+    "LoopbackMessagePublisher",
+    "is_deliverable_locally",
+    "skip_looped_back",
+)
+
+import asyncio
+import typing as t
+
+from aio_pika.abc import AbstractIncomingMessage, AbstractMessage
+
+from asynchron.amqp.consumer.routing import TopicRoutingTrie
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings
+from asynchron.core.consumer import MessageConsumer, MessageConsumerFunc
+from asynchron.core.message import MessageEncoder
+from asynchron.core.metrics import Metrics, get_enabled_metrics
+from asynchron.core.publisher import EncodedMessagePublisher, MessagePublisher
+
+T = t.TypeVar("T")
+
+# comma separated tokens of consumers (queues), that got the forwarded message in process already.
+LOOPBACK_HEADER: t.Final[str] = "x-loopback"
+
+LoopbackRoute = t.Tuple[str, MessageConsumer[object]]
+
+
+def is_deliverable_locally(bindings: AmqpConsumerBindings) -> bool:
+    """
+    Local delivery passes the built message to the consumer, so consumers with stages, that need the broker delivery
+    (key ordering, retries, age and admission checks, decoding in worker processes), get messages through the broker.
+    """
+
+    return bindings.ordering_key_header is None and bindings.ordering_key_field is None \
+        and not bindings.retry_delays and bindings.max_message_age is None and bindings.max_timestamp_age is None \
+        and bindings.admitted_headers is None and bindings.admitted_app_ids is None \
+        and bindings.handler_executor != "process"
+
+
+class LoopbackRouter:
+    """Matches publisher bindings with local consumer bindings the same way as the broker routes a message."""
+
+    def __init__(self) -> None:
+        self.__routes: t.Dict[str, t.List[t.Tuple[AmqpConsumerBindings, LoopbackRoute]]] = {}
+
+    def add(self, bindings: AmqpConsumerBindings, token: str, consumer: MessageConsumer[T]) -> None:
+        # bindings of a channel are generated with one message type for its publisher and consumers.
+        route = token, t.cast(MessageConsumer[object], consumer)
+        self.__routes.setdefault(bindings.exchange_name, []).append((bindings, route))
+
+    def match(self, bindings: AmqpPublisherBindings) -> t.Sequence[LoopbackRoute]:
+        trie: TopicRoutingTrie[LoopbackRoute] = TopicRoutingTrie()
+        matched: t.List[LoopbackRoute] = []
+
+        for consumer_bindings, route in self.__routes.get(bindings.exchange_name, ()):
+            exchange_type = consumer_bindings.exchange_type or bindings.exchange_type
+
+            if exchange_type == "fanout":
+                matched.append(route)
+
+            elif exchange_type is None or exchange_type == "direct":
+                if bindings.routing_key in consumer_bindings.binding_keys:
+                    matched.append(route)
+
+            elif exchange_type == "topic":
+                for binding_key in consumer_bindings.binding_keys:
+                    trie.add(binding_key, route)
+
+        matched.extend(trie.match(bindings.routing_key))
+
+        return tuple({id(route): route for route in matched}.values())
+
+
+class _LoopbackHeaderPublisher(MessagePublisher[AbstractMessage]):
+    def __init__(self, publisher: MessagePublisher[AbstractMessage]) -> None:
+        self.__publisher = publisher
+        self.tokens: t.Optional[str] = None
+
+    async def publish(self, message: AbstractMessage) -> None:
+        if self.tokens is not None:
+            message.headers_raw[LOOPBACK_HEADER] = self.tokens
+
+        await self.__publisher.publish(message)
+
+
+class LoopbackMessagePublisher(MessagePublisher[T]):
+    """
+    Passes published messages to consumers of matching local bindings as they are, without encoding and decoding, so
+    consumers must not mutate them. When forwarding is enabled, the message is published to the broker as well and
+    the forwarded copy is marked, so local consumers skip it. Local consumers run in background tasks without the
+    consumer pipeline (see `is_deliverable_locally`), handler errors are counted and passed to the exception handler
+    of the loop, because there is no delivery to reject.
+    """
+
+    def __init__(
+            self,
+            encoder: MessageEncoder[T, AbstractMessage],
+            publisher: MessagePublisher[AbstractMessage],
+            is_forwarding: bool,
+            metrics: t.Optional[Metrics] = None,
+            binding: str = "",
+    ) -> None:
+        self.__header = _LoopbackHeaderPublisher(publisher)
+        self.__encoded = EncodedMessagePublisher(encoder, self.__header, metrics, binding)
+        self.__is_forwarding = is_forwarding
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__binding = binding
+
+        self.__routes: t.Sequence[LoopbackRoute] = ()
+        self.__tasks: t.Set["asyncio.Task[None]"] = set()
+
+    def attach(self, routes: t.Sequence[LoopbackRoute]) -> None:
+        self.__routes = routes
+        self.__header.tokens = ",".join(token for token, _ in routes) if routes else None
+
+    async def publish(self, message: T) -> None:
+        routes = self.__routes
+
+        for token, consumer in routes:
+            task = asyncio.ensure_future(self.__consume(token, consumer, message))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+
+        if not routes or self.__is_forwarding:
+            await self.__encoded.publish(message)
+
+    async def drain(self) -> None:
+        """Waits for local consumers, that are still running."""
+
+        tasks = tuple(self.__tasks)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __consume(self, token: str, consumer: MessageConsumer[object], message: T) -> None:
+        try:
+            await consumer.consume(message)
+
+        except Exception as err:
+            if self.__metrics is not None:
+                self.__metrics.increment("loopback_failed", self.__binding)
+
+            asyncio.get_running_loop().call_exception_handler({
+                "message": f"Loopback consumer failed, consumer: {token!r}",
+                "exception": err,
+            })
+            return
+
+        if self.__metrics is not None:
+            self.__metrics.increment("loopback_delivered", self.__binding)
+
+
+def skip_looped_back(
+        token: str,
+        func: MessageConsumerFunc[AbstractIncomingMessage],
+) -> MessageConsumerFunc[AbstractIncomingMessage]:
+    """Acks forwarded messages, that were consumed in process already by the consumer with the token."""
+
+    async def consume(message: AbstractIncomingMessage) -> None:
+        tokens = (message.headers_raw or {}).get(LOOPBACK_HEADER)
+        if isinstance(tokens, (bytes, bytearray)):
+            tokens = tokens.decode("utf-8")
+
+        if isinstance(tokens, str) and token in tokens.split(","):
+            await message.ack()
+            return
+
+        await func(message)
+
+    return consume
@@ -2,11 +2,16 @@ __all__ = (
     "ExchangeMessagePublisher",
 )
 
+import time
 import typing as t
 
 from aio_pika.abc import AbstractExchange, AbstractMessage
 from aio_pika.types import TimeoutType
 
+from asynchron.amqp.latency import LatencyStamper
+from asynchron.amqp.publisher.properties import MessagePropertiesTemplate
+from asynchron.amqp.tracing import Tracer
+from asynchron.core.metrics import Metrics, get_enabled_metrics
 from asynchron.core.publisher import MessagePublisher
 
 
@@ -29,15 +34,37 @@ class ExchangeMessagePublisher(MessagePublisher[AbstractMessage]):
             routing_key: str,
             is_mandatory: bool,
             exchange: t.Optional[AbstractExchange] = None,
+            metrics: t.Optional[Metrics] = None,
+            binding: str = "",
+            stamper: t.Optional[LatencyStamper] = None,
+            tracer: t.Optional[Tracer] = None,
+            properties: t.Optional[MessagePropertiesTemplate] = None,
     ) -> None:
         self.__publish = self.__raise_error
         self.__routing_key = routing_key
         self.__is_mandatory = is_mandatory
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__binding = binding
+        self.__stamper = stamper
+        self.__tracer = tracer
+        self.__properties = properties
 
         if exchange is not None:
             self.attach(exchange)
 
     async def publish(self, message: AbstractMessage) -> None:
+        if self.__properties is not None:
+            self.__properties.apply(message)
+
+        if self.__stamper is not None:
+            self.__stamper.stamp(message)
+
+        if self.__tracer is not None:
+            return await self.__publish_traced(self.__tracer, message)
+
+        if self.__metrics is not None:
+            return await self.__publish_measured(self.__metrics, message)
+
         await self.__publish(
             message=message,
             routing_key=self.__routing_key,
@@ -48,6 +75,49 @@ class ExchangeMessagePublisher(MessagePublisher[AbstractMessage]):
         # FIXME: fix typing in aio_pika lib (t.Optional[TimeoutType]).
         self.__publish = t.cast(PublishFunc, exchange.publish)
 
+    async def __publish_traced(self, tracer: Tracer, message: AbstractMessage) -> None:
+        context = tracer.publish(message.headers_raw)
+        started_at = time.time_ns()
+
+        try:
+            if self.__metrics is not None:
+                await self.__publish_measured(self.__metrics, message)
+
+            else:
+                await self.__publish(
+                    message=message,
+                    routing_key=self.__routing_key,
+                    mandatory=self.__is_mandatory,
+                )
+
+        except BaseException as err:
+            if context is not None:
+                tracer.finish("publish", self.__binding, context, started_at, err)
+
+            raise
+
+        if context is not None:
+            tracer.finish("publish", self.__binding, context, started_at)
+
+    async def __publish_measured(self, metrics: Metrics, message: AbstractMessage) -> None:
+        started_at = time.perf_counter()
+
+        try:
+            await self.__publish(
+                message=message,
+                routing_key=self.__routing_key,
+                mandatory=self.__is_mandatory,
+            )
+
+        except BaseException:
+            metrics.increment("publish_failed", self.__binding)
+            raise
+
+        finally:
+            metrics.observe("publish_seconds", self.__binding, time.perf_counter() - started_at)
+
+        metrics.increment("published", self.__binding)
+
     async def __raise_error(
             self,
             message: AbstractMessage,
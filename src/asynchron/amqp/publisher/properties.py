@@ -0,0 +1,101 @@
+__all__ = (
+    "MessagePropertiesTemplate",
+    "get_publish_properties",
+)
+
+import typing as t
+from datetime import datetime, timezone
+
+from aio_pika.abc import AbstractMessage, DeliveryMode
+from pamqp.common import FieldTable
+
+from asynchron.core.amqp import AmqpPublisherBindings
+
+
+def get_publish_properties(bindings: AmqpPublisherBindings) -> t.Dict[str, object]:
+    """
+    Content header properties of publisher bindings as they are encoded on the wire (pamqp `Basic.Properties` fields).
+    Sender selected routing keys go to `CC` and `BCC` headers. Timestamps are set per message and are not included.
+    """
+
+    properties: t.Dict[str, object] = {}
+
+    if bindings.delivery_mode is not None:
+        properties["delivery_mode"] = bindings.delivery_mode
+    if bindings.priority is not None:
+        properties["priority"] = bindings.priority
+    if bindings.expiration is not None:
+        properties["expiration"] = str(bindings.expiration)
+    if bindings.user_id is not None:
+        properties["user_id"] = bindings.user_id
+
+    headers = _get_publish_headers(bindings)
+    if headers:
+        properties["headers"] = headers
+
+    return properties
+
+
+def _get_publish_headers(bindings: AmqpPublisherBindings) -> FieldTable:
+    headers: FieldTable = {}
+    if bindings.cc:
+        headers["CC"] = list(bindings.cc)
+    if bindings.bcc:
+        headers["BCC"] = list(bindings.bcc)
+
+    return headers
+
+
+class MessagePropertiesTemplate:
+    """
+    Message properties of publisher bindings, converted once to the values of aio-pika message attributes and set on
+    each published message. They override properties of encoded messages, because aio-pika messages have defaults for
+    delivery mode and priority and explicitly set values can't be told from them.
+    """
+
+    def __init__(
+            self,
+            attributes: t.Sequence[t.Tuple[str, object]] = (),
+            headers: t.Optional[FieldTable] = None,
+            is_timestamp_enabled: bool = False,
+    ) -> None:
+        self.__attributes = tuple(attributes)
+        self.__headers = tuple(headers.items()) if headers else ()
+        self.__is_timestamp_enabled = is_timestamp_enabled
+
+    @classmethod
+    def from_bindings(cls, bindings: AmqpPublisherBindings) -> t.Optional["MessagePropertiesTemplate"]:
+        """Returns none, when bindings set no message properties, so publishers don't apply an empty template."""
+
+        attributes: t.List[t.Tuple[str, object]] = []
+        if bindings.delivery_mode is not None:
+            attributes.append(("delivery_mode", DeliveryMode(bindings.delivery_mode)))
+        if bindings.priority is not None:
+            attributes.append(("priority", bindings.priority))
+        if bindings.expiration is not None:
+            # aio-pika keeps expiration in seconds and truncates it to milliseconds on encoding, half a millisecond
+            # compensates float rounding.
+            attributes.append(("expiration", (bindings.expiration + 0.5) / 1000))
+        if bindings.user_id is not None:
+            attributes.append(("user_id", bindings.user_id))
+
+        headers = _get_publish_headers(bindings)
+
+        if not attributes and not headers and not bindings.is_timestamp_enabled:
+            return None
+
+        return cls(attributes, headers or None, bool(bindings.is_timestamp_enabled))
+
+    def apply(self, message: AbstractMessage) -> None:
+        for name, value in self.__attributes:
+            setattr(message, name, value)
+
+        if self.__headers:
+            # NOTE: raw headers are updated in place, `headers` setter of aio-pika message doesn't update the proxy.
+            headers = message.headers_raw
+            for name, value in self.__headers:
+                # list values (`CC` and `BCC`) are copied, messages don't share them.
+                headers[name] = list(value) if isinstance(value, list) else value
+
+        if self.__is_timestamp_enabled:
+            message.timestamp = datetime.now(tz=timezone.utc)
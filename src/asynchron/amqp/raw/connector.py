@@ -0,0 +1,121 @@
+__all__ = (
+    "AiormqConnector",
+)
+
+import asyncio
+import typing as t
+from types import TracebackType
+
+import aiormq
+from aiormq.abc import AbstractChannel, AbstractConnection, ConsumerCallback
+
+from asynchron.core.amqp import AmqpServerBindings
+
+
+class AiormqConnector(t.AsyncContextManager["AiormqConnector"]):
+    """Connector on plain aiormq channels, the connection is not restored when it is lost."""
+
+    def __init__(
+            self,
+            bindings: AmqpServerBindings,
+    ) -> None:
+        self.__bindings = bindings
+
+        self.__lock: t.Optional[asyncio.Lock] = None
+        self.__connection: t.Optional[AbstractConnection] = None
+
+    async def __aenter__(self) -> "AiormqConnector":
+        lock = self.__lock = (self.__lock or asyncio.Lock())
+
+        async with lock:
+            if self.__connection is None:
+                self.__connection = await aiormq.connect(self.__bindings.connection_url)
+
+        return self
+
+    async def __aexit__(
+            self,
+            __exc_type: t.Optional[t.Type[BaseException]],
+            __exc_value: t.Optional[BaseException],
+            __traceback: t.Optional[TracebackType],
+    ) -> t.Optional[bool]:
+        if self.__connection is not None:
+            connection, self.__connection = self.__connection, None
+
+            if __exc_type is not None:
+                await connection.close(__exc_type)
+
+            else:
+                await connection.close()
+
+        return None
+
+    async def create_channel(self, prefetch_count: t.Optional[int]) -> AbstractChannel:
+        if self.__connection is None:
+            raise RuntimeError()
+
+        channel = await self.__connection.channel()
+        await channel.basic_qos(prefetch_count=prefetch_count or 0)
+
+        return channel
+
+    async def create_exchange(
+            self,
+            exchange_name: t.Optional[str] = None,
+            exchange_type: t.Optional[t.Literal["fanout", "direct", "topic", "headers"]] = None,
+            prefetch_count: t.Optional[int] = None,
+            exchange_durable: bool = False,
+            exchange_auto_delete: bool = False,
+    ) -> AbstractChannel:
+        channel = await self.create_channel(prefetch_count)
+
+        # default exchange can't be declared.
+        if exchange_name:
+            await channel.exchange_declare(exchange=exchange_name, exchange_type=exchange_type or "direct",
+                                           durable=exchange_durable, auto_delete=exchange_auto_delete)
+
+        return channel
+
+    async def create_consumer(
+            self,
+            consumer: ConsumerCallback,
+            binding_keys: t.Collection[str],
+            exchange_name: t.Optional[str] = None,
+            exchange_type: t.Optional[t.Literal["fanout", "direct", "topic", "headers"]] = None,
+            queue_name: t.Optional[str] = None,
+            prefetch_count: t.Optional[int] = None,
+            exchange_durable: bool = False,
+            exchange_auto_delete: bool = False,
+            queue_durable: bool = False,
+            queue_exclusive: bool = False,
+            queue_auto_delete: bool = False,
+            queue_arguments: t.Optional[t.Mapping[str, object]] = None,
+    ) -> t.Tuple[AbstractChannel, str, str]:
+        channel = await self.create_exchange(
+            exchange_name=exchange_name,
+            exchange_type=exchange_type,
+            prefetch_count=prefetch_count,
+            exchange_durable=exchange_durable,
+            exchange_auto_delete=exchange_auto_delete,
+        )
+
+        declare_ok = await channel.queue_declare(queue_name or "", durable=queue_durable, exclusive=queue_exclusive,
+                                                 auto_delete=queue_auto_delete,
+                                                 arguments=dict(queue_arguments or {}))
+        declared_queue_name = t.cast(str, declare_ok.queue)
+
+        # default exchange routes by queue name and doesn't accept bindings.
+        if exchange_name:
+            for binding_key in binding_keys:
+                await channel.queue_bind(declared_queue_name, exchange_name, routing_key=binding_key)
+
+        consume_ok = await channel.basic_consume(declared_queue_name, consumer)
+
+        return channel, declared_queue_name, t.cast(str, consume_ok.consumer_tag)
+
+    async def remove_consumer(
+            self,
+            channel: AbstractChannel,
+            consumer_tag: str,
+    ) -> None:
+        await channel.basic_cancel(consumer_tag)
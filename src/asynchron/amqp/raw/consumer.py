@@ -0,0 +1,74 @@
+__all__ = (
+    "RawProcessingConsumer",
+)
+
+import asyncio
+import typing as t
+
+from aiormq.abc import DeliveredMessage
+from pamqp import commands
+
+from asynchron.amqp.raw.message import RawDelivery
+from asynchron.core.consumer import MessageConsumer
+from asynchron.core.metrics import Metrics, get_enabled_metrics
+
+
+class RawProcessingConsumer:
+    """
+    Consumer callback of an aiormq channel: passes the raw delivery to the consumer, acks it on success and rejects it
+    on error. Handler errors are not raised to aiormq, there is no one to handle them, they are reported to the
+    exception handler of the loop.
+    """
+
+    def __init__(
+            self,
+            consumer: MessageConsumer[RawDelivery],
+            requeue_on_exception: bool = False,
+            metrics: t.Optional[Metrics] = None,
+            binding: str = "",
+    ) -> None:
+        self.__consumer = consumer
+        self.__requeue_on_exception = requeue_on_exception
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__binding = binding
+
+        self.__in_flight = 0
+        self.__drained: t.Optional["asyncio.Future[None]"] = None
+
+    async def __call__(self, message: DeliveredMessage) -> None:
+        # consumer callbacks get Basic.Deliver frames only.
+        delivery_tag = t.cast(int, t.cast(commands.Basic.Deliver, message.delivery).delivery_tag)
+        channel = message.channel
+        self.__in_flight += 1
+
+        try:
+            await self.__consumer.consume(RawDelivery(message.header.properties, memoryview(message.body),
+                                                      delivery_tag))
+
+        except Exception as err:
+            asyncio.get_running_loop().call_exception_handler({
+                "message": f"Raw consumer failed, binding: {self.__binding!r}",
+                "exception": err,
+            })
+            await channel.basic_reject(delivery_tag, requeue=self.__requeue_on_exception)
+
+            if self.__metrics is not None:
+                self.__metrics.increment("nacked", self.__binding)
+
+        else:
+            await channel.basic_ack(delivery_tag)
+
+            if self.__metrics is not None:
+                self.__metrics.increment("acked", self.__binding)
+
+        finally:
+            self.__in_flight -= 1
+            if self.__in_flight == 0 and self.__drained is not None and not self.__drained.done():
+                self.__drained.set_result(None)
+
+    async def drain(self) -> None:
+        """Waits for deliveries, that are still consumed."""
+
+        if self.__in_flight:
+            self.__drained = asyncio.get_running_loop().create_future()
+            await self.__drained
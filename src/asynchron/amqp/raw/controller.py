@@ -0,0 +1,216 @@
+__all__ = (
+    "AiormqBasedAmqpController",
+    "AiormqFacadeController",
+)
+
+import typing as t
+
+from aio_pika.abc import AbstractIncomingMessage, AbstractMessage
+from aiormq.abc import AbstractChannel
+
+from asynchron.amqp.declaration import get_consumer_declaration
+from asynchron.amqp.publisher.properties import get_publish_properties
+from asynchron.amqp.raw.connector import AiormqConnector
+from asynchron.amqp.raw.consumer import RawProcessingConsumer
+from asynchron.amqp.raw.message import RawDelivery, RawMessage
+from asynchron.amqp.raw.publisher import RawExchangePublisher
+from asynchron.amqp.raw.serializer import RawPydanticMessageSerializer, as_raw_decoder, as_raw_encoder
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings
+from asynchron.core.consumer import DecodedMessageConsumer, MessageConsumer
+from asynchron.core.controller import Controller
+from asynchron.core.message import MessageDecoder, MessageEncoder
+from asynchron.core.metrics import Metrics
+from asynchron.core.publisher import EncodedMessagePublisher, MessagePublisher
+from asynchron.core.requester import MessageRequester, MessageResponderFunc
+from asynchron.strict_typing import get_or_default
+
+T = t.TypeVar("T")
+R = t.TypeVar("R")
+
+
+class AiormqBasedAmqpController(
+    Controller[RawDelivery, AmqpConsumerBindings, RawMessage, AmqpPublisherBindings],
+):
+    """
+    Fast path controller on raw aiormq frames for high volume bindings: decoders get the delivered properties and body
+    as they were read and encoders return bodies with pre-encoded properties, no aio-pika messages are created.
+    Binding features, that are built on aio-pika messages (key ordering, delayed retries, adaptive prefetch, in flight
+    byte budgets, handler executors, message age and admission) and RPC, are rejected. Generated facades run on it
+    through `AiormqFacadeController`.
+    """
+
+    def __init__(
+            self,
+            connector: AiormqConnector,
+            default_mandatory: bool = True,
+            requeue_on_exception: bool = False,
+            metrics: t.Optional[Metrics] = None,
+    ) -> None:
+        self.__connector = connector
+        self.__default_mandatory = default_mandatory
+        self.__requeue_on_exception = requeue_on_exception
+        self.__metrics = metrics
+
+        self.__declared_consumers: t.Dict[AmqpConsumerBindings, RawProcessingConsumer] = {}
+        self.__declared_publishers: t.Dict[AmqpPublisherBindings, RawExchangePublisher] = {}
+        self.__consumer_tags: t.Dict[str, AbstractChannel] = {}
+
+    def bind_consumer(
+            self,
+            decoder: MessageDecoder[RawDelivery, T],
+            consumer: MessageConsumer[T],
+            bindings: AmqpConsumerBindings,
+    ) -> MessageConsumer[RawDelivery]:
+        if bindings.ordering_key_header is not None or bindings.ordering_key_field is not None \
+                or bindings.retry_delays or bindings.min_prefetch_count is not None \
+                or bindings.max_prefetch_count is not None or bindings.max_in_flight_bytes is not None \
+                or bindings.handler_executor is not None or bindings.max_message_age is not None \
+                or bindings.admitted_headers or bindings.admitted_app_ids is not None \
+                or bindings.max_timestamp_age is not None:
+            raise ValueError("Consumer bindings use features, that aren't supported by aiormq based controller",
+                             bindings)
+
+        get_consumer_declaration(bindings)
+
+        decoded = DecodedMessageConsumer(decoder, consumer, self.__metrics, bindings.label)
+        self.__declared_consumers[bindings] = RawProcessingConsumer(
+            consumer=decoded,
+            requeue_on_exception=self.__requeue_on_exception,
+            metrics=self.__metrics,
+            binding=bindings.label,
+        )
+
+        return decoded
+
+    def bind_publisher(
+            self,
+            encoder: MessageEncoder[T, RawMessage],
+            bindings: AmqpPublisherBindings,
+    ) -> MessagePublisher[T]:
+        if bindings.is_timestamp_enabled:
+            raise ValueError("Message timestamps can't be pre-encoded by aiormq based controller", bindings)
+
+        # publish properties are pre-encoded with the content properties of the encoder.
+        properties = get_publish_properties(bindings)
+        if properties:
+            if not isinstance(encoder, RawPydanticMessageSerializer):
+                raise ValueError("Publish properties can't be added to messages of a raw encoder", encoder)
+
+            encoder = RawPydanticMessageSerializer(encoder.model, encoder.protocol, properties)
+
+        publisher = self.__declared_publishers[bindings] = RawExchangePublisher(
+            exchange_name=bindings.exchange_name,
+            routing_key=bindings.routing_key,
+            is_mandatory=get_or_default(bindings.is_mandatory, self.__default_mandatory),
+            metrics=self.__metrics,
+            binding=bindings.label,
+        )
+
+        return EncodedMessagePublisher(
+            encoder=encoder,
+            publisher=publisher,
+            metrics=self.__metrics,
+            binding=bindings.label,
+        )
+
+    def bind_requester(
+            self,
+            encoder: MessageEncoder[T, RawMessage],
+            decoder: MessageDecoder[RawDelivery, R],
+            bindings: AmqpPublisherBindings,
+    ) -> MessageRequester[T, R]:
+        raise ValueError("Requester bindings aren't supported by aiormq based controller", bindings)
+
+    def bind_responder(
+            self,
+            decoder: MessageDecoder[RawDelivery, T],
+            encoder: MessageEncoder[R, RawMessage],
+            responder: MessageResponderFunc[T, R],
+            bindings: AmqpConsumerBindings,
+    ) -> MessageConsumer[RawDelivery]:
+        raise ValueError("Responder bindings aren't supported by aiormq based controller", bindings)
+
+    async def start(self) -> None:
+        for publisher_bindings, publisher in self.__declared_publishers.items():
+            channel = await self.__connector.create_exchange(
+                exchange_name=publisher_bindings.exchange_name,
+                exchange_type=publisher_bindings.exchange_type,
+                prefetch_count=publisher_bindings.prefetch_count,
+                exchange_durable=get_or_default(publisher_bindings.is_durable, False),
+                exchange_auto_delete=get_or_default(publisher_bindings.is_auto_delete_enabled, False),
+            )
+            publisher.attach(channel)
+
+        for consumer_bindings, consumer in self.__declared_consumers.items():
+            channel, _, consumer_tag = await self.__connector.create_consumer(
+                consumer=consumer,
+                binding_keys=consumer_bindings.binding_keys,
+                exchange_name=consumer_bindings.exchange_name,
+                exchange_type=consumer_bindings.exchange_type,
+                queue_name=consumer_bindings.queue_name,
+                prefetch_count=consumer_bindings.prefetch_count,
+                **get_consumer_declaration(consumer_bindings)._asdict(),
+            )
+            self.__consumer_tags[consumer_tag] = channel
+
+    async def stop(self) -> None:
+        for consumer_tag, channel in self.__consumer_tags.items():
+            await self.__connector.remove_consumer(channel, consumer_tag)
+
+        self.__consumer_tags.clear()
+
+        for consumer in self.__declared_consumers.values():
+            await consumer.drain()
+
+
+class AiormqFacadeController(
+    Controller[AbstractIncomingMessage, AmqpConsumerBindings, AbstractMessage, AmqpPublisherBindings],
+):
+    """
+    Binds serializers of generated facades to an aiormq based controller: pydantic serializers are replaced with raw
+    equivalents, other serializers are rejected. Returned consumers decode aio-pika messages, deliveries of the broker
+    are consumed by the raw controller.
+    """
+
+    def __init__(self, controller: AiormqBasedAmqpController) -> None:
+        self.__controller = controller
+
+    def bind_consumer(
+            self,
+            decoder: MessageDecoder[AbstractIncomingMessage, T],
+            consumer: MessageConsumer[T],
+            bindings: AmqpConsumerBindings,
+    ) -> MessageConsumer[AbstractIncomingMessage]:
+        self.__controller.bind_consumer(as_raw_decoder(decoder), consumer, bindings)
+
+        return DecodedMessageConsumer(decoder, consumer)
+
+    def bind_publisher(
+            self,
+            encoder: MessageEncoder[T, AbstractMessage],
+            bindings: AmqpPublisherBindings,
+    ) -> MessagePublisher[T]:
+        return self.__controller.bind_publisher(as_raw_encoder(encoder), bindings)
+
+    def bind_requester(
+            self,
+            encoder: MessageEncoder[T, AbstractMessage],
+            decoder: MessageDecoder[AbstractIncomingMessage, R],
+            bindings: AmqpPublisherBindings,
+    ) -> MessageRequester[T, R]:
+        raise ValueError("Requester bindings aren't supported by aiormq based controller", bindings)
+
+    def bind_responder(
+            self,
+            decoder: MessageDecoder[AbstractIncomingMessage, T],
+            encoder: MessageEncoder[R, AbstractMessage],
+            responder: MessageResponderFunc[T, R],
+            bindings: AmqpConsumerBindings,
+    ) -> MessageConsumer[AbstractIncomingMessage]:
+        raise ValueError("Responder bindings aren't supported by aiormq based controller", bindings)
+
+    async def start(self) -> None:
+        await self.__controller.start()
+
+    async def stop(self) -> None:
+        await self.__controller.stop()
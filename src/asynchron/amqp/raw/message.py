@@ -0,0 +1,90 @@
+__all__ = (
+    "RawDelivery",
+    "RawMessage",
+    "PropertiesTemplate",
+    "EncodedProperties",
+)
+
+import struct
+import typing as t
+
+from pamqp import commands
+
+_MESSAGE_ID_FLAG: t.Final[int] = commands.Basic.Properties.flags["message_id"]
+
+
+class RawDelivery(t.NamedTuple):
+    """A delivered message as it was read from the channel, without aio-pika message objects."""
+
+    properties: commands.Basic.Properties
+    body: memoryview
+    delivery_tag: int
+
+
+class EncodedProperties:
+    """
+    Content header properties, that are marshalled from the encoded blob of a template. The message id is the only
+    attribute, aiormq reads on publish.
+    """
+
+    __slots__ = ("message_id", "__template",)
+
+    def __init__(self, template: "PropertiesTemplate", message_id: str) -> None:
+        self.message_id = message_id
+        self.__template = template
+
+    def marshal(self) -> bytes:
+        return self.__template.marshal(self.message_id)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} message_id={self.message_id!r} properties={self.__template.properties!r}>"
+
+
+class PropertiesTemplate:
+    """
+    Content header properties encoded once. Only the message id is spliced in per message, because publisher confirms
+    match returned messages by it.
+    """
+
+    __slots__ = ("__properties", "__prefix", "__suffix",)
+
+    def __init__(self, properties: t.Optional[commands.Basic.Properties] = None) -> None:
+        properties = properties or commands.Basic.Properties()
+        self.__properties = properties
+
+        flags = _MESSAGE_ID_FLAG
+        prefix: t.List[bytes] = []
+        suffix: t.List[bytes] = []
+        parts = prefix
+
+        # properties are encoded in the order of slots, flags of all 14 properties fit in the first flag word.
+        for name in properties.__slots__:
+            if name == "message_id":
+                parts = suffix
+                continue
+
+            value = getattr(properties, name)
+            if value is not None and value != "":
+                flags |= properties.flags[name]
+                parts.append(properties.encode_property(name, value))
+
+        self.__prefix = struct.pack(">H", flags) + b"".join(prefix)
+        self.__suffix = b"".join(suffix)
+
+    @property
+    def properties(self) -> commands.Basic.Properties:
+        return self.__properties
+
+    def create(self, message_id: str) -> EncodedProperties:
+        return EncodedProperties(self, message_id)
+
+    def marshal(self, message_id: str) -> bytes:
+        encoded_id = message_id.encode("utf-8")
+        return b"".join((self.__prefix, struct.pack("B", len(encoded_id)), encoded_id, self.__suffix))
+
+
+class RawMessage(t.NamedTuple):
+    """A message to publish: an encoded body and the pre-encoded properties of its encoder."""
+
+    body: bytes
+    properties: PropertiesTemplate
@@ -0,0 +1,75 @@
+__all__ = (
+    "RawExchangePublisher",
+)
+
+import itertools as it
+import os
+import time
+import typing as t
+
+from aiormq.abc import AbstractChannel
+
+from asynchron.amqp.raw.message import RawMessage
+from asynchron.core.metrics import Metrics, get_enabled_metrics
+from asynchron.core.publisher import MessagePublisher
+
+
+class RawExchangePublisher(MessagePublisher[RawMessage]):
+    """Publishes raw messages with their pre-encoded properties and a cheap unique message id."""
+
+    def __init__(
+            self,
+            exchange_name: str,
+            routing_key: str,
+            is_mandatory: bool,
+            metrics: t.Optional[Metrics] = None,
+            binding: str = "",
+    ) -> None:
+        self.__channel: t.Optional[AbstractChannel] = None
+        self.__exchange_name = exchange_name
+        self.__routing_key = routing_key
+        self.__is_mandatory = is_mandatory
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__binding = binding
+
+        self.__id_prefix = f"{os.urandom(8).hex()}."
+        self.__ids = it.count()
+
+    def attach(self, channel: AbstractChannel) -> None:
+        self.__channel = channel
+
+    async def publish(self, message: RawMessage) -> None:
+        if self.__metrics is not None:
+            return await self.__publish_measured(self.__metrics, message)
+
+        await self.__publish(message)
+
+    async def __publish(self, message: RawMessage) -> None:
+        channel = self.__channel
+        if channel is None:
+            raise RuntimeError()
+
+        body, template = message
+        await channel.basic_publish(
+            body,
+            exchange=self.__exchange_name,
+            routing_key=self.__routing_key,
+            # aiormq reads the message id and marshals the properties only.
+            properties=template.create(f"{self.__id_prefix}{next(self.__ids)}"),  # type: ignore[arg-type]
+            mandatory=self.__is_mandatory,
+        )
+
+    async def __publish_measured(self, metrics: Metrics, message: RawMessage) -> None:
+        started_at = time.perf_counter()
+
+        try:
+            await self.__publish(message)
+
+        except BaseException:
+            metrics.increment("publish_failed", self.__binding)
+            raise
+
+        finally:
+            metrics.observe("publish_seconds", self.__binding, time.perf_counter() - started_at)
+
+        metrics.increment("published", self.__binding)
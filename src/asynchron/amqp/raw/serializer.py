@@ -0,0 +1,99 @@
+__all__ = (
+    "RawPydanticMessageSerializer",
+    "as_raw_decoder",
+    "as_raw_encoder",
+)
+
+import pickle
+import typing as t
+
+from aio_pika.abc import AbstractIncomingMessage, AbstractMessage
+from pamqp import commands
+from pydantic import BaseModel, Protocol
+
+from asynchron.amqp.raw.message import PropertiesTemplate, RawDelivery, RawMessage
+from asynchron.amqp.serializer.pydantic import PydanticMessageSerializer
+from asynchron.core.message import MessageDecoder, MessageEncoder
+from asynchron.strict_typing import raise_not_exhaustive
+
+T = t.TypeVar("T")
+T_model = t.TypeVar("T_model", bound=BaseModel)
+
+
+class RawPydanticMessageSerializer(
+        t.Generic[T_model],
+        MessageDecoder[RawDelivery, T_model],
+        MessageEncoder[T_model, RawMessage],
+):
+    """
+    Pydantic serializer of raw deliveries and messages, content properties (and publish properties of the binding) are
+    encoded once per serializer.
+    """
+
+    def __init__(
+            self,
+            model: t.Type[T_model],
+            protocol: Protocol = Protocol.json,
+            properties: t.Optional[t.Mapping[str, object]] = None,
+    ) -> None:
+        self.__model = model
+        self.__protocol = protocol
+
+        if protocol is Protocol.json:
+            encoded = commands.Basic.Properties(content_type="application/json", content_encoding="utf-8")
+
+        elif protocol is Protocol.pickle:
+            encoded = commands.Basic.Properties(content_type="python/pickle")
+
+        else:
+            raise_not_exhaustive(protocol)
+
+        # names of publish properties are the fields of pamqp properties, values are checked by validation.
+        for name, value in (properties or {}).items():
+            setattr(encoded, name, value)
+
+        encoded.validate()
+        self.__properties = PropertiesTemplate(encoded)
+
+    @property
+    def model(self) -> t.Type[T_model]:
+        return self.__model
+
+    @property
+    def protocol(self) -> Protocol:
+        return self.__protocol
+
+    def decode(self, message: RawDelivery) -> T_model:
+        properties = message.properties
+
+        return self.__model.parse_raw(
+            b=message.body.tobytes(),
+            content_type=properties.content_type or "",
+            encoding=properties.content_encoding or "utf8",
+            proto=self.__protocol,
+            allow_pickle=self.__protocol is Protocol.pickle,
+        )
+
+    def encode(self, message: T_model) -> RawMessage:
+        if self.__protocol is Protocol.json:
+            return RawMessage(message.json().encode("utf-8"), self.__properties)
+
+        return RawMessage(pickle.dumps(message), self.__properties)
+
+
+def as_raw_decoder(decoder: MessageDecoder[AbstractIncomingMessage, T]) -> MessageDecoder[RawDelivery, T]:
+    """Pydantic decoders of generated facades are replaced with raw equivalents, other decoders can't be converted."""
+
+    if isinstance(decoder, PydanticMessageSerializer):
+        return t.cast(MessageDecoder[RawDelivery, T], RawPydanticMessageSerializer(decoder.model, decoder.protocol))
+
+    raise ValueError("Decoder can't be converted to a raw decoder", decoder)
+
+
+def as_raw_encoder(encoder: MessageEncoder[T, AbstractMessage]) -> MessageEncoder[T, RawMessage]:
+    """Pydantic encoders of generated facades are replaced with raw equivalents, other encoders can't be converted."""
+
+    if isinstance(encoder, PydanticMessageSerializer):
+        return t.cast(MessageEncoder[T, RawMessage], RawPydanticMessageSerializer(encoder.model, encoder.protocol))
+
+    raise ValueError("Encoder can't be converted to a raw encoder", encoder)
@@ -0,0 +1,178 @@
+__all__ = (
+    "DIRECT_REPLY_TO_QUEUE",
+    "DirectReplyToClient",
+    "ExchangeMessageRequester",
+    "ReplyPublisher",
+    "RespondingMessageConsumer",
+)
+
+import asyncio
+import itertools
+import os
+import typing as t
+
+from aio_pika.abc import AbstractChannel, AbstractExchange, AbstractIncomingMessage, AbstractMessage
+
+from asynchron.amqp.serializer.context import MessageWithContext
+from asynchron.core.consumer import MessageConsumer
+from asynchron.core.message import MessageEncoder
+from asynchron.core.requester import MessageRequester, MessageResponderFunc
+
+T = t.TypeVar("T")
+R = t.TypeVar("R")
+
+# RabbitMQ pseudo queue, replies are delivered to the consumer of the channel, that published the request.
+DIRECT_REPLY_TO_QUEUE: t.Final[str] = "amq.rabbitmq.reply-to"
+
+
+class DirectReplyToClient:
+    """
+    Sends requests and receives replies on one channel, that consumes the direct reply-to pseudo queue, so no reply
+    queue is declared per request. Pending requests are kept in a correlation id -> future map, the number of pending
+    requests is bounded (callers wait for a free slot) and each request times out. Requests are published as
+    mandatory, a request returned by the broker as unroutable fails at once.
+    """
+
+    def __init__(
+            self,
+            max_outstanding_requests: int = 1000,
+            timeout: float = 30.0,
+    ) -> None:
+        if max_outstanding_requests < 1:
+            raise ValueError("At least one outstanding request must be allowed", max_outstanding_requests)
+
+        self.__max_outstanding_requests = max_outstanding_requests
+        self.__timeout = timeout
+
+        self.__channel: t.Optional[AbstractChannel] = None
+        self.__exchanges: t.Dict[str, AbstractExchange] = {}
+        self.__slots: t.Optional[asyncio.Semaphore] = None
+        self.__pending: t.Dict[str, "asyncio.Future[AbstractIncomingMessage]"] = {}
+        self.__prefix = os.urandom(8).hex()
+        self.__counter = itertools.count()
+
+    @property
+    def outstanding_requests(self) -> int:
+        return len(self.__pending)
+
+    def attach(self, channel: AbstractChannel) -> None:
+        """Channel must consume the direct reply-to queue with `consume` (in no ack mode)."""
+
+        self.__channel = channel
+        self.__exchanges.clear()
+        channel.return_callbacks.add(self.__return)
+
+    def detach(self) -> None:
+        if self.__channel is not None:
+            self.__channel.return_callbacks.discard(self.__return)
+
+        self.__channel = None
+        self.__exchanges.clear()
+
+        pending, self.__pending = self.__pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Reply channel is detached"))
+
+    async def consume(self, message: AbstractIncomingMessage) -> None:
+        future = self.__pending.pop(message.correlation_id or "", None)
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    def __return(self, channel: t.Optional[AbstractChannel], message: AbstractIncomingMessage) -> None:
+        future = self.__pending.pop(message.correlation_id or "", None)
+        if future is not None and not future.done():
+            future.set_exception(RuntimeError("Request is returned as unroutable", message.exchange,
+                                              message.routing_key))
+
+    async def request(
+            self,
+            exchange_name: str,
+            routing_key: str,
+            message: AbstractMessage,
+            timeout: t.Optional[float] = None,
+    ) -> AbstractIncomingMessage:
+        slots = self.__slots = self.__slots or asyncio.Semaphore(self.__max_outstanding_requests)
+
+        async with slots:
+            exchange = await self.__get_exchange(exchange_name)
+
+            correlation_id = message.correlation_id = f"{self.__prefix}.{next(self.__counter)}"
+            message.reply_to = DIRECT_REPLY_TO_QUEUE
+
+            future = self.__pending[correlation_id] = asyncio.get_running_loop().create_future()
+            try:
+                await exchange.publish(message, routing_key, mandatory=True)
+                return await asyncio.wait_for(future, timeout if timeout is not None else self.__timeout)
+
+            finally:
+                self.__pending.pop(correlation_id, None)
+
+    async def __get_exchange(self, exchange_name: str) -> AbstractExchange:
+        exchange = self.__exchanges.get(exchange_name)
+        if exchange is not None:
+            return exchange
+
+        channel = self.__channel
+        if channel is None:
+            raise RuntimeError()
+
+        exchange = self.__exchanges[exchange_name] = channel.default_exchange if not exchange_name \
+            else await channel.get_exchange(exchange_name, ensure=False)
+
+        return exchange
+
+
+class ExchangeMessageRequester(MessageRequester[AbstractMessage, AbstractIncomingMessage]):
+    def __init__(
+            self,
+            client: DirectReplyToClient,
+            exchange_name: str,
+            routing_key: str,
+    ) -> None:
+        self.__client = client
+        self.__exchange_name = exchange_name
+        self.__routing_key = routing_key
+
+    async def request(self, message: AbstractMessage, timeout: t.Optional[float] = None) -> AbstractIncomingMessage:
+        return await self.__client.request(self.__exchange_name, self.__routing_key, message, timeout)
+
+
+class ReplyPublisher:
+    def __init__(self, exchange: t.Optional[AbstractExchange] = None) -> None:
+        self.__exchange = exchange
+
+    def attach(self, exchange: AbstractExchange) -> None:
+        self.__exchange = exchange
+
+    async def publish(self, reply_to: str, correlation_id: t.Optional[str], message: AbstractMessage) -> None:
+        if self.__exchange is None:
+            raise RuntimeError()
+
+        message.correlation_id = correlation_id
+        # requester may be gone already, so unroutable replies are dropped by the broker.
+        await self.__exchange.publish(message, reply_to, mandatory=False)
+
+
+class RespondingMessageConsumer(MessageConsumer[MessageWithContext[T]]):
+    """
+    Publishes the result of the responder to `reply_to` of the request, requests without it get no reply. Errors of
+    the responder are raised to the consumer pipeline (so retry and reject apply) and no reply is sent, the requester
+    gets the timeout error.
+    """
+
+    def __init__(
+            self,
+            responder: MessageResponderFunc[T, R],
+            encoder: MessageEncoder[R, AbstractMessage],
+            publisher: ReplyPublisher,
+    ) -> None:
+        self.__responder = responder
+        self.__encoder = encoder
+        self.__publisher = publisher
+
+    async def consume(self, message: MessageWithContext[T]) -> None:
+        result = await self.__responder(message.data)
+
+        if message.reply_to:
+            await self.__publisher.publish(message.reply_to, message.correlation_id, self.__encoder.encode(result))
@@ -25,6 +25,14 @@ class PydanticMessageSerializer(t.Generic[T_model], MessageSerializer[AbstractMe
         self.__model = model
         self.__protocol = protocol
 
+    @property
+    def model(self) -> t.Type[T_model]:
+        return self.__model
+
+    @property
+    def protocol(self) -> Protocol:
+        return self.__protocol
+
     def decode(self, message: AbstractMessage) -> T_model:
         return self.__model.parse_raw(
             b=message.body,
@@ -0,0 +1,298 @@
+__all__ = (
+    "TRACEPARENT_HEADER",
+    "SpanContext",
+    "Span",
+    "SpanExporter",
+    "CallbackSpanExporter",
+    "JsonLinesFileSpanExporter",
+    "Tracer",
+    "ConsumerTracing",
+)
+
+import abc
+import contextvars
+import dataclasses
+import json
+import random
+import time
+import typing as t
+from dataclasses import dataclass
+from pathlib import Path
+
+from aio_pika.abc import AbstractIncomingMessage
+from pamqp.common import FieldTable
+
+from asynchron.core.consumer import MessageConsumerFunc
+
+T = t.TypeVar("T")
+
+# W3C trace context header: `00-<trace id>-<parent span id>-<flags>`.
+TRACEPARENT_HEADER: t.Final[str] = "traceparent"
+_TRACEPARENT_SIZE: t.Final[int] = 55
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+    parent_span_id: t.Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    binding: str
+    trace_id: str
+    span_id: str
+    parent_span_id: t.Optional[str]
+    # nanoseconds since epoch
+    started_at: int
+    finished_at: int
+    error: t.Optional[str] = None
+
+
+class SpanExporter(metaclass=abc.ABCMeta):
+    @abc.abstractmethod
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class CallbackSpanExporter(SpanExporter):
+    def __init__(self, callback: t.Callable[[Span], None]) -> None:
+        self.__callback = callback
+
+    def export(self, span: Span) -> None:
+        self.__callback(span)
+
+
+class JsonLinesFileSpanExporter(SpanExporter):
+    """Appends finished spans to a local file, one JSON object per line."""
+
+    def __init__(self, path: Path) -> None:
+        self.__path = path
+        self.__file: t.Optional[t.TextIO] = None
+
+    def export(self, span: Span) -> None:
+        if self.__file is None:
+            self.__file = self.__path.open("a", encoding="utf-8", buffering=1)
+
+        self.__file.write(json.dumps(dataclasses.asdict(span)) + "\n")
+
+    def close(self) -> None:
+        file, self.__file = self.__file, None
+
+        if file is not None:
+            file.close()
+
+
+class Tracer:
+    """
+    Creates spans at publish and consume boundaries and propagates trace context in AMQP headers. Sampling decision is
+    made once at the head of a trace (or taken from the propagated context), unsampled messages don't allocate any
+    tracing objects.
+    """
+
+    def __init__(
+            self,
+            exporter: SpanExporter,
+            sample_ratio: float = 1.0,
+    ) -> None:
+        if not 0.0 <= sample_ratio <= 1.0:
+            raise ValueError("Invalid sample ratio", sample_ratio)
+
+        self.__exporter = exporter
+        self.__sample_ratio = sample_ratio
+        self.__random = random.random
+        self.__current: contextvars.ContextVar[t.Optional[SpanContext]] = contextvars.ContextVar(
+            "asynchron_current_span", default=None)
+
+    def consume(self, headers: t.Optional[t.Mapping[str, object]]) -> t.Optional[SpanContext]:
+        """Returns context of a consume span if the incoming message is sampled."""
+
+        value = headers.get(TRACEPARENT_HEADER) if headers else None
+
+        if value is None:
+            if self.__random() >= self.__sample_ratio:
+                return None
+
+            return self.__create_root()
+
+        if isinstance(value, bytes):
+            value = value.decode("ascii", "replace")
+
+        if not isinstance(value, str) or len(value) != _TRACEPARENT_SIZE or not value.endswith("01"):
+            return None
+
+        return SpanContext(trace_id=value[3:35], span_id=self.__create_span_id(), parent_span_id=value[36:52])
+
+    def publish(self, headers: FieldTable) -> t.Optional[SpanContext]:
+        """
+        Returns context of a publish span if the outgoing message is sampled, i.e. when it is published within a
+        sampled span or is sampled as a new trace head, and injects it into headers.
+        """
+
+        parent = self.__current.get()
+
+        if parent is not None:
+            context = self.create_child(parent)
+
+        elif self.__random() < self.__sample_ratio:
+            context = self.__create_root()
+
+        else:
+            return None
+
+        headers[TRACEPARENT_HEADER] = f"00-{context.trace_id}-{context.span_id}-01"
+
+        return context
+
+    def create_child(self, parent: SpanContext) -> SpanContext:
+        return SpanContext(trace_id=parent.trace_id, span_id=self.__create_span_id(), parent_span_id=parent.span_id)
+
+    def activate(self, context: SpanContext) -> "contextvars.Token[t.Optional[SpanContext]]":
+        return self.__current.set(context)
+
+    def deactivate(self, token: "contextvars.Token[t.Optional[SpanContext]]") -> None:
+        self.__current.reset(token)
+
+    def finish(
+            self,
+            name: str,
+            binding: str,
+            context: SpanContext,
+            started_at: int,
+            error: t.Optional[BaseException] = None,
+    ) -> None:
+        self.__exporter.export(Span(
+            name=name,
+            binding=binding,
+            trace_id=context.trace_id,
+            span_id=context.span_id,
+            parent_span_id=context.parent_span_id,
+            started_at=started_at,
+            finished_at=time.time_ns(),
+            error=repr(error) if error is not None else None,
+        ))
+
+    def __create_root(self) -> SpanContext:
+        return SpanContext(trace_id=f"{random.getrandbits(128):032x}", span_id=self.__create_span_id())
+
+    def __create_span_id(self) -> str:
+        return f"{random.getrandbits(64):016x}"
+
+
+class ConsumerTracing:
+    """
+    Traces consume, decode and handle stages of a compiled consumer binding. The consume span of a sampled message is
+    kept in a context variable of the consuming task, decode and handle spans are its children. A message, that is
+    handled in another task (e.g. by key ordered workers), carries the span to the task via `get_consumed` and
+    `attach`.
+    """
+
+    def __init__(self, tracer: Tracer, label: str) -> None:
+        self.__tracer = tracer
+        self.__label = label
+        self.__consumed: contextvars.ContextVar[t.Optional[SpanContext]] = contextvars.ContextVar(
+            f"asynchron_consumed_span_{label}", default=None)
+
+    def get_consumed(self) -> t.Optional[SpanContext]:
+        return self.__consumed.get()
+
+    def attach(self, context: t.Optional[SpanContext]) -> "contextvars.Token[t.Optional[SpanContext]]":
+        return self.__consumed.set(context)
+
+    def detach(self, token: "contextvars.Token[t.Optional[SpanContext]]") -> None:
+        self.__consumed.reset(token)
+
+    def wrap_consume(
+            self,
+            func: MessageConsumerFunc[AbstractIncomingMessage],
+    ) -> MessageConsumerFunc[AbstractIncomingMessage]:
+        tracer = self.__tracer
+        label = self.__label
+        consumed = self.__consumed
+        time_ns = time.time_ns
+
+        async def consume_traced(message: AbstractIncomingMessage) -> None:
+            context = tracer.consume(message.headers_raw)
+            if context is None:
+                return await func(message)
+
+            token = consumed.set(context)
+            started_at = time_ns()
+
+            try:
+                await func(message)
+
+            except BaseException as err:
+                tracer.finish("consume", label, context, started_at, err)
+                raise
+
+            finally:
+                consumed.reset(token)
+
+            tracer.finish("consume", label, context, started_at)
+
+        return consume_traced
+
+    def wrap_decode(
+            self,
+            decode: t.Callable[[AbstractIncomingMessage], T],
+    ) -> t.Callable[[AbstractIncomingMessage], T]:
+        tracer = self.__tracer
+        label = self.__label
+        consumed = self.__consumed
+        time_ns = time.time_ns
+
+        def decode_traced(message: AbstractIncomingMessage) -> T:
+            parent = consumed.get()
+            if parent is None:
+                return decode(message)
+
+            context = tracer.create_child(parent)
+            started_at = time_ns()
+
+            try:
+                result = decode(message)
+
+            except BaseException as err:
+                tracer.finish("decode", label, context, started_at, err)
+                raise
+
+            tracer.finish("decode", label, context, started_at)
+
+            return result
+
+        return decode_traced
+
+    def wrap_handle(self, handle: MessageConsumerFunc[T]) -> MessageConsumerFunc[T]:
+        tracer = self.__tracer
+        label = self.__label
+        consumed = self.__consumed
+        time_ns = time.time_ns
+
+        async def handle_traced(message: T) -> None:
+            parent = consumed.get()
+            if parent is None:
+                return await handle(message)
+
+            context = tracer.create_child(parent)
+            token = tracer.activate(context)
+            started_at = time_ns()
+
+            try:
+                await handle(message)
+
+            except BaseException as err:
+                tracer.finish("handle", label, context, started_at, err)
+                raise
+
+            finally:
+                tracer.deactivate(token)
+
+            tracer.finish("handle", label, context, started_at)
+
+        return handle_traced
@@ -18,6 +18,7 @@ from asynchron.codegen.spec.asyncapi import (
     AMQPBindingTrait,
     AsyncAPIObject,
     ChannelBindingsObject, ChannelItemObject,
+    ComponentsObject,
     MessageObject,
     OperationBindingsObject, OperationObject,
     Protocol, SchemaObject, ServerObject, ServersObject,
@@ -33,7 +34,14 @@ from asynchron.codegen.spec.type_definition import (
 )
 from asynchron.codegen.spec.visitor.type_def_descendants import TypeDefDescendantsVisitor
 from asynchron.codegen.spec.walker.dfs import DFSPPostOrderingWalker
-from asynchron.strict_typing import as_, as_by_key_or_default, as_or_default
+from asynchron.strict_typing import (
+    as_,
+    as_by_key_or_default,
+    as_mapping,
+    as_or_default,
+    as_sequence,
+    get_by_key_or_default,
+)
 
 K = t.TypeVar("K", bound=t.Hashable)
 V = t.TypeVar("V")
@@ -50,7 +58,30 @@ class ConsumerDef:
     is_auto_delete_enabled: t.Optional[bool] = None
     is_exclusive: t.Optional[bool] = None
     is_durable: t.Optional[bool] = None
+    is_exchange_auto_delete_enabled: t.Optional[bool] = None
+    is_exchange_durable: t.Optional[bool] = None
+    queue_type: t.Optional[str] = None
+    queue_mode: t.Optional[str] = None
+    max_length: t.Optional[int] = None
+    overflow: t.Optional[str] = None
+    is_single_active_consumer: t.Optional[bool] = None
     prefetch_count: t.Optional[int] = None
+    min_prefetch_count: t.Optional[int] = None
+    max_prefetch_count: t.Optional[int] = None
+    ordering_key_header: t.Optional[str] = None
+    ordering_key_field: t.Optional[str] = None
+    ordering_queue_size: t.Optional[int] = None
+    retry_delays: t.Optional[t.Sequence[int]] = None
+    retry_attempts: t.Optional[int] = None
+    max_message_age: t.Optional[int] = None
+    max_in_flight_bytes: t.Optional[int] = None
+    handler_executor: t.Optional[str] = None
+    admitted_headers: t.Optional[t.Sequence[t.Tuple[str, t.Sequence[str]]]] = None
+    admitted_app_ids: t.Optional[t.Sequence[str]] = None
+    max_timestamp_age: t.Optional[int] = None
+    inadmissible_action: t.Optional[str] = None
+    # consumer is a responder, when the channel is marked as RPC.
+    reply_message: t.Optional[TypeDef] = None
     description: t.Optional[str] = None
 
 
@@ -62,6 +93,17 @@ class PublisherDef:
     routing_key: str
     is_mandatory: t.Optional[bool] = None
     prefetch_count: t.Optional[int] = None
+    is_auto_delete_enabled: t.Optional[bool] = None
+    is_durable: t.Optional[bool] = None
+    expiration: t.Optional[int] = None
+    priority: t.Optional[int] = None
+    delivery_mode: t.Optional[int] = None
+    cc: t.Optional[t.Sequence[str]] = None
+    bcc: t.Optional[t.Sequence[str]] = None
+    is_timestamp_enabled: t.Optional[bool] = None
+    user_id: t.Optional[str] = None
+    # publisher is a requester, when the channel is marked as RPC.
+    reply_message: t.Optional[TypeDef] = None
     description: t.Optional[str] = None
 
 
@@ -92,12 +134,22 @@ class JinjaBasedPythonAioPikaCodeGenerator(AsyncApiCodeGenerator):
 
     def generate(self, config: AsyncAPIObject) -> AsyncApiCodeGeneratorContent:
         channel_messages: t.Dict[str, TypeDef] = dict(self.__iter_message_defs(config))
+        # channels may share a message, it has to be rendered once.
+        message_defs_by_path = {tuple(message_def.path): message_def for message_def in channel_messages.values()}
+        channel_messages = {
+            channel_name: message_defs_by_path[tuple(message_def.path)]
+            for channel_name, message_def in channel_messages.items()
+        }
 
         amqp_server_names = set(self.__iter_amqp_server_names(config))
         app_consumers = list(self.__iter_amqp_consumer_defs(config, amqp_server_names, channel_messages))
         app_publishers = list(self.__iter_amqp_publisher_defs(config, amqp_server_names, channel_messages))
         app_modules = list(self.__iter_app_modules(config))
-        app_type_defs = list(self.__get_app_type_defs_ordered_by_dependency(channel_messages.values()))
+        app_type_defs = list(self.__get_app_type_defs_ordered_by_dependency([
+            *channel_messages.values(),
+            *(consumer.reply_message for consumer in app_consumers if consumer.reply_message is not None),
+            *(publisher.reply_message for publisher in app_publishers if publisher.reply_message is not None),
+        ]))
 
         app = AppDef(
             name=config.info.title,
@@ -209,7 +261,31 @@ class JinjaBasedPythonAioPikaCodeGenerator(AsyncApiCodeGenerator):
                 is_auto_delete_enabled=queue.auto_delete,
                 is_durable=queue.durable,
                 is_exclusive=queue.exclusive,
+                is_exchange_auto_delete_enabled=exchange.auto_delete,
+                is_exchange_durable=exchange.durable,
+                queue_type=as_by_key_or_default(str, publish.extensions, "x-queue-type", None),
+                queue_mode=as_by_key_or_default(str, publish.extensions, "x-queue-mode", None),
+                max_length=as_by_key_or_default(int, publish.extensions, "x-max-length", None),
+                overflow=as_by_key_or_default(str, publish.extensions, "x-overflow", None),
+                is_single_active_consumer=as_by_key_or_default(bool, publish.extensions, "x-single-active-consumer",
+                                                               None),
                 prefetch_count=as_by_key_or_default(int, publish.extensions, "x-prefetch-count", None),
+                min_prefetch_count=as_by_key_or_default(int, publish.extensions, "x-prefetch-count-min", None),
+                max_prefetch_count=as_by_key_or_default(int, publish.extensions, "x-prefetch-count-max", None),
+                ordering_key_header=as_by_key_or_default(str, publish.extensions, "x-ordering-key-header", None),
+                ordering_key_field=as_by_key_or_default(str, publish.extensions, "x-ordering-key-field", None),
+                ordering_queue_size=as_by_key_or_default(int, publish.extensions, "x-ordering-queue-size", None),
+                retry_delays=as_sequence(int, get_by_key_or_default(publish.extensions, "x-retry-delays", None)),
+                retry_attempts=as_by_key_or_default(int, publish.extensions, "x-retry-attempts", None),
+                max_message_age=as_by_key_or_default(int, publish.extensions, "x-max-message-age", None),
+                max_in_flight_bytes=as_by_key_or_default(int, publish.extensions, "x-max-in-flight-bytes", None),
+                handler_executor=as_by_key_or_default(str, publish.extensions, "x-handler-executor", None),
+                admitted_headers=self.__get_admitted_headers(publish),
+                admitted_app_ids=as_sequence(str, get_by_key_or_default(publish.extensions, "x-admitted-app-ids",
+                                                                        None)),
+                max_timestamp_age=as_by_key_or_default(int, publish.extensions, "x-max-timestamp-age", None),
+                inadmissible_action=as_by_key_or_default(str, publish.extensions, "x-inadmissible-action", None),
+                reply_message=self.__get_reply_message_def(config, publish, messages),
             )
 
     def __iter_amqp_publisher_defs(
@@ -232,9 +308,60 @@ class JinjaBasedPythonAioPikaCodeGenerator(AsyncApiCodeGenerator):
                 routing_key=channel_name,
                 is_mandatory=operation_bindings.mandatory,
                 prefetch_count=as_by_key_or_default(int, subscribe.extensions, "x-prefetch-count", None),
+                is_auto_delete_enabled=exchange.auto_delete if exchange is not None else None,
+                is_durable=exchange.durable if exchange is not None else None,
+                expiration=operation_bindings.expiration,
+                priority=operation_bindings.priority,
+                delivery_mode=operation_bindings.delivery_mode,
+                cc=operation_bindings.cc,
+                bcc=operation_bindings.bcc,
+                is_timestamp_enabled=operation_bindings.timestamp,
+                user_id=operation_bindings.user_id,
                 message=channel_message,
+                reply_message=self.__get_reply_message_def(config, subscribe, messages),
             )
 
+    def __get_admitted_headers(
+            self,
+            operation: OperationObject,
+    ) -> t.Optional[t.Sequence[t.Tuple[str, t.Sequence[str]]]]:
+        # `x-admitted-headers` maps header names to an admitted value or a list of admitted values.
+        admitted_headers = as_mapping(str, object,
+                                      get_by_key_or_default(operation.extensions, "x-admitted-headers", None))
+        if admitted_headers is None:
+            return None
+
+        return tuple(
+            (name, tuple(str(value) for value in values) if isinstance(values, list) else (str(values),))
+            for name, values in admitted_headers.items()
+        )
+
+    def __get_reply_message_def(
+            self,
+            config: AsyncAPIObject,
+            operation: OperationObject,
+            messages: t.Mapping[str, TypeDef],
+    ) -> t.Optional[TypeDef]:
+        # RPC channels name the reply message from components in `x-rpc-reply-message` extension of the operation.
+        reply_message_name = as_by_key_or_default(str, operation.extensions, "x-rpc-reply-message", None)
+        if reply_message_name is None:
+            return None
+
+        components = as_(ComponentsObject, config.components)
+        messages_by_name = components.messages if components is not None else None
+        message = as_(MessageObject, (messages_by_name or {}).get(reply_message_name))
+        payload = as_(SchemaObject, message.payload) if message is not None else None
+        if payload is None:
+            raise ValueError("Unknown RPC reply message", reply_message_name)
+
+        reply_message_def = self.__message_def_generator.get_type_def_from_json_schema(payload)
+        if reply_message_def is None:
+            return None
+
+        # reuse the channel message definition, if the reply is a message of some channel, so it is rendered once.
+        return next((message for message in messages.values() if message.path == reply_message_def.path),
+                    reply_message_def)
+
     def __get_app_type_defs_ordered_by_dependency(
             self,
             message_defs: t.Collection[TypeDef],
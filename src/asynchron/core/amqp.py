@@ -5,6 +5,10 @@ from dataclasses import dataclass
 @dataclass(frozen=True)
 class AmqpServerBindings:
     connection_url: str
+    # urls of other nodes of the cluster, connections are kept to each node, when set.
+    node_urls: t.Sequence[str] = ()
+    # queue name -> url of the node, that leads the queue.
+    queue_node_urls: t.Optional[t.Mapping[str, str]] = None
 
 
 @dataclass(frozen=True)
@@ -16,7 +20,55 @@ class AmqpConsumerBindings:
     is_auto_delete_enabled: t.Optional[bool] = None
     is_exclusive: t.Optional[bool] = None
     is_durable: t.Optional[bool] = None
+    is_exchange_auto_delete_enabled: t.Optional[bool] = None
+    is_exchange_durable: t.Optional[bool] = None
+    # queue arguments: quorum queues are durable by default, lazy mode applies to classic queues only.
+    queue_type: t.Optional[t.Literal["classic", "quorum"]] = None
+    queue_mode: t.Optional[t.Literal["default", "lazy"]] = None
+    max_length: t.Optional[int] = None
+    overflow: t.Optional[t.Literal["drop-head", "reject-publish", "reject-publish-dlx"]] = None
+    is_single_active_consumer: t.Optional[bool] = None
     prefetch_count: t.Optional[int] = None
+    min_prefetch_count: t.Optional[int] = None
+    max_prefetch_count: t.Optional[int] = None
+    ordering_key_header: t.Optional[str] = None
+    ordering_key_field: t.Optional[str] = None
+    ordering_queue_size: t.Optional[int] = None
+    retry_delays: t.Optional[t.Sequence[int]] = None
+    retry_attempts: t.Optional[int] = None
+    # milliseconds since first publish, older messages are skipped.
+    max_message_age: t.Optional[int] = None
+    # bytes of message bodies, that are being consumed, consumer is paused when exceeded.
+    max_in_flight_bytes: t.Optional[int] = None
+    # handler of a sync consumer runs in a thread pool or decode and handler run in a process pool.
+    handler_executor: t.Optional[t.Literal["thread", "process"]] = None
+    # messages are admitted before decoding by header values (header name, admitted values), app ids and max age since
+    # the timestamp property (milliseconds); others are acked (default) or rejected.
+    admitted_headers: t.Optional[t.Collection[t.Tuple[str, t.Collection[str]]]] = None
+    admitted_app_ids: t.Optional[t.Collection[str]] = None
+    max_timestamp_age: t.Optional[int] = None
+    inadmissible_action: t.Optional[t.Literal["ack", "reject"]] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.exchange_name}:{'|'.join(self.binding_keys)}"
+
+    @property
+    def queue_arguments(self) -> t.Mapping[str, object]:
+        arguments: t.Dict[str, object] = {}
+
+        if self.queue_type is not None:
+            arguments["x-queue-type"] = self.queue_type
+        if self.queue_mode is not None:
+            arguments["x-queue-mode"] = self.queue_mode
+        if self.max_length is not None:
+            arguments["x-max-length"] = self.max_length
+        if self.overflow is not None:
+            arguments["x-overflow"] = self.overflow
+        if self.is_single_active_consumer is not None:
+            arguments["x-single-active-consumer"] = self.is_single_active_consumer
+
+        return arguments
 
 
 @dataclass(frozen=True)
@@ -26,5 +78,17 @@ class AmqpPublisherBindings:
     exchange_type: t.Optional[t.Literal["fanout", "direct", "topic", "headers"]] = None
     is_mandatory: t.Optional[bool] = None
     prefetch_count: t.Optional[int] = None
-    # is_auto_delete_enabled: t.Optional[bool] = None
-    # is_durable: t.Optional[bool] = None
+    is_auto_delete_enabled: t.Optional[bool] = None
+    is_durable: t.Optional[bool] = None
+    # message properties of the operation: expiration in milliseconds, cc and bcc are sender selected routing keys.
+    expiration: t.Optional[int] = None
+    priority: t.Optional[int] = None
+    delivery_mode: t.Optional[t.Literal[1, 2]] = None
+    cc: t.Optional[t.Tuple[str, ...]] = None
+    bcc: t.Optional[t.Tuple[str, ...]] = None
+    is_timestamp_enabled: t.Optional[bool] = None
+    user_id: t.Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.exchange_name}:{self.routing_key}"
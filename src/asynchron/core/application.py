@@ -1,10 +1,17 @@
 import asyncio
 import functools as ft
+import importlib
 import inspect
+import multiprocessing
+import os
+import signal
 import typing as t
 from contextlib import asynccontextmanager
 
 from asynchron.core.controller import Runnable
+from asynchron.core.profiler import SamplingProfiler
+from asynchron.core.supervisor import StartMethod, WorkerSupervisor
+from asynchron.core.watchdog import EventLoopWatchdog
 
 S = t.TypeVar("S")
 S_contra = t.TypeVar("S_contra", contravariant=True)
@@ -20,6 +27,10 @@ F = t.TypeVar("F")
 
 F0 = t.TypeVar("F0", bound=t.Callable[[], object])
 
+EventLoopFactory = t.Callable[[], asyncio.AbstractEventLoop]
+# "auto" uses uvloop when it is installed.
+EventLoopPolicy = t.Union[t.Literal["auto", "asyncio", "uvloop"], EventLoopFactory]
+
 
 # class ServerFactoryFunc(t.Protocol[S_co]):
 #     def __call__(self) -> S_co: ...
@@ -41,36 +52,173 @@ class RunnableFactoryFunc(t.Protocol):
     def __call__(self) -> t.AsyncContextManager[Runnable]: ...
 
 
+def get_event_loop_factory(policy: EventLoopPolicy) -> EventLoopFactory:
+    if callable(policy):
+        return policy
+
+    if policy == "asyncio":
+        return asyncio.new_event_loop
+
+    try:
+        import uvloop  # type: ignore[import]
+
+    except ImportError:
+        if policy == "uvloop":
+            raise
+
+        return asyncio.new_event_loop
+
+    return t.cast(EventLoopFactory, uvloop.new_event_loop)
+
+
 class Application:
 
     def __init__(
             self,
             runnable_factory: RunnableFactoryFunc,
+            watchdog: t.Optional[EventLoopWatchdog] = None,
+            profiler: t.Optional[SamplingProfiler] = None,
+            event_loop_policy: EventLoopPolicy = "auto",
     ) -> None:
         self.__runnable_factory = runnable_factory
+        self.__event_loop_factory = get_event_loop_factory(event_loop_policy)
+        self.__watchdog = watchdog
+        self.__profiler = profiler
 
         self.__stop_waiter = None  # type: t.Optional[asyncio.Future[bool]]
 
-    async def run(self) -> None:
+    async def run(self, stop_signals: t.Collection[int] = ()) -> None:
         if self.__stop_waiter is not None:
             raise RuntimeError()
 
         stop_waiter = self.__stop_waiter = asyncio.Future()
 
-        async with self.__runnable_factory() as runnable:
-            await runnable.start()
-            await stop_waiter
-            await runnable.stop()
+        loop = asyncio.get_running_loop()
+        for signum in stop_signals:
+            loop.add_signal_handler(signum, self.stop)
+
+        if self.__watchdog is not None:
+            await self.__watchdog.start()
+
+        if self.__profiler is not None:
+            await self.__profiler.start()
+
+        try:
+            async with self.__runnable_factory() as runnable:
+                await runnable.start()
+                await stop_waiter
+                await runnable.stop()
+
+        finally:
+            if self.__profiler is not None:
+                await self.__profiler.stop()
+
+            if self.__watchdog is not None:
+                await self.__watchdog.stop()
+
+    def run_sync(self, stop_signals: t.Collection[int] = ()) -> None:
+        """Runs the application in a new event loop, created according to event loop policy."""
+
+        loop = self.__event_loop_factory()
+
+        try:
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.run(stop_signals))
+
+        finally:
+            try:
+                tasks = asyncio.all_tasks(loop)
+                for task in tasks:
+                    task.cancel()
+
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
+
+    def run_workers(
+            self,
+            workers: t.Optional[int] = None,
+            stagger_delay: float = 1.0,
+            restart_delay: float = 1.0,
+            shutdown_timeout: float = 30.0,
+            start_method: t.Optional[StartMethod] = None,
+            entry_point: t.Optional[str] = None,
+    ) -> None:
+        """
+        Runs the application in worker processes (one per CPU by default) and supervises them. Each worker builds its
+        own runnable (and connector) with the runnable factory and drains it on SIGTERM.
+
+        Forked workers inherit this application. Spawned workers (the default start method on macOS and Windows) can't
+        receive it, they import the application from the `module:attribute` entry point, that refers to an application
+        or to a function, that builds it.
+        """
+
+        if entry_point is not None:
+            target: t.Callable[[], None] = ft.partial(run_worker_entry_point, entry_point)
+
+        elif multiprocessing.get_context(start_method).get_start_method() == "fork":
+            target = self.__run_worker
+
+        else:
+            raise ValueError("Workers, that are not forked, need an application entry point", start_method)
+
+        WorkerSupervisor(
+            target=target,
+            workers=workers or os.cpu_count() or 1,
+            stagger_delay=stagger_delay,
+            restart_delay=restart_delay,
+            shutdown_timeout=shutdown_timeout,
+            start_method=start_method,
+        ).run()
 
     def stop(self) -> None:
-        if self.__stop_waiter is not None:
+        if self.__stop_waiter is not None and not self.__stop_waiter.done():
             self.__stop_waiter.set_result(True)
 
+    def __run_worker(self) -> None:
+        self.run_sync(stop_signals=(signal.SIGTERM,))
+
+
+def run_worker_entry_point(entry_point: str) -> None:
+    """Imports the application of a worker process by `module:attribute` path and runs it until SIGTERM."""
+
+    module_name, _, attribute = entry_point.partition(":")
+    if not module_name or not attribute:
+        raise ValueError("Entry point must be a `module:attribute` path", entry_point)
+
+    app = getattr(importlib.import_module(module_name), attribute)
+    if not isinstance(app, Application):
+        app = app()
+
+    if not isinstance(app, Application):
+        raise ValueError("Entry point doesn't refer to an application", entry_point)
+
+    app.run_sync(stop_signals=(signal.SIGTERM,))
+
 
 class ApplicationBuilder:
 
     def __init__(self) -> None:
         self.__runnable_factory: t.Optional[RunnableFactoryFunc] = None
+        self.__watchdog: t.Optional[EventLoopWatchdog] = None
+        self.__profiler: t.Optional[SamplingProfiler] = None
+        self.__event_loop_policy: EventLoopPolicy = "auto"
+
+    def event_loop_policy(self, policy: EventLoopPolicy) -> None:
+        self.__event_loop_policy = policy
+
+    def profiler(self, profiler: SamplingProfiler) -> SamplingProfiler:
+        self.__profiler = profiler
+
+        return profiler
+
+    def watchdog(self, watchdog: EventLoopWatchdog) -> EventLoopWatchdog:
+        self.__watchdog = watchdog
+
+        return watchdog
 
     @t.overload
     def runnable_factory(self, func: t.Callable[[], Runnable]) -> t.Callable[[], Runnable]:
@@ -162,4 +310,7 @@ class ApplicationBuilder:
 
         return Application(
             runnable_factory=self.__runnable_factory,
+            watchdog=self.__watchdog,
+            profiler=self.__profiler,
+            event_loop_policy=self.__event_loop_policy,
         )
@@ -2,14 +2,18 @@ __all__ = (
     "MessageConsumerFunc",
     "MessageConsumer",
     "CallableMessageConsumer",
+    "SyncMessageConsumerFunc",
+    "SyncCallableMessageConsumer",
     "DecodedMessageConsumer",
     "MessageConsumerFactory",
 )
 
 import abc
+import time
 import typing as t
 
 from asynchron.core.message import MessageDecoder
+from asynchron.core.metrics import Metrics, get_enabled_metrics
 
 T = t.TypeVar("T")
 R = t.TypeVar("R")
@@ -32,19 +36,67 @@ class CallableMessageConsumer(MessageConsumer[T_contra]):
     def __init__(self, consumer: MessageConsumerFunc[T_contra]) -> None:
         self.__consumer = consumer
 
+    @property
+    def func(self) -> MessageConsumerFunc[T_contra]:
+        return self.__consumer
+
     async def consume(self, message: T_contra) -> None:
         await self.__consumer(message)
 
 
+SyncMessageConsumerFunc = t.Callable[[T_contra], None]
+
+
+class SyncCallableMessageConsumer(MessageConsumer[T_contra]):
+    """Consumer of a blocking function, the function may be offloaded to an executor by the transport."""
+
+    def __init__(self, consumer: SyncMessageConsumerFunc[T_contra]) -> None:
+        self.__consumer = consumer
+
+    @property
+    def func(self) -> SyncMessageConsumerFunc[T_contra]:
+        return self.__consumer
+
+    async def consume(self, message: T_contra) -> None:
+        self.__consumer(message)
+
+
 class DecodedMessageConsumer(MessageConsumer[T_contra]):
-    def __init__(self, decoder: MessageDecoder[T_contra, T], consumer: MessageConsumer[T]) -> None:
+    def __init__(
+            self,
+            decoder: MessageDecoder[T_contra, T],
+            consumer: MessageConsumer[T],
+            metrics: t.Optional[Metrics] = None,
+            binding: str = "",
+    ) -> None:
         self.__decoder = decoder
         self.__consumer = consumer
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__binding = binding
 
     async def consume(self, message: T_contra) -> None:
+        if self.__metrics is not None:
+            return await self.__consume_measured(self.__metrics, message)
+
         decoded_message = self.__decoder.decode(message)
         await self.__consumer.consume(decoded_message)
 
+    async def __consume_measured(self, metrics: Metrics, message: T_contra) -> None:
+        metrics.increment("consumed", self.__binding)
+        started_at = time.perf_counter()
+
+        try:
+            decoded_message = self.__decoder.decode(message)
+            decoded_at = time.perf_counter()
+            metrics.observe("decode_seconds", self.__binding, decoded_at - started_at)
+
+            await self.__consumer.consume(decoded_message)
+            metrics.observe("handle_seconds", self.__binding, time.perf_counter() - decoded_at)
+
+        except BaseException:
+            metrics.increment("consume_failed", self.__binding)
+            raise
+
 
 class MessageConsumerFactory(t.Generic[T_contra, T_co], metaclass=abc.ABCMeta):
     @abc.abstractmethod
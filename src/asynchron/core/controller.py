@@ -4,8 +4,10 @@ import typing as t
 from asynchron.core.consumer import MessageConsumer
 from asynchron.core.message import MessageDecoder, MessageEncoder
 from asynchron.core.publisher import MessagePublisher
+from asynchron.core.requester import MessageRequester, MessageResponderFunc
 
 T = t.TypeVar("T")
+R = t.TypeVar("R")
 CM = t.TypeVar("CM")
 CB = t.TypeVar("CB")
 PM = t.TypeVar("PM")
@@ -41,3 +43,21 @@ class Controller(t.Generic[CM, CB, PM, PB], Runnable, metaclass=abc.ABCMeta):
             bindings: PB,
     ) -> MessagePublisher[T]:
         raise NotImplementedError
+
+    # RPC bindings are optional for controllers, the ones, that support them, override these methods.
+    def bind_requester(
+            self,
+            encoder: MessageEncoder[T, PM],
+            decoder: MessageDecoder[CM, R],
+            bindings: PB,
+    ) -> MessageRequester[T, R]:
+        raise ValueError("RPC is not supported by this controller", type(self), bindings)
+
+    def bind_responder(
+            self,
+            decoder: MessageDecoder[CM, T],
+            encoder: MessageEncoder[R, PM],
+            responder: MessageResponderFunc[T, R],
+            bindings: CB,
+    ) -> MessageConsumer[CM]:
+        raise ValueError("RPC is not supported by this controller", type(self), bindings)
@@ -0,0 +1,52 @@
+__all__ = (
+    "Metrics",
+    "NullMetrics",
+    "get_enabled_metrics",
+)
+
+import abc
+import typing as t
+
+
+class Metrics(metaclass=abc.ABCMeta):
+    """
+    Hot path instrumentation sink. Counters, histograms and gauges are identified by metric name and binding label.
+    Instrumented components check `is_enabled` once on construction and skip instrumentation completely when
+    metrics are disabled.
+    """
+
+    @property
+    def is_enabled(self) -> bool:
+        return True
+
+    @abc.abstractmethod
+    def increment(self, name: str, binding: str, value: int = 1) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def observe(self, name: str, binding: str, value: float) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, name: str, binding: str, value: float) -> None:
+        raise NotImplementedError
+
+
+class NullMetrics(Metrics):
+
+    @property
+    def is_enabled(self) -> bool:
+        return False
+
+    def increment(self, name: str, binding: str, value: int = 1) -> None:
+        pass
+
+    def observe(self, name: str, binding: str, value: float) -> None:
+        pass
+
+    def set(self, name: str, binding: str, value: float) -> None:
+        pass
+
+
+def get_enabled_metrics(metrics: t.Optional[Metrics]) -> t.Optional[Metrics]:
+    return metrics if metrics is not None and metrics.is_enabled else None
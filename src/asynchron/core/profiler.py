@@ -0,0 +1,183 @@
+__all__ = (
+    "SamplingProfiler",
+)
+
+import asyncio
+import collections
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+from asynchron.core.controller import Runnable
+from asynchron.core.watchdog import EventLoopWatchdog
+
+_LOGGER = logging.getLogger(__name__)
+
+_IDLE: t.Final[str] = "<idle>"
+_UNATTRIBUTED: t.Final[str] = "<loop>"
+
+
+class SamplingProfiler(Runnable):
+    """
+    Statistical profiler of the event loop thread, that can be triggered in a running application by a signal or by a
+    `profile [seconds]` command sent to a local control socket. A sampler thread runs only while profiling, so the idle
+    profiler costs nothing. Stacks are attributed to bindings of tasks, that are tracked by the watchdog, and written
+    in collapsed stack format (compatible with flamegraph tools), one `<binding>;<frame>;...;<frame> <count>` per line.
+    """
+
+    def __init__(
+            self,
+            output_dir: Path,
+            duration: float = 30.0,
+            interval: float = 0.005,
+            signal_number: t.Optional[int] = getattr(signal, "SIGUSR2", None),
+            control_socket_path: t.Optional[Path] = None,
+            watchdog: t.Optional[EventLoopWatchdog] = None,
+    ) -> None:
+        self.__output_dir = output_dir
+        self.__duration = duration
+        self.__interval = interval
+        self.__signal_number = signal_number
+        self.__control_socket_path = control_socket_path
+        self.__watchdog = watchdog
+
+        self.__loop: t.Optional[asyncio.AbstractEventLoop] = None
+        self.__server: t.Optional[asyncio.AbstractServer] = None
+        self.__profiling: t.Optional["asyncio.Task[Path]"] = None
+        self.__triggered: t.Optional["asyncio.Task[Path]"] = None
+        self.__stopping = threading.Event()
+
+    async def start(self) -> None:
+        self.__loop = asyncio.get_running_loop()
+        self.__stopping.clear()
+
+        if self.__signal_number is not None:
+            self.__loop.add_signal_handler(self.__signal_number, self.__trigger)
+
+        if self.__control_socket_path is not None and self.__server is None:
+            self.__server = await asyncio.start_unix_server(self.__respond, path=str(self.__control_socket_path))
+
+    async def stop(self) -> None:
+        self.__stopping.set()
+
+        if self.__loop is not None and self.__signal_number is not None:
+            self.__loop.remove_signal_handler(self.__signal_number)
+
+        server, self.__server = self.__server, None
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+            if self.__control_socket_path is not None and self.__control_socket_path.exists():
+                self.__control_socket_path.unlink()
+
+        profiling = self.__profiling
+        if profiling is not None:
+            await asyncio.gather(profiling, return_exceptions=True)
+
+        triggered = self.__triggered
+        if triggered is not None:
+            await asyncio.gather(triggered, return_exceptions=True)
+
+    async def profile(self, duration: t.Optional[float] = None) -> Path:
+        """Samples the event loop thread for the duration and returns path to the written collapsed stacks file."""
+
+        if self.__profiling is None:
+            self.__profiling = asyncio.create_task(
+                self.__profile(duration if duration is not None else self.__duration))
+            self.__profiling.add_done_callback(self.__reset)
+
+        return await asyncio.shield(self.__profiling)
+
+    async def __profile(self, duration: float) -> Path:
+        loop = asyncio.get_running_loop()
+        counts = await loop.run_in_executor(None, self.__sample, loop, threading.get_ident(), duration)
+
+        self.__output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.__output_dir / f"profile-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}.collapsed"
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in counts.most_common()), encoding="utf-8")
+
+        return path
+
+    def __reset(self, profiling: "asyncio.Task[Path]") -> None:
+        if self.__profiling is profiling:
+            self.__profiling = None
+
+    def __sample(self, loop: asyncio.AbstractEventLoop, thread_id: int, duration: float) -> t.Counter[str]:
+        counts: t.Counter[str] = collections.Counter()
+        deadline = time.monotonic() + duration
+
+        while time.monotonic() < deadline and not self.__stopping.wait(self.__interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+
+            task = asyncio.current_task(loop)
+            if task is None:
+                binding = _IDLE
+
+            elif self.__watchdog is not None:
+                binding = self.__watchdog.get_task_binding(task) or _UNATTRIBUTED
+
+            else:
+                binding = _UNATTRIBUTED
+
+            frames: t.List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+
+            frames.append(binding)
+            counts[";".join(reversed(frames))] += 1
+
+        return counts
+
+    def __trigger(self) -> None:
+        if self.__profiling is None and self.__triggered is None and self.__loop is not None:
+            self.__triggered = self.__loop.create_task(self.profile())
+            self.__triggered.add_done_callback(self.__report)
+
+    def __report(self, triggered: "asyncio.Task[Path]") -> None:
+        """Nobody awaits profiles triggered by the signal, their paths are logged and errors are reported to the loop."""
+
+        if self.__triggered is triggered:
+            self.__triggered = None
+
+        if triggered.cancelled():
+            return
+
+        error = triggered.exception()
+        if error is not None:
+            triggered.get_loop().call_exception_handler({
+                "message": "Triggered profiling failed",
+                "exception": error,
+                "task": triggered,
+            })
+
+        else:
+            _LOGGER.info("Profile is written to %s", triggered.result())
+
+    async def __respond(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            command, *args = (await reader.readline()).decode("utf-8").split()
+
+            if command != "profile" or len(args) > 1:
+                writer.write(b"error: expected `profile [seconds]`\n")
+
+            else:
+                path = await self.profile(float(args[0]) if args else None)
+                writer.write(f"{path}\n".encode("utf-8"))
+
+            await writer.drain()
+
+        except (ValueError, ConnectionError):
+            pass
+
+        finally:
+            writer.close()
@@ -0,0 +1,152 @@
+__all__ = (
+    "PrometheusMetrics",
+    "PrometheusMetricsServer",
+)
+
+import asyncio
+import bisect
+import typing as t
+
+from asynchron.core.controller import Runnable
+from asynchron.core.metrics import Metrics
+
+T = t.TypeVar("T")
+
+
+class _Histogram:
+    __slots__ = ("bucket_counts", "count", "sum",)
+
+    def __init__(self, buckets_size: int) -> None:
+        self.bucket_counts = [0] * (buckets_size + 1)
+        self.count = 0
+        self.sum = 0.0
+
+
+class PrometheusMetrics(Metrics):
+    """Keeps metrics in memory and renders them in Prometheus text exposition format."""
+
+    DEFAULT_BUCKETS: t.Final[t.Sequence[float]] = (
+        0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+    )
+
+    def __init__(
+            self,
+            namespace: str = "asynchron",
+            buckets: t.Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.__namespace = namespace
+        self.__buckets = tuple(sorted(buckets))
+
+        self.__counters: t.Dict[t.Tuple[str, str], int] = {}
+        self.__gauges: t.Dict[t.Tuple[str, str], float] = {}
+        self.__histograms: t.Dict[t.Tuple[str, str], _Histogram] = {}
+
+    def increment(self, name: str, binding: str, value: int = 1) -> None:
+        key = (name, binding)
+        self.__counters[key] = self.__counters.get(key, 0) + value
+
+    def observe(self, name: str, binding: str, value: float) -> None:
+        key = (name, binding)
+
+        histogram = self.__histograms.get(key)
+        if histogram is None:
+            histogram = self.__histograms[key] = _Histogram(len(self.__buckets))
+
+        histogram.bucket_counts[bisect.bisect_left(self.__buckets, value)] += 1
+        histogram.count += 1
+        histogram.sum += value
+
+    def set(self, name: str, binding: str, value: float) -> None:
+        self.__gauges[(name, binding)] = value
+
+    def render(self) -> str:
+        lines: t.List[str] = []
+
+        for name, values in self.__group_by_name(self.__counters).items():
+            lines.append(f"# TYPE {self.__namespace}_{name}_total counter")
+            lines.extend(
+                f"{self.__namespace}_{name}_total{{binding=\"{self.__escape(binding)}\"}} {value}"
+                for binding, value in values
+            )
+
+        for name, gauge_values in self.__group_by_name(self.__gauges).items():
+            lines.append(f"# TYPE {self.__namespace}_{name} gauge")
+            lines.extend(
+                f"{self.__namespace}_{name}{{binding=\"{self.__escape(binding)}\"}} {value}"
+                for binding, value in gauge_values
+            )
+
+        for name, histograms in self.__group_by_name(self.__histograms).items():
+            lines.append(f"# TYPE {self.__namespace}_{name} histogram")
+
+            for binding, histogram in histograms:
+                label = self.__escape(binding)
+                cumulative = 0
+
+                for bound, bucket_count in zip((*self.__buckets, "+Inf"), histogram.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f"{self.__namespace}_{name}_bucket{{binding=\"{label}\",le=\"{bound}\"}} {cumulative}")
+
+                lines.append(f"{self.__namespace}_{name}_sum{{binding=\"{label}\"}} {histogram.sum}")
+                lines.append(f"{self.__namespace}_{name}_count{{binding=\"{label}\"}} {histogram.count}")
+
+        lines.append("")
+
+        return "\n".join(lines)
+
+    def __group_by_name(self, values: t.Mapping[t.Tuple[str, str], T]) -> t.Mapping[str, t.Sequence[t.Tuple[str, T]]]:
+        result: t.Dict[str, t.List[t.Tuple[str, T]]] = {}
+
+        for (name, binding), value in sorted(values.items(), key=lambda pair: pair[0]):
+            result.setdefault(name, []).append((binding, value))
+
+        return result
+
+    def __escape(self, value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class PrometheusMetricsServer(Runnable):
+    """Minimal HTTP server, that responds with rendered metrics to any request, so Prometheus can scrape it."""
+
+    def __init__(
+            self,
+            metrics: PrometheusMetrics,
+            host: str = "0.0.0.0",
+            port: int = 9100,
+    ) -> None:
+        self.__metrics = metrics
+        self.__host = host
+        self.__port = port
+
+        self.__server: t.Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        if self.__server is None:
+            self.__server = await asyncio.start_server(self.__respond, self.__host, self.__port)
+
+    async def stop(self) -> None:
+        server, self.__server = self.__server, None
+
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+    async def __respond(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            body = self.__metrics.render().encode("utf-8")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                b"Connection: close\r\n"
+                b"\r\n" + body
+            )
+            await writer.drain()
+
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+
+        finally:
+            writer.close()
@@ -1,7 +1,9 @@
 import abc
+import time
 import typing as t
 
 from asynchron.core.message import MessageEncoder
+from asynchron.core.metrics import Metrics, get_enabled_metrics
 
 T = t.TypeVar("T")
 R = t.TypeVar("R")
@@ -17,14 +19,38 @@ class MessagePublisher(t.Generic[T_contra], metaclass=abc.ABCMeta):
 
 
 class EncodedMessagePublisher(MessagePublisher[T_contra]):
-    def __init__(self, encoder: MessageEncoder[T_contra, T], publisher: MessagePublisher[T]) -> None:
+    def __init__(
+            self,
+            encoder: MessageEncoder[T_contra, T],
+            publisher: MessagePublisher[T],
+            metrics: t.Optional[Metrics] = None,
+            binding: str = "",
+    ) -> None:
         self.__encoder = encoder
         self.__publisher = publisher
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__binding = binding
 
     async def publish(self, message: T_contra) -> None:
+        if self.__metrics is not None:
+            return await self.__publish_measured(self.__metrics, message)
+
         encoded_message = self.__encoder.encode(message)
         await self.__publisher.publish(encoded_message)
 
+    async def __publish_measured(self, metrics: Metrics, message: T_contra) -> None:
+        started_at = time.perf_counter()
+
+        try:
+            encoded_message = self.__encoder.encode(message)
+
+        except BaseException:
+            metrics.increment("publish_failed", self.__binding)
+            raise
+
+        metrics.observe("encode_seconds", self.__binding, time.perf_counter() - started_at)
+        await self.__publisher.publish(encoded_message)
+
 
 class MessagePublisherFactory(t.Generic[T_contra, T_co], metaclass=abc.ABCMeta):
     @abc.abstractmethod
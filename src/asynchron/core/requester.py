@@ -0,0 +1,42 @@
+__all__ = (
+    "MessageRequester",
+    "EncodedMessageRequester",
+    "MessageResponderFunc",
+)
+
+import abc
+import typing as t
+
+from asynchron.core.message import MessageDecoder, MessageEncoder
+
+T = t.TypeVar("T")
+B = t.TypeVar("B")
+R = t.TypeVar("R")
+T_contra = t.TypeVar("T_contra", contravariant=True)
+R_co = t.TypeVar("R_co", covariant=True)
+
+
+class MessageRequester(t.Generic[T_contra, R_co], metaclass=abc.ABCMeta):
+    @abc.abstractmethod
+    async def request(self, message: T_contra, timeout: t.Optional[float] = None) -> R_co:
+        raise NotImplementedError
+
+
+class MessageResponderFunc(t.Protocol[T_contra, R_co]):
+    async def __call__(self, message: T_contra) -> R_co: ...
+
+
+class EncodedMessageRequester(MessageRequester[T_contra, R]):
+    def __init__(
+            self,
+            encoder: MessageEncoder[T_contra, T],
+            decoder: MessageDecoder[B, R],
+            requester: MessageRequester[T, B],
+    ) -> None:
+        self.__encoder = encoder
+        self.__decoder = decoder
+        self.__requester = requester
+
+    async def request(self, message: T_contra, timeout: t.Optional[float] = None) -> R:
+        reply = await self.__requester.request(self.__encoder.encode(message), timeout)
+        return self.__decoder.decode(reply)
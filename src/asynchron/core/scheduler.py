@@ -0,0 +1,244 @@
+__all__ = (
+    "ScheduleStore",
+    "FileScheduleStore",
+    "ScheduledMessagePublisher",
+)
+
+import abc
+import asyncio
+import os
+import pickle
+import time
+import typing as t
+from pathlib import Path
+
+from asynchron.core.controller import Runnable
+from asynchron.core.metrics import Metrics, get_enabled_metrics
+from asynchron.core.publisher import MessagePublisher
+from asynchron.core.timer import HierarchicalTimerWheel
+from asynchron.strict_typing import gather_with_errors
+
+T = t.TypeVar("T")
+
+
+class ScheduleStore(t.Generic[T], metaclass=abc.ABCMeta):
+    """Keeps scheduled messages over restarts, messages are identified by keys, that are unique within the store."""
+
+    @abc.abstractmethod
+    def load(self) -> t.Sequence[t.Tuple[int, float, T]]:
+        """Returns keys, due times and messages, that were added, but not removed."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def add(self, key: int, due: float, message: T) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def remove(self, keys: t.Collection[int]) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class FileScheduleStore(ScheduleStore[T]):
+    """
+    Append only log of pickled records in a local file, messages must be picklable. The log is compacted, when it is
+    loaded. Records are flushed to the file as they are written (not synced), so messages survive restarts of the
+    process; messages of a batch, that was interrupted, are published again.
+    """
+
+    def __init__(self, path: t.Union[str, Path]) -> None:
+        self.__path = Path(path)
+        self.__file: t.Optional[t.BinaryIO] = None
+
+    def load(self) -> t.Sequence[t.Tuple[int, float, T]]:
+        entries: t.Dict[int, t.Tuple[int, float, T]] = {}
+
+        if self.__path.exists():
+            with self.__path.open("rb") as file:
+                while True:
+                    try:
+                        record = pickle.load(file)
+
+                    # the last record may be incomplete, when the process was killed while writing it.
+                    except (EOFError, pickle.UnpicklingError):
+                        break
+
+                    if record[0] == "add":
+                        entries[record[1]] = (record[1], record[2], record[3])
+
+                    else:
+                        for key in record[1]:
+                            entries.pop(key, None)
+
+        compacted_path = self.__path.with_name(f"{self.__path.name}.compacted")
+        with compacted_path.open("wb") as file:
+            for key, due, message in entries.values():
+                pickle.dump(("add", key, due, message), file)
+
+        os.replace(compacted_path, self.__path)
+        self.__file = t.cast(t.BinaryIO, self.__path.open("ab"))
+
+        return tuple(entries.values())
+
+    def add(self, key: int, due: float, message: T) -> None:
+        file = self.__get_file()
+        pickle.dump(("add", key, due, message), file)
+        file.flush()
+
+    def remove(self, keys: t.Collection[int]) -> None:
+        file = self.__get_file()
+        pickle.dump(("remove", tuple(keys)), file)
+        file.flush()
+
+    def close(self) -> None:
+        file, self.__file = self.__file, None
+
+        if file is not None:
+            file.close()
+
+    def __get_file(self) -> t.BinaryIO:
+        if self.__file is None:
+            raise RuntimeError("Schedule store is not loaded", self.__path)
+
+        return self.__file
+
+
+class ScheduledMessagePublisher(MessagePublisher[T], Runnable):
+    """
+    Publishes messages now or at a later time. Scheduled messages are kept in a hierarchical timer wheel (no per message
+    loop timers) and are published in concurrent batches, when they are due. Messages, that failed to publish, are
+    scheduled again after the retry interval.
+
+    Messages, that are scheduled before the publisher is started, are buffered and added to the store after it is
+    loaded, so their keys don't collide with keys of restored messages. The store is written synchronously on each
+    scheduled message (a file store pickles and flushes a record), which blocks the event loop for the time of the
+    write.
+    """
+
+    def __init__(
+            self,
+            publisher: MessagePublisher[T],
+            store: t.Optional[ScheduleStore[T]] = None,
+            resolution: float = 0.01,
+            batch_size: int = 100,
+            retry_interval: float = 1.0,
+            metrics: t.Optional[Metrics] = None,
+            binding: str = "",
+    ) -> None:
+        self.__publisher = publisher
+        self.__store = store
+        self.__resolution = resolution
+        self.__batch_size = batch_size
+        self.__retry_interval = retry_interval
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__binding = binding
+
+        self.__wheel: HierarchicalTimerWheel[t.Tuple[int, T]] = HierarchicalTimerWheel(resolution, now=time.time())
+        self.__next_key = 0
+        self.__is_loaded = store is None
+        self.__pending: t.List[t.Tuple[float, T]] = []
+        self.__wakeup: t.Optional[asyncio.Event] = None
+        self.__wakeup_at: t.Optional[float] = None
+        self.__task: t.Optional["asyncio.Task[None]"] = None
+
+    @property
+    def scheduled_count(self) -> int:
+        return len(self.__wheel) + len(self.__pending)
+
+    async def publish(self, message: T) -> None:
+        await self.__publisher.publish(message)
+
+    async def publish_at(self, message: T, at: float) -> None:
+        """Publishes the message at the time (seconds since epoch), but not before the publisher is started."""
+
+        if self.__is_loaded:
+            self.__add(at, message)
+
+        else:
+            self.__pending.append((at, message))
+
+        if self.__metrics is not None:
+            self.__metrics.increment("scheduled", self.__binding)
+
+    async def publish_after(self, message: T, delay: float) -> None:
+        await self.publish_at(message, time.time() + delay)
+
+    async def start(self) -> None:
+        if not self.__is_loaded and self.__store is not None:
+            for key, due, message in self.__store.load():
+                self.__schedule(due, key, message)
+                self.__next_key = max(self.__next_key, key + 1)
+
+            self.__is_loaded = True
+            pending, self.__pending = self.__pending, []
+            for due, message in pending:
+                self.__add(due, message)
+
+        if self.__task is None:
+            wakeup = self.__wakeup = asyncio.Event()
+            self.__task = asyncio.create_task(self.__run(wakeup))
+
+    async def stop(self) -> None:
+        task, self.__task = self.__task, None
+        self.__wakeup = None
+
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        if self.__store is not None:
+            self.__store.close()
+
+    def __add(self, due: float, message: T) -> None:
+        key = self.__next_key
+        self.__next_key += 1
+
+        if self.__store is not None:
+            self.__store.add(key, due, message)
+
+        self.__schedule(due, key, message)
+
+    def __schedule(self, due: float, key: int, message: T) -> None:
+        self.__wheel.add(due, (key, message))
+
+        if self.__wakeup is not None and (self.__wakeup_at is None or due < self.__wakeup_at):
+            self.__wakeup.set()
+
+    async def __run(self, wakeup: asyncio.Event) -> None:
+        while True:
+            due = self.__wheel.advance(time.time())
+
+            for offset in range(0, len(due), self.__batch_size):
+                await self.__publish_batch(due[offset:offset + self.__batch_size])
+
+            wakeup.clear()
+            next_due = self.__wheel.get_next_due()
+            self.__wakeup_at = next_due
+
+            # the wheel steps at tick boundaries, half a tick keeps the wakeup after the boundary.
+            timeout = max(0.0, next_due - time.time()) + self.__resolution / 2 if next_due is not None else None
+
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout)
+
+            except asyncio.TimeoutError:
+                pass
+
+    async def __publish_batch(self, batch: t.Sequence[t.Tuple[int, T]]) -> None:
+        results = await gather_with_errors(self.__publisher.publish(message) for _, message in batch)
+
+        published: t.List[int] = []
+        retry_at = time.time() + self.__retry_interval
+
+        for (key, message), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                self.__wheel.add(retry_at, (key, message))
+
+            else:
+                published.append(key)
+
+        if self.__store is not None and published:
+            self.__store.remove(published)
@@ -0,0 +1,143 @@
+__all__ = (
+    "WORKER_INDEX_ENV",
+    "StartMethod",
+    "WorkerSupervisor",
+)
+
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import typing as t
+from multiprocessing.process import BaseProcess
+from types import FrameType
+
+StartMethod = t.Literal["fork", "spawn", "forkserver"]
+
+# previous handler, that is restored, when the supervisor stops.
+_SignalHandler = t.Union[t.Callable[[int, t.Optional[FrameType]], object], int, signal.Handlers, None]
+
+# index of the worker process (0 .. workers - 1), is set in environment of workers.
+WORKER_INDEX_ENV: t.Final[str] = "ASYNCHRON_WORKER_INDEX"
+
+
+def _run_worker(target: t.Callable[[], None], index: int) -> None:
+    # parent process handles terminal interrupts and asks workers to drain with SIGTERM.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    os.environ[WORKER_INDEX_ENV] = str(index)
+
+    target()
+
+
+class WorkerSupervisor:
+    """
+    Runs the target in N worker processes. Workers are started one by one with a delay (so they don't connect to the
+    broker all at once) and crashed workers are restarted. On SIGINT / SIGTERM (or `stop`) workers receive SIGTERM and
+    have `shutdown_timeout` seconds to drain, then they are killed. Unless workers are forked, the target is pickled
+    and must be importable by spawned processes (e.g. a module level function or its partial).
+    """
+
+    def __init__(
+            self,
+            target: t.Callable[[], None],
+            workers: int,
+            stagger_delay: float = 1.0,
+            restart_delay: float = 1.0,
+            shutdown_timeout: float = 30.0,
+            poll_interval: float = 0.5,
+            start_method: t.Optional[StartMethod] = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("At least one worker is required", workers)
+
+        self.__target = target
+        self.__workers = workers
+        self.__stagger_delay = stagger_delay
+        self.__restart_delay = restart_delay
+        self.__shutdown_timeout = shutdown_timeout
+        self.__poll_interval = poll_interval
+        # each context has its process class, typeshed declares it on concrete contexts only.
+        self.__process_type: t.Type[BaseProcess] = getattr(multiprocessing.get_context(start_method), "Process")
+
+        self.__stopping = threading.Event()
+        self.__restarts = 0
+
+    @property
+    def restarts(self) -> int:
+        return self.__restarts
+
+    def stop(self) -> None:
+        self.__stopping.set()
+
+    def run(self) -> None:
+        self.__stopping.clear()
+        previous_handlers = self.__install_signal_handlers()
+        processes: t.List[t.Optional[BaseProcess]] = [None] * self.__workers
+
+        try:
+            for index in range(self.__workers):
+                if index > 0 and self.__stopping.wait(self.__stagger_delay):
+                    break
+
+                processes[index] = self.__start(index)
+
+            restart_at: t.Dict[int, float] = {}
+
+            while not self.__stopping.wait(self.__poll_interval):
+                for index, process in enumerate(processes):
+                    if process is None or process.is_alive() or process.exitcode == 0:
+                        continue
+
+                    now = time.monotonic()
+                    if index not in restart_at:
+                        restart_at[index] = now + self.__restart_delay
+
+                    elif now >= restart_at[index]:
+                        del restart_at[index]
+                        processes[index] = self.__start(index)
+                        self.__restarts += 1
+
+                if all(process is not None and process.exitcode == 0 for process in processes):
+                    break
+
+        finally:
+            self.__shutdown([process for process in processes if process is not None])
+            self.__restore_signal_handlers(previous_handlers)
+
+    def __start(self, index: int) -> BaseProcess:
+        process = self.__process_type(
+            target=_run_worker,
+            args=(self.__target, index),
+            name=f"asynchron-worker-{index}",
+        )
+        process.start()
+
+        return process
+
+    def __shutdown(self, processes: t.Sequence[BaseProcess]) -> None:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self.__shutdown_timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+    def __install_signal_handlers(self) -> t.Mapping[int, _SignalHandler]:
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+
+        def handle(signum: int, frame: object) -> None:
+            self.__stopping.set()
+
+        return {signum: signal.signal(signum, handle) for signum in (signal.SIGINT, signal.SIGTERM)}
+
+    def __restore_signal_handlers(self, handlers: t.Mapping[int, _SignalHandler]) -> None:
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
@@ -0,0 +1,184 @@
+__all__ = (
+    "HierarchicalTimerWheel",
+)
+
+import array
+import math
+import typing as t
+
+T = t.TypeVar("T")
+
+
+class _Slot(t.Generic[T]):
+    """Due ticks are kept in a typed array next to the items, there are no per timer objects."""
+
+    __slots__ = ("ticks", "items",)
+
+    def __init__(self) -> None:
+        self.ticks = array.array("q")
+        self.items: t.List[T] = []
+
+
+class HierarchicalTimerWheel(t.Generic[T]):
+    """
+    Timers of scheduled items in levels of slots. The lowest level has a slot per tick (of `resolution` seconds), a
+    slot of each next level spans all slots of the previous one. An item is put to the lowest level, where its due tick
+    shares the slot of the upper level with the current tick, and is cascaded to lower levels, when the current tick
+    reaches its slot. Items beyond the last level wait in an overflow slot. Ticks without timers are skipped, so the
+    wheel is advanced in steps of the lowest level, that has timers.
+    """
+
+    def __init__(
+            self,
+            resolution: float = 0.01,
+            slot_bits: int = 8,
+            levels: int = 4,
+            now: float = 0.0,
+    ) -> None:
+        if resolution <= 0 or slot_bits <= 0 or levels <= 0:
+            raise ValueError("Invalid timer wheel dimensions", resolution, slot_bits, levels)
+
+        self.__resolution = resolution
+        self.__bits = slot_bits
+        self.__mask = (1 << slot_bits) - 1
+        self.__levels = levels
+        self.__tick = math.floor(now / resolution)
+
+        # slots are created on demand, the last counter is for the overflow slot.
+        self.__wheels: t.List[t.List[t.Optional[_Slot[T]]]] = [[None] * (1 << slot_bits) for _ in range(levels)]
+        self.__counts = [0] * (levels + 1)
+        self.__overflow: _Slot[T] = _Slot()
+        self.__due: t.List[T] = []
+
+    def __len__(self) -> int:
+        return sum(self.__counts) + len(self.__due)
+
+    @property
+    def now(self) -> float:
+        return self.__tick * self.__resolution
+
+    def add(self, due: float, item: T) -> None:
+        self.__add(math.ceil(due / self.__resolution), item)
+
+    def advance(self, now: float) -> t.Sequence[T]:
+        """Moves the wheel to the time and returns items, that are due, in order of due ticks."""
+
+        target = math.floor(now / self.__resolution)
+        bits = self.__bits
+        counts = self.__counts
+
+        while self.__tick < target:
+            level = 0
+            while level <= self.__levels and not counts[level]:
+                level += 1
+
+            if level > self.__levels:
+                self.__tick = target
+                break
+
+            # nothing happens until the next boundary of the lowest level with timers.
+            tick = min(((self.__tick >> (bits * level)) + 1) << (bits * level), target)
+            self.__tick = tick
+
+            if tick & ((1 << (bits * level)) - 1):
+                break
+
+            for cascaded_level in range(self.__levels, 0, -1):
+                if not tick & ((1 << (bits * cascaded_level)) - 1):
+                    self.__cascade(cascaded_level, tick)
+
+            self.__fire(tick)
+
+        due, self.__due = self.__due, []
+
+        return due
+
+    def get_next_due(self) -> t.Optional[float]:
+        """Returns the time of the next step of the wheel, it may cascade timers without returning any."""
+
+        if self.__due:
+            return self.now
+
+        bits = self.__bits
+
+        if self.__counts[0]:
+            wheel = self.__wheels[0]
+            for tick in range(self.__tick + 1, ((self.__tick >> bits) + 1) << bits):
+                if wheel[tick & self.__mask] is not None:
+                    return tick * self.__resolution
+
+        for level in range(1, self.__levels + 1):
+            if self.__counts[level]:
+                return (((self.__tick >> (bits * level)) + 1) << (bits * level)) * self.__resolution
+
+        return None
+
+    def iter_items(self) -> t.Iterator[t.Tuple[float, T]]:
+        """Iterates over items with their due time (rounded up to the tick) in no particular order."""
+
+        resolution = self.__resolution
+
+        for item in self.__due:
+            yield self.now, item
+
+        for wheel in self.__wheels:
+            for slot in wheel:
+                if slot is not None:
+                    yield from zip((tick * resolution for tick in slot.ticks), slot.items)
+
+        yield from zip((tick * resolution for tick in self.__overflow.ticks), self.__overflow.items)
+
+    def __add(self, tick: int, item: T) -> None:
+        if tick <= self.__tick:
+            self.__due.append(item)
+            return
+
+        bits = self.__bits
+        slot: _Slot[T]
+
+        for level in range(self.__levels):
+            if tick >> (bits * (level + 1)) == self.__tick >> (bits * (level + 1)):
+                wheel = self.__wheels[level]
+                index = (tick >> (bits * level)) & self.__mask
+                existing = wheel[index]
+                if existing is None:
+                    slot = _Slot()
+                    wheel[index] = slot
+                else:
+                    slot = existing
+                break
+
+        else:
+            level = self.__levels
+            slot = self.__overflow
+
+        slot.ticks.append(tick)
+        slot.items.append(item)
+        self.__counts[level] += 1
+
+    def __cascade(self, level: int, tick: int) -> None:
+        if level == self.__levels:
+            slot: t.Optional[_Slot[T]] = self.__overflow
+            self.__overflow = _Slot()
+
+        else:
+            wheel = self.__wheels[level]
+            index = (tick >> (self.__bits * level)) & self.__mask
+            slot, wheel[index] = wheel[index], None
+
+        if slot is None:
+            return
+
+        self.__counts[level] -= len(slot.items)
+        for item_tick, item in zip(slot.ticks, slot.items):
+            self.__add(item_tick, item)
+
+    def __fire(self, tick: int) -> None:
+        wheel = self.__wheels[0]
+        index = tick & self.__mask
+        slot = wheel[index]
+
+        if slot is not None:
+            wheel[index] = None
+            self.__counts[0] -= len(slot.items)
+            self.__due.extend(slot.items)
@@ -0,0 +1,174 @@
+__all__ = (
+    "SlowCallback",
+    "EventLoopWatchdog",
+)
+
+import asyncio
+import collections
+import sys
+import threading
+import time
+import traceback
+import typing as t
+from dataclasses import dataclass
+
+from asynchron.core.controller import Runnable
+from asynchron.core.metrics import Metrics, get_enabled_metrics
+
+
+@dataclass(frozen=True)
+class SlowCallback:
+    binding: str
+    duration: float
+    stack: t.Sequence[str]
+
+
+class EventLoopWatchdog(Runnable):
+    """
+    Measures event loop lag with a heartbeat task and watches the loop from a separate thread. When the loop is blocked
+    for longer than the threshold, the thread captures the stack of the loop thread and attributes it to the binding
+    of the current task (see `track`). Blocked loop reports are delivered on the loop, when it is unblocked.
+    """
+
+    def __init__(
+            self,
+            metrics: t.Optional[Metrics] = None,
+            interval: float = 0.05,
+            slow_callback_threshold: float = 0.5,
+            window_size: int = 1000,
+            report_interval: float = 5.0,
+            on_slow_callback: t.Optional[t.Callable[[SlowCallback], None]] = None,
+            recent_slow_callbacks_size: int = 100,
+    ) -> None:
+        if not 0 < interval < slow_callback_threshold:
+            raise ValueError("Watchdog interval must be less than slow callback threshold", interval,
+                             slow_callback_threshold)
+
+        self.__metrics = get_enabled_metrics(metrics)
+        self.__interval = interval
+        self.__slow_callback_threshold = slow_callback_threshold
+        self.__report_interval = report_interval
+        self.__on_slow_callback = on_slow_callback
+
+        self.__lags: t.Deque[float] = collections.deque(maxlen=window_size)
+        self.__recent_slow_callbacks: t.Deque[SlowCallback] = collections.deque(maxlen=recent_slow_callbacks_size)
+        self.__bindings_by_task: t.Dict["asyncio.Task[object]", str] = {}
+
+        self.__loop: t.Optional[asyncio.AbstractEventLoop] = None
+        self.__heartbeat_task: t.Optional["asyncio.Task[None]"] = None
+        self.__monitor_thread: t.Optional[threading.Thread] = None
+        self.__stopping = threading.Event()
+        self.__heartbeat_at = time.monotonic()
+
+    @property
+    def recent_slow_callbacks(self) -> t.Sequence[SlowCallback]:
+        return tuple(self.__recent_slow_callbacks)
+
+    def get_lag_percentiles(self, *percentiles: float) -> t.Sequence[float]:
+        lags = sorted(self.__lags)
+        if not lags:
+            return tuple(0.0 for _ in percentiles)
+
+        return tuple(lags[min(len(lags) - 1, int(len(lags) * percentile / 100))] for percentile in percentiles)
+
+    def get_task_binding(self, task: t.Optional["asyncio.Task[object]"]) -> t.Optional[str]:
+        return self.__bindings_by_task.get(task) if task is not None else None
+
+    def track(self, binding: str) -> t.Optional["asyncio.Task[object]"]:
+        """Attributes the current task to the binding until `untrack` is called."""
+
+        task = asyncio.current_task()
+        if task is not None:
+            self.__bindings_by_task[task] = binding
+
+        return task
+
+    def untrack(self, task: t.Optional["asyncio.Task[object]"], binding: str, duration: float) -> None:
+        if task is not None:
+            self.__bindings_by_task.pop(task, None)
+
+        if duration >= self.__slow_callback_threshold and self.__metrics is not None:
+            self.__metrics.increment("slow_handlers", binding)
+
+    async def start(self) -> None:
+        if self.__heartbeat_task is not None:
+            return
+
+        self.__loop = asyncio.get_running_loop()
+        self.__heartbeat_at = time.monotonic()
+        self.__stopping.clear()
+        self.__heartbeat_task = asyncio.create_task(self.__beat())
+        self.__monitor_thread = threading.Thread(
+            target=self.__monitor,
+            args=(self.__loop, threading.get_ident()),
+            name="asynchron-watchdog",
+            daemon=True,
+        )
+        self.__monitor_thread.start()
+
+    async def stop(self) -> None:
+        task, self.__heartbeat_task = self.__heartbeat_task, None
+        thread, self.__monitor_thread = self.__monitor_thread, None
+        self.__stopping.set()
+
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        if thread is not None:
+            await asyncio.get_running_loop().run_in_executor(None, thread.join)
+
+    async def __beat(self) -> None:
+        loop = asyncio.get_running_loop()
+        reported_at = loop.time()
+
+        while True:
+            started_at = loop.time()
+            await asyncio.sleep(self.__interval)
+            now = loop.time()
+            self.__heartbeat_at = time.monotonic()
+            self.__lags.append(max(0.0, now - started_at - self.__interval))
+
+            if self.__metrics is not None and now - reported_at >= self.__report_interval:
+                reported_at = now
+                p50, p90, p99 = self.get_lag_percentiles(50, 90, 99)
+                self.__metrics.set("event_loop_lag_p50_seconds", "", p50)
+                self.__metrics.set("event_loop_lag_p90_seconds", "", p90)
+                self.__metrics.set("event_loop_lag_p99_seconds", "", p99)
+                self.__metrics.set("event_loop_lag_max_seconds", "", max(self.__lags))
+
+    def __monitor(self, loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> None:
+        reported_heartbeat_at: t.Optional[float] = None
+
+        while not self.__stopping.wait(self.__interval):
+            heartbeat_at = self.__heartbeat_at
+            blocked_for = time.monotonic() - heartbeat_at
+
+            if blocked_for < self.__slow_callback_threshold or heartbeat_at == reported_heartbeat_at:
+                continue
+
+            reported_heartbeat_at = heartbeat_at
+            frame = sys._current_frames().get(loop_thread_id)
+            task = asyncio.current_task(loop)
+
+            slow_callback = SlowCallback(
+                binding=self.get_task_binding(task) or "",
+                duration=blocked_for,
+                stack=traceback.format_stack(frame) if frame is not None else (),
+            )
+
+            try:
+                loop.call_soon_threadsafe(self.__report, slow_callback)
+
+            except RuntimeError:
+                # loop is closed
+                return
+
+    def __report(self, slow_callback: SlowCallback) -> None:
+        self.__recent_slow_callbacks.append(slow_callback)
+
+        if self.__metrics is not None:
+            self.__metrics.increment("blocked_event_loop", slow_callback.binding)
+
+        if self.__on_slow_callback is not None:
+            self.__on_slow_callback(slow_callback)
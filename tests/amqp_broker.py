@@ -0,0 +1,631 @@
+"""
+Lightweight in-process AMQP 0-9-1 broker emulator, so the real wire path under `AmqpConnector` (aio-pika, aiormq,
+frames, confirms) can be tested and benchmarked without RabbitMQ.
+
+Supported: connection and channel handshakes, heartbeats, direct / fanout / topic exchanges, queue declare / delete /
+purge, bind / unbind, basic.publish (with mandatory returns), basic.consume / cancel, basic.ack / nack / reject,
+publisher confirms, per consumer QoS prefetch count and direct reply-to. Messages are kept in memory only; headers
+exchanges, transactions, basic.get and queue arguments (TTL, dead lettering, ...) are not supported.
+"""
+
+import asyncio
+import collections
+import itertools
+import struct
+import typing as t
+import uuid
+
+import aio_pika
+from aio_pika.abc import AbstractMessage
+from pamqp import commands
+from pamqp.base import Frame
+from pamqp.body import ContentBody
+from pamqp.constants import FRAME_MAX_SIZE
+from pamqp.frame import marshal, unmarshal
+from pamqp.header import ContentHeader, ProtocolHeader
+from pamqp.heartbeat import Heartbeat
+
+from asynchron.amqp.consumer.routing import TopicRoutingTrie
+from asynchron.core.message import MessageSerializer
+
+_PROTOCOL_HEADER: t.Final[bytes] = b"AMQP\x00\x00\x09\x01"
+_DIRECT_REPLY_TO: t.Final[str] = "amq.rabbitmq.reply-to"
+
+_NOT_FOUND: t.Final[int] = 404
+_RESOURCE_LOCKED: t.Final[int] = 405
+_PRECONDITION_FAILED: t.Final[int] = 406
+_NO_ROUTE: t.Final[int] = 312
+
+
+class _ChannelError(Exception):
+    def __init__(self, reply_code: int, reply_text: str) -> None:
+        super().__init__(reply_code, reply_text)
+        self.reply_code = reply_code
+        self.reply_text = reply_text
+
+
+class _Message:
+    __slots__ = ("exchange", "routing_key", "properties", "body", "redelivered",)
+
+    def __init__(self, exchange: str, routing_key: str, properties: commands.Basic.Properties, body: bytes) -> None:
+        self.exchange = exchange
+        self.routing_key = routing_key
+        self.properties = properties
+        self.body = body
+        self.redelivered = False
+
+
+class _Consumer:
+    __slots__ = ("tag", "queue", "channel", "no_ack", "prefetch_count", "unacked",)
+
+    def __init__(self, tag: str, queue: "_Queue", channel: "_Channel", no_ack: bool, prefetch_count: int) -> None:
+        self.tag = tag
+        self.queue = queue
+        self.channel = channel
+        self.no_ack = no_ack
+        self.prefetch_count = prefetch_count
+        self.unacked = 0
+
+    @property
+    def has_capacity(self) -> bool:
+        return self.no_ack or self.prefetch_count == 0 or self.unacked < self.prefetch_count
+
+
+class _Queue:
+    def __init__(self, name: str, owner: t.Optional["_Connection"], is_auto_delete: bool) -> None:
+        self.name = name
+        self.owner = owner
+        self.is_auto_delete = is_auto_delete
+        self.messages: t.Deque[_Message] = collections.deque()
+        self.consumers: t.List[_Consumer] = []
+        self.next_consumer = 0
+
+
+class _Exchange:
+    def __init__(self, name: str, exchange_type: str) -> None:
+        self.name = name
+        self.type = exchange_type
+        self.bindings: t.List[t.Tuple[str, str]] = []
+        self.__trie: t.Optional[TopicRoutingTrie[str]] = None
+
+    def bind(self, queue_name: str, routing_key: str) -> None:
+        if (queue_name, routing_key) not in self.bindings:
+            self.bindings.append((queue_name, routing_key))
+            self.__trie = None
+
+    def unbind(self, queue_name: str, routing_key: t.Optional[str] = None) -> None:
+        self.bindings = [
+            (bound_queue_name, bound_routing_key)
+            for bound_queue_name, bound_routing_key in self.bindings
+            if bound_queue_name != queue_name or (routing_key is not None and bound_routing_key != routing_key)
+        ]
+        self.__trie = None
+
+    def route(self, routing_key: str) -> t.Collection[str]:
+        if self.type == "fanout":
+            return {queue_name for queue_name, _ in self.bindings}
+
+        if self.type == "topic":
+            if self.__trie is None:
+                self.__trie = TopicRoutingTrie()
+                for queue_name, binding_key in self.bindings:
+                    self.__trie.add(binding_key, queue_name)
+
+            return set(self.__trie.match(routing_key))
+
+        return {queue_name for queue_name, binding_key in self.bindings if binding_key == routing_key}
+
+
+class _Channel:
+    def __init__(self, channel_id: int, connection: "_Connection") -> None:
+        self.id = channel_id
+        self.connection = connection
+        self.is_closing = False
+        self.is_confirming = False
+        self.prefetch_count = 0
+        self.published = 0
+        self.delivery_tags = itertools.count(1)
+        self.unacked: t.Dict[int, t.Tuple[_Message, _Consumer]] = {}
+        self.consumers: t.Dict[str, _Consumer] = {}
+        self.reply_to: t.Optional[str] = None
+
+        self.publish: t.Optional[commands.Basic.Publish] = None
+        self.properties: t.Optional[commands.Basic.Properties] = None
+        self.body_size = 0
+        self.body: t.List[bytes] = []
+
+
+class _Connection:
+    def __init__(self, broker: "AmqpBrokerEmulator", writer: asyncio.StreamWriter) -> None:
+        self.broker = broker
+        self.writer = writer
+        self.frame_max = FRAME_MAX_SIZE
+        self.channels: t.Dict[int, _Channel] = {}
+
+    def send(self, channel_id: int, *frames: t.Union[Frame, ContentHeader, ContentBody, Heartbeat]) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(b"".join(marshal(frame, channel_id) for frame in frames))
+
+    def send_content(self, channel_id: int, method: Frame, message: _Message) -> None:
+        # frame header (7 bytes) and frame end (1 byte) are a part of the frame max size.
+        chunk_size = self.frame_max - 8
+        self.send(
+            channel_id,
+            method,
+            ContentHeader(0, len(message.body), message.properties),
+            *(ContentBody(message.body[offset:offset + chunk_size])
+              for offset in range(0, len(message.body), chunk_size)),
+        )
+
+
+class AmqpBrokerEmulator:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.__host = host
+        self.__port = port
+        self.__server: t.Optional[asyncio.AbstractServer] = None
+        self.__connections: t.Set[_Connection] = set()
+        self.__tasks: t.Set["asyncio.Task[None]"] = set()
+
+        self.__exchanges: t.Dict[str, _Exchange] = {
+            name: _Exchange(name, exchange_type)
+            for name, exchange_type in (("", "direct"), ("amq.direct", "direct"), ("amq.fanout", "fanout"),
+                                        ("amq.topic", "topic"))
+        }
+        self.__queues: t.Dict[str, _Queue] = {}
+        self.__reply_channels: t.Dict[str, t.Tuple[_Channel, str]] = {}
+
+    @property
+    def url(self) -> str:
+        return f"amqp://guest:guest@{self.__host}:{self.__port}/"
+
+    async def __aenter__(self) -> "AmqpBrokerEmulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        self.__server = await asyncio.start_server(self.__serve, self.__host, self.__port)
+        self.__port = self.__server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        server, self.__server = self.__server, None
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+        for connection in tuple(self.__connections):
+            connection.writer.close()
+
+        tasks = tuple(self.__tasks)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_message_count(self, queue_name: str) -> int:
+        """Returns number of ready (not delivered) messages in the queue."""
+
+        return len(self.__queues[queue_name].messages)
+
+    def get_consumer_count(self, queue_name: str) -> int:
+        return len(self.__queues[queue_name].consumers)
+
+    def get_queue_names(self) -> t.Collection[str]:
+        return tuple(self.__queues)
+
+    async def __serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+
+        connection = _Connection(self, writer)
+        self.__connections.add(connection)
+
+        try:
+            if await reader.readexactly(len(_PROTOCOL_HEADER)) != _PROTOCOL_HEADER:
+                writer.write(ProtocolHeader().marshal())
+                return
+
+            connection.send(0, commands.Connection.Start(
+                server_properties={
+                    "product": "asynchron-broker-emulator",
+                    "capabilities": {
+                        "publisher_confirms": True,
+                        "basic.nack": True,
+                        "consumer_cancel_notify": True,
+                        "per_consumer_qos": True,
+                        "direct_reply_to": True,
+                    },
+                },
+                mechanisms="PLAIN AMQPLAIN",
+            ))
+
+            while True:
+                frame_header = await reader.readexactly(7)
+                _, _, size = struct.unpack(">BHI", frame_header)
+                _, channel_id, frame = unmarshal(frame_header + await reader.readexactly(size + 1))
+
+                if not self.__handle(connection, channel_id, frame):
+                    return
+
+                await writer.drain()
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+        finally:
+            self.__close_connection(connection)
+            writer.close()
+
+    def __handle(self, connection: _Connection, channel_id: int, frame: object) -> bool:
+        if isinstance(frame, Heartbeat):
+            connection.send(0, Heartbeat())
+
+        elif channel_id == 0:
+            return self.__handle_connection(connection, frame)
+
+        elif isinstance(frame, commands.Channel.Open):
+            connection.channels[channel_id] = _Channel(channel_id, connection)
+            connection.send(channel_id, commands.Channel.OpenOk())
+
+        else:
+            channel = connection.channels.get(channel_id)
+            if channel is None:
+                return True
+
+            if isinstance(frame, (commands.Channel.Close, commands.Channel.CloseOk)):
+                self.__close_channel(channel)
+                if isinstance(frame, commands.Channel.Close):
+                    connection.send(channel_id, commands.Channel.CloseOk())
+
+            elif not channel.is_closing:
+                try:
+                    self.__handle_channel(channel, frame)
+
+                except _ChannelError as err:
+                    channel.is_closing = True
+                    connection.send(channel_id, commands.Channel.Close(err.reply_code, err.reply_text, 0, 0))
+
+        return True
+
+    def __handle_connection(self, connection: _Connection, frame: object) -> bool:
+        if isinstance(frame, commands.Connection.StartOk):
+            connection.send(0, commands.Connection.Tune(channel_max=2047, frame_max=FRAME_MAX_SIZE, heartbeat=0))
+
+        elif isinstance(frame, commands.Connection.TuneOk):
+            connection.frame_max = frame.frame_max or FRAME_MAX_SIZE
+
+        elif isinstance(frame, commands.Connection.Open):
+            connection.send(0, commands.Connection.OpenOk())
+
+        elif isinstance(frame, commands.Connection.Close):
+            connection.send(0, commands.Connection.CloseOk())
+            return False
+
+        elif isinstance(frame, commands.Connection.CloseOk):
+            return False
+
+        return True
+
+    def __handle_channel(self, channel: _Channel, frame: object) -> None:
+        if isinstance(frame, commands.Basic.Publish):
+            channel.publish, channel.properties, channel.body_size, channel.body = frame, None, 0, []
+
+        elif isinstance(frame, ContentHeader):
+            channel.properties, channel.body_size = frame.properties, frame.body_size
+            if frame.body_size == 0:
+                self.__complete_publish(channel)
+
+        elif isinstance(frame, ContentBody):
+            channel.body.append(frame.value)
+            if sum(len(chunk) for chunk in channel.body) >= channel.body_size:
+                self.__complete_publish(channel)
+
+        elif isinstance(frame, commands.Basic.Ack):
+            self.__settle(channel, frame.delivery_tag, frame.multiple, None)
+
+        elif isinstance(frame, commands.Basic.Nack):
+            self.__settle(channel, frame.delivery_tag, frame.multiple, frame.requeue)
+
+        elif isinstance(frame, commands.Basic.Reject):
+            self.__settle(channel, frame.delivery_tag or 0, False, frame.requeue)
+
+        elif isinstance(frame, commands.Basic.Qos):
+            channel.prefetch_count = frame.prefetch_count
+            channel.connection.send(channel.id, commands.Basic.QosOk())
+
+        elif isinstance(frame, commands.Basic.Consume):
+            self.__consume(channel, frame)
+
+        elif isinstance(frame, commands.Basic.Cancel):
+            self.__cancel(channel, frame.consumer_tag or "")
+            if not frame.nowait:
+                channel.connection.send(channel.id, commands.Basic.CancelOk(frame.consumer_tag))
+
+        elif isinstance(frame, commands.Confirm.Select):
+            channel.is_confirming = True
+            if not frame.nowait:
+                channel.connection.send(channel.id, commands.Confirm.SelectOk())
+
+        elif isinstance(frame, commands.Exchange.Declare):
+            self.__declare_exchange(channel, frame)
+
+        elif isinstance(frame, commands.Exchange.Delete):
+            self.__exchanges.pop(frame.exchange, None)
+            if not frame.nowait:
+                channel.connection.send(channel.id, commands.Exchange.DeleteOk())
+
+        elif isinstance(frame, commands.Queue.Declare):
+            self.__declare_queue(channel, frame)
+
+        elif isinstance(frame, commands.Queue.Bind):
+            self.__get_exchange(frame.exchange).bind(self.__get_queue(frame.queue).name, frame.routing_key)
+            if not frame.nowait:
+                channel.connection.send(channel.id, commands.Queue.BindOk())
+
+        elif isinstance(frame, commands.Queue.Unbind):
+            self.__get_exchange(frame.exchange).unbind(self.__get_queue(frame.queue).name, frame.routing_key)
+            channel.connection.send(channel.id, commands.Queue.UnbindOk())
+
+        elif isinstance(frame, commands.Queue.Purge):
+            queue = self.__get_queue(frame.queue)
+            message_count = len(queue.messages)
+            queue.messages.clear()
+            if not frame.nowait:
+                channel.connection.send(channel.id, commands.Queue.PurgeOk(message_count))
+
+        elif isinstance(frame, commands.Queue.Delete):
+            message_count = self.__delete_queue(self.__get_queue(frame.queue))
+            if not frame.nowait:
+                channel.connection.send(channel.id, commands.Queue.DeleteOk(message_count))
+
+        else:
+            raise _ChannelError(540, f"NOT_IMPLEMENTED - {type(frame).__name__}")
+
+    def __declare_exchange(self, channel: _Channel, frame: commands.Exchange.Declare) -> None:
+        exchange = self.__exchanges.get(frame.exchange)
+
+        if exchange is None:
+            if frame.passive:
+                raise _ChannelError(_NOT_FOUND, f"NOT_FOUND - no exchange '{frame.exchange}'")
+
+            if frame.exchange_type not in ("direct", "fanout", "topic"):
+                raise _ChannelError(503, f"COMMAND_INVALID - unsupported exchange type '{frame.exchange_type}'")
+
+            exchange = self.__exchanges[frame.exchange] = _Exchange(frame.exchange, frame.exchange_type)
+
+        elif not frame.passive and exchange.type != frame.exchange_type:
+            raise _ChannelError(_PRECONDITION_FAILED, f"PRECONDITION_FAILED - inequivalent type of '{exchange.name}'")
+
+        if not frame.nowait:
+            channel.connection.send(channel.id, commands.Exchange.DeclareOk())
+
+    def __declare_queue(self, channel: _Channel, frame: commands.Queue.Declare) -> None:
+        name = frame.queue or f"amq.gen-{uuid.uuid4().hex}"
+        queue = self.__queues.get(name)
+
+        if queue is None:
+            if frame.passive:
+                raise _ChannelError(_NOT_FOUND, f"NOT_FOUND - no queue '{name}'")
+
+            queue = self.__queues[name] = _Queue(name, channel.connection if frame.exclusive else None,
+                                                 frame.auto_delete)
+
+        elif queue.owner is not None and queue.owner is not channel.connection:
+            raise _ChannelError(_RESOURCE_LOCKED, f"RESOURCE_LOCKED - exclusive queue '{name}'")
+
+        if not frame.nowait:
+            channel.connection.send(channel.id, commands.Queue.DeclareOk(name, len(queue.messages),
+                                                                         len(queue.consumers)))
+
+    def __delete_queue(self, queue: _Queue) -> int:
+        self.__queues.pop(queue.name, None)
+        for exchange in self.__exchanges.values():
+            exchange.unbind(queue.name)
+
+        for consumer in tuple(queue.consumers):
+            consumer.channel.consumers.pop(consumer.tag, None)
+            consumer.channel.connection.send(consumer.channel.id, commands.Basic.Cancel(consumer.tag, nowait=True))
+
+        queue.consumers.clear()
+
+        return len(queue.messages)
+
+    def __consume(self, channel: _Channel, frame: commands.Basic.Consume) -> None:
+        consumer_tag = frame.consumer_tag or f"amq.ctag-{uuid.uuid4().hex}"
+
+        if frame.queue == _DIRECT_REPLY_TO:
+            if not frame.no_ack:
+                raise _ChannelError(_PRECONDITION_FAILED, "PRECONDITION_FAILED - reply consumer must be no ack")
+
+            channel.reply_to = f"{_DIRECT_REPLY_TO}.{uuid.uuid4().hex}"
+            self.__reply_channels[channel.reply_to] = channel, consumer_tag
+
+        else:
+            queue = self.__get_queue(frame.queue)
+            consumer = _Consumer(consumer_tag, queue, channel, frame.no_ack, channel.prefetch_count)
+            channel.consumers[consumer_tag] = consumer
+            queue.consumers.append(consumer)
+
+        if not frame.nowait:
+            channel.connection.send(channel.id, commands.Basic.ConsumeOk(consumer_tag))
+
+        if frame.queue != _DIRECT_REPLY_TO:
+            self.__dispatch(self.__queues[frame.queue])
+
+    def __cancel(self, channel: _Channel, consumer_tag: str) -> None:
+        if channel.reply_to is not None and self.__reply_channels.get(channel.reply_to, (None, None))[1] \
+                == consumer_tag:
+            del self.__reply_channels[channel.reply_to]
+            channel.reply_to = None
+            return
+
+        consumer = channel.consumers.pop(consumer_tag, None)
+        if consumer is None:
+            return
+
+        queue = consumer.queue
+        queue.consumers.remove(consumer)
+        if queue.is_auto_delete and not queue.consumers and self.__queues.get(queue.name) is queue:
+            self.__delete_queue(queue)
+
+    def __complete_publish(self, channel: _Channel) -> None:
+        publish, properties = channel.publish, channel.properties or commands.Basic.Properties()
+        channel.publish = None
+        if publish is None:
+            return
+
+        message = _Message(publish.exchange, publish.routing_key, properties, b"".join(channel.body))
+        channel.body = []
+
+        if properties.reply_to == _DIRECT_REPLY_TO:
+            if channel.reply_to is None:
+                raise _ChannelError(_PRECONDITION_FAILED, "PRECONDITION_FAILED - fast reply consumer does not exist")
+
+            properties.reply_to = channel.reply_to
+
+        is_routed = self.__route(message)
+
+        if publish.mandatory and not is_routed:
+            channel.connection.send_content(
+                channel.id,
+                commands.Basic.Return(_NO_ROUTE, "NO_ROUTE", publish.exchange, publish.routing_key),
+                message,
+            )
+
+        if channel.is_confirming:
+            channel.published += 1
+            channel.connection.send(channel.id, commands.Basic.Ack(channel.published))
+
+    def __route(self, message: _Message) -> bool:
+        if not message.exchange:
+            reply_channel = self.__reply_channels.get(message.routing_key)
+            if reply_channel is not None:
+                channel, consumer_tag = reply_channel
+                channel.connection.send_content(
+                    channel.id,
+                    commands.Basic.Deliver(consumer_tag, next(channel.delivery_tags), False, "",
+                                           message.routing_key),
+                    message,
+                )
+                return True
+
+            queue_names: t.Collection[str] = (message.routing_key,) if message.routing_key in self.__queues else ()
+
+        else:
+            queue_names = self.__get_exchange(message.exchange).route(message.routing_key)
+
+        for index, queue_name in enumerate(queue_names):
+            queue = self.__queues[queue_name]
+            queue.messages.append(message if index == 0 else _Message(message.exchange, message.routing_key,
+                                                                      message.properties, message.body))
+            self.__dispatch(queue)
+
+        return bool(queue_names)
+
+    def __dispatch(self, queue: _Queue) -> None:
+        while queue.messages and queue.consumers:
+            consumers = queue.consumers
+            for offset in range(len(consumers)):
+                consumer = consumers[(queue.next_consumer + offset) % len(consumers)]
+                if consumer.has_capacity and not consumer.channel.is_closing:
+                    queue.next_consumer = (queue.next_consumer + offset + 1) % len(consumers)
+                    break
+
+            else:
+                return
+
+            message = queue.messages.popleft()
+            channel = consumer.channel
+            delivery_tag = next(channel.delivery_tags)
+
+            if not consumer.no_ack:
+                channel.unacked[delivery_tag] = message, consumer
+                consumer.unacked += 1
+
+            channel.connection.send_content(
+                channel.id,
+                commands.Basic.Deliver(consumer.tag, delivery_tag, message.redelivered, message.exchange,
+                                       message.routing_key),
+                message,
+            )
+
+    def __settle(self, channel: _Channel, delivery_tag: int, multiple: bool, requeue: t.Optional[bool]) -> None:
+        if multiple:
+            delivery_tags = [tag for tag in channel.unacked if delivery_tag == 0 or tag <= delivery_tag]
+
+        elif delivery_tag in channel.unacked:
+            delivery_tags = [delivery_tag]
+
+        else:
+            raise _ChannelError(_PRECONDITION_FAILED, f"PRECONDITION_FAILED - unknown delivery tag {delivery_tag}")
+
+        queues: t.Dict[str, _Queue] = {}
+        for tag in reversed(delivery_tags):
+            message, consumer = channel.unacked.pop(tag)
+            consumer.unacked -= 1
+            queues[consumer.queue.name] = consumer.queue
+
+            if requeue:
+                message.redelivered = True
+                consumer.queue.messages.appendleft(message)
+
+        for queue in queues.values():
+            self.__dispatch(queue)
+
+    def __close_channel(self, channel: _Channel) -> None:
+        channel.is_closing = True
+        channel.connection.channels.pop(channel.id, None)
+
+        if channel.reply_to is not None:
+            self.__reply_channels.pop(channel.reply_to, None)
+
+        for consumer_tag in tuple(channel.consumers):
+            self.__cancel(channel, consumer_tag)
+
+        queues: t.Dict[str, _Queue] = {}
+        for message, consumer in reversed(tuple(channel.unacked.values())):
+            message.redelivered = True
+            consumer.queue.messages.appendleft(message)
+            queues[consumer.queue.name] = consumer.queue
+
+        channel.unacked.clear()
+
+        for queue in queues.values():
+            if self.__queues.get(queue.name) is queue:
+                self.__dispatch(queue)
+
+    def __close_connection(self, connection: _Connection) -> None:
+        self.__connections.discard(connection)
+
+        for channel in tuple(connection.channels.values()):
+            self.__close_channel(channel)
+
+        for queue in tuple(self.__queues.values()):
+            if queue.owner is connection:
+                self.__delete_queue(queue)
+
+    def __get_exchange(self, name: str) -> _Exchange:
+        exchange = self.__exchanges.get(name)
+        if exchange is None:
+            raise _ChannelError(_NOT_FOUND, f"NOT_FOUND - no exchange '{name}'")
+
+        return exchange
+
+    def __get_queue(self, name: str) -> _Queue:
+        queue = self.__queues.get(name)
+        if queue is None:
+            raise _ChannelError(_NOT_FOUND, f"NOT_FOUND - no queue '{name}'")
+
+        return queue
+
+
+class BytesSerializer(MessageSerializer[AbstractMessage, bytes]):
+    """Passes message bodies as they are, for tests of the controller over the emulator."""
+
+    def decode(self, message: AbstractMessage) -> bytes:
+        return message.body
+
+    def encode(self, message: bytes) -> AbstractMessage:
+        return aio_pika.Message(body=message)
@@ -0,0 +1,86 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from pytest_cases import fixture
+
+from asynchron.amqp.consumer.prefetch import AdaptivePrefetchTuner
+from asynchron.core.amqp import AmqpConsumerBindings
+
+
+@fixture()
+def bindings() -> AmqpConsumerBindings:
+    return AmqpConsumerBindings(exchange_name="test", binding_keys=("test",), prefetch_count=4)
+
+
+def test_tune_increases_prefetch_additively_when_saturated(bindings: AmqpConsumerBindings) -> None:
+    tuner = AdaptivePrefetchTuner(bindings, min_prefetch_count=1, max_prefetch_count=5, increase_step=1)
+    states = [tuner.before_consume(bindings, MagicMock()) for _ in range(4)]
+    for state in states:
+        tuner.after_consume(bindings, MagicMock(), state, None)
+
+    assert tuner.tune(loop_lag=0.0) == 5
+
+
+def test_tune_holds_prefetch_when_not_saturated(bindings: AmqpConsumerBindings) -> None:
+    tuner = AdaptivePrefetchTuner(bindings, min_prefetch_count=1, max_prefetch_count=10)
+    tuner.after_consume(bindings, MagicMock(), tuner.before_consume(bindings, MagicMock()), None)
+
+    assert tuner.tune(loop_lag=0.0) == 4
+
+
+def test_tune_decreases_prefetch_multiplicatively_on_loop_lag(bindings: AmqpConsumerBindings) -> None:
+    tuner = AdaptivePrefetchTuner(bindings, min_prefetch_count=3, max_prefetch_count=10, loop_lag_threshold=0.1,
+                                  decrease_factor=0.5)
+
+    assert tuner.tune(loop_lag=0.5) == 3
+
+
+async def test_tuner_keeps_running_after_channel_error(bindings: AmqpConsumerBindings) -> None:
+    tuner = AdaptivePrefetchTuner(bindings, min_prefetch_count=1, max_prefetch_count=10, interval=0.01,
+                                  loop_lag_threshold=1.0)
+    # saturated in-flight messages increase prefetch in each window.
+    for _ in range(10):
+        tuner.before_consume(bindings, MagicMock())
+
+    channel = MagicMock()
+    channel.set_qos = AsyncMock(side_effect=[ConnectionError("channel is closed"), None])
+    tuner.attach(channel)
+    try:
+        for _ in range(100):
+            if tuner.prefetch_count != 4:
+                break
+
+            await asyncio.sleep(0.01)
+
+    finally:
+        await tuner.detach()
+
+    assert tuner.prefetch_count == 5
+    assert channel.set_qos.await_count == 2
+
+
+async def test_tuner_is_restarted_when_attached_again(bindings: AmqpConsumerBindings) -> None:
+    tuner = AdaptivePrefetchTuner(bindings, min_prefetch_count=1, max_prefetch_count=10, interval=0.01,
+                                  loop_lag_threshold=1.0)
+    for _ in range(10):
+        tuner.before_consume(bindings, MagicMock())
+
+    broken = MagicMock()
+    broken.set_qos = AsyncMock(side_effect=ValueError("unexpected"))
+    tuner.attach(broken)
+    await asyncio.sleep(0.05)
+
+    channel = MagicMock()
+    channel.set_qos = AsyncMock()
+    tuner.attach(channel)
+    try:
+        for _ in range(100):
+            if tuner.prefetch_count != 4:
+                break
+
+            await asyncio.sleep(0.01)
+
+    finally:
+        await tuner.detach()
+
+    assert tuner.prefetch_count > 4
@@ -0,0 +1,63 @@
+import typing as t
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import aio_pika
+import pytest
+
+from asynchron.amqp.consumer.admission import compile_admission
+from asynchron.amqp.consumer.pipeline import ConsumerPipelineCompiler
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import CallableMessageConsumer
+
+BINDINGS = AmqpConsumerBindings("events", ("temperature.*",), admitted_headers=(("tenant", ("acme", "globex")),),
+                                admitted_app_ids=("sensors",), max_timestamp_age=60000)
+
+
+def create_message(
+        tenant: t.Union[str, bytes] = b"acme",
+        app_id: str = "sensors",
+        age: timedelta = timedelta(),
+        expiration: float = 0,
+) -> aio_pika.Message:
+    # timestamps are decoded as naive UTC datetimes.
+    return aio_pika.Message(b"21.5", headers={"tenant": tenant}, app_id=app_id,
+                            timestamp=datetime.utcnow() - age, expiration=expiration or None)
+
+
+def test_bindings_without_predicates_have_no_admission() -> None:
+    assert compile_admission(AmqpConsumerBindings("events", ("temperature.*",))) is None
+
+
+@pytest.mark.parametrize("message, is_admitted", [
+    (create_message(), True),
+    (create_message(tenant="globex"), True),
+    (create_message(tenant=b"initech"), False),
+    (create_message(app_id="dashboard"), False),
+    (create_message(age=timedelta(minutes=2)), False),
+    (create_message(age=timedelta(seconds=30), expiration=10), False),
+])
+def test_admission_checks_raw_properties(message: aio_pika.Message, is_admitted: bool) -> None:
+    admit = compile_admission(BINDINGS)
+
+    assert admit is not None
+    assert admit(message) is is_admitted  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("action, settled", [(None, "ack"), ("reject", "reject")])
+async def test_inadmissible_message_is_settled_without_decoding(action: str, settled: str) -> None:
+    decoder = MagicMock()
+    handler = AsyncMock()
+    message = MagicMock()
+    message.headers_raw = {"tenant": b"initech"}
+    message.processed = False
+    message.ack = AsyncMock()
+    message.reject = AsyncMock()
+
+    bindings = AmqpConsumerBindings("events", ("temperature.*",), admitted_headers=(("tenant", ("acme",)),),
+                                    inadmissible_action=action)  # type: ignore[arg-type]
+    await ConsumerPipelineCompiler().compile(decoder, CallableMessageConsumer(handler), bindings).consume(message)
+
+    decoder.decode.assert_not_called()
+    handler.assert_not_awaited()
+    getattr(message, settled).assert_awaited_once()
@@ -0,0 +1,86 @@
+import asyncio
+import typing as t
+
+import aio_pika
+from aio_pika.abc import AbstractIncomingMessage
+from aiormq.abc import DeliveredMessage
+from pamqp import commands
+
+from asynchron.amqp.connector import AmqpConnector
+from asynchron.amqp.controller import AioPikaBasedAmqpController
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings, AmqpServerBindings
+from tests.amqp_broker import AmqpBrokerEmulator, BytesSerializer
+
+
+async def test_connector_publishes_and_consumes_through_topic_exchange(broker: AmqpBrokerEmulator) -> None:
+    received: "asyncio.Queue[AbstractIncomingMessage]" = asyncio.Queue()
+
+    async def consume(message: AbstractIncomingMessage) -> None:
+        await message.ack()
+        await received.put(message)
+
+    async with AmqpConnector(AmqpServerBindings(connection_url=broker.url)) as connector:
+        await connector.create_consumer(consume, ("temperature.*",), "events", "topic", "measures", 10)
+        _, exchange = await connector.create_exchange("events", "topic")
+
+        await exchange.publish(aio_pika.Message(body=b"21.5", headers={"sensor": "a"}), "temperature.measured")
+        await exchange.publish(aio_pika.Message(body=b"ignored"), "pressure.measured")
+        message = await asyncio.wait_for(received.get(), 1.0)
+
+        assert (message.body, message.routing_key, message.headers) == \
+               (b"21.5", "temperature.measured", {"sensor": "a"})
+        assert received.empty()
+        assert broker.get_message_count("measures") == 0
+
+
+async def test_rejected_message_is_redelivered(broker: AmqpBrokerEmulator) -> None:
+    received: "asyncio.Queue[AbstractIncomingMessage]" = asyncio.Queue()
+
+    async def consume(message: AbstractIncomingMessage) -> None:
+        if message.redelivered:
+            await message.ack()
+
+        else:
+            await message.reject(requeue=True)
+
+        await received.put(message)
+
+    async with AmqpConnector(AmqpServerBindings(connection_url=broker.url)) as connector:
+        await connector.create_consumer(consume, ("job",), "jobs", "direct", "jobs", 1)
+        _, exchange = await connector.create_exchange("jobs", "direct")
+        await exchange.publish(aio_pika.Message(body=b"job"), "job")
+
+        first = await asyncio.wait_for(received.get(), 1.0)
+        second = await asyncio.wait_for(received.get(), 1.0)
+
+        assert (first.redelivered, second.redelivered) == (False, True)
+
+
+async def test_unroutable_mandatory_message_is_returned(broker: AmqpBrokerEmulator) -> None:
+    async with AmqpConnector(AmqpServerBindings(connection_url=broker.url)) as connector:
+        _, exchange = await connector.create_exchange("events", "topic")
+
+        # aiormq resolves the confirmation of a returned message with the message itself.
+        returned: object = await exchange.publish(aio_pika.Message(body=b"lost"), "nobody.listens", mandatory=True)
+
+        assert isinstance(returned, DeliveredMessage) and isinstance(returned.delivery, commands.Basic.Return)
+        assert (returned.delivery.reply_text, returned.body) == ("NO_ROUTE", b"lost")
+
+
+async def test_controller_request_is_answered_over_direct_reply_to(broker: AmqpBrokerEmulator) -> None:
+    async def respond(message: bytes) -> bytes:
+        return message.upper()
+
+    async with AmqpConnector(AmqpServerBindings(connection_url=broker.url)) as connector:
+        controller = AioPikaBasedAmqpController(connector)
+        controller.bind_responder(BytesSerializer(), BytesSerializer(), respond,
+                                  AmqpConsumerBindings("commands", ("echo",), queue_name="echo"))
+        requester = controller.bind_requester(BytesSerializer(), BytesSerializer(),
+                                              AmqpPublisherBindings("commands", "echo"))
+
+        await controller.start()
+        try:
+            assert await requester.request(b"ping", timeout=1.0) == b"PING"
+
+        finally:
+            await controller.stop()
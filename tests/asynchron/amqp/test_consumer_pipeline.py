@@ -0,0 +1,208 @@
+import typing as t
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aio_pika.abc import AbstractIncomingMessage
+from pytest_cases import fixture
+
+from asynchron.amqp.consumer.pipeline import CompiledMessageConsumer, ConsumerMiddleware, ConsumerPipelineCompiler
+from asynchron.amqp.controller import AioPikaBasedAmqpController
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import CallableMessageConsumer
+from asynchron.core.message import MessageDecoder
+from asynchron.core.prometheus import PrometheusMetrics
+
+
+class BodyDecoder(MessageDecoder[AbstractIncomingMessage, bytes]):
+    def decode(self, message: AbstractIncomingMessage) -> bytes:
+        return message.body
+
+
+class RecordingMiddleware(ConsumerMiddleware):
+    def __init__(self, name: str, records: t.List[object]) -> None:
+        self.__name = name
+        self.__records = records
+
+    def before_consume(self, bindings: AmqpConsumerBindings, message: AbstractIncomingMessage) -> object:
+        self.__records.append(("before", self.__name))
+        return self.__name
+
+    def after_consume(
+            self,
+            bindings: AmqpConsumerBindings,
+            message: AbstractIncomingMessage,
+            state: object,
+            error: t.Optional[BaseException],
+    ) -> None:
+        self.__records.append(("after", state, type(error)))
+
+
+@fixture()
+def bindings() -> AmqpConsumerBindings:
+    return AmqpConsumerBindings(exchange_name="test", binding_keys=("test",))
+
+
+@fixture()
+def message() -> MagicMock:
+    message = MagicMock()
+    message.body = b"payload"
+    message.headers_raw = {}
+    message.processed = False
+    message.redelivered = False
+    message.channel.is_closed = False
+    message.ack = AsyncMock()
+    message.reject = AsyncMock()
+
+    return message
+
+
+async def test_compiled_pipeline_acks_handled_message(bindings: AmqpConsumerBindings, message: MagicMock) -> None:
+    handler = AsyncMock()
+    consumer = ConsumerPipelineCompiler().compile(BodyDecoder(), CallableMessageConsumer(handler), bindings)
+
+    await consumer.func(message)
+
+    handler.assert_awaited_once_with(b"payload")
+    message.ack.assert_awaited_once()
+    message.reject.assert_not_awaited()
+
+
+async def test_compiled_pipeline_rejects_failed_message(bindings: AmqpConsumerBindings, message: MagicMock) -> None:
+    handler = AsyncMock(side_effect=ValueError())
+    compiler = ConsumerPipelineCompiler(requeue_on_exception=True)
+    consumer = compiler.compile(BodyDecoder(), CallableMessageConsumer(handler), bindings)
+
+    with pytest.raises(ValueError):
+        await consumer.func(message)
+
+    message.ack.assert_not_awaited()
+    message.reject.assert_awaited_once_with(requeue=True)
+
+
+async def test_compiled_pipeline_calls_overridden_consume_of_callable_consumer(
+        bindings: AmqpConsumerBindings,
+        message: MagicMock,
+) -> None:
+    handled: t.List[bytes] = []
+
+    class UpperCasingConsumer(CallableMessageConsumer[bytes]):
+        async def consume(self, message: bytes) -> None:
+            await super().consume(message.upper())
+
+    handler = AsyncMock(side_effect=handled.append)
+    consumer = ConsumerPipelineCompiler().compile(BodyDecoder(), UpperCasingConsumer(handler), bindings)
+
+    await consumer.func(message)
+
+    assert handled == [b"PAYLOAD"]
+
+
+async def test_compiled_pipeline_calls_middlewares_in_order(
+        bindings: AmqpConsumerBindings,
+        message: MagicMock,
+) -> None:
+    records: t.List[object] = []
+    compiler = ConsumerPipelineCompiler(middlewares=[
+        RecordingMiddleware("first", records),
+        RecordingMiddleware("second", records),
+    ])
+    consumer = compiler.compile(BodyDecoder(), CallableMessageConsumer(AsyncMock()), bindings)
+
+    await consumer.func(message)
+
+    assert records == [
+        ("before", "first"),
+        ("before", "second"),
+        ("after", "second", type(None)),
+        ("after", "first", type(None)),
+    ]
+
+
+async def test_router_dispatches_message_to_all_matched_consumers_and_acks_once(message: MagicMock) -> None:
+    first, second, third = AsyncMock(), AsyncMock(), AsyncMock()
+    compiler = ConsumerPipelineCompiler()
+
+    def compile_route(handler: AsyncMock, *binding_keys: str) -> t.Tuple[AmqpConsumerBindings, CompiledMessageConsumer]:
+        bindings = AmqpConsumerBindings(exchange_name="test", binding_keys=binding_keys)
+        return bindings, compiler.compile(BodyDecoder(), CallableMessageConsumer(handler), bindings,
+                                          is_processing_enabled=False)
+
+    router = compiler.compile_router("topic", [
+        compile_route(first, "sensor.*"),
+        compile_route(second, "sensor.temperature", "sensor.#"),
+        compile_route(third, "device.*"),
+    ])
+    message.routing_key = "sensor.temperature"
+
+    await router.func(message)
+
+    first.assert_awaited_once_with(b"payload")
+    second.assert_awaited_once_with(b"payload")
+    third.assert_not_awaited()
+    message.ack.assert_awaited_once()
+
+
+async def test_compiled_pipeline_records_metrics(bindings: AmqpConsumerBindings, message: MagicMock) -> None:
+    metrics = PrometheusMetrics()
+    compiler = ConsumerPipelineCompiler(requeue_on_exception=True, metrics=metrics)
+    consumer = compiler.compile(BodyDecoder(), CallableMessageConsumer(AsyncMock(side_effect=[None, ValueError()])),
+                                bindings)
+
+    await consumer.func(message)
+    with pytest.raises(ValueError):
+        await consumer.func(message)
+
+    rendered = metrics.render()
+
+    assert 'asynchron_consumed_total{binding="test:test"} 2' in rendered
+    assert 'asynchron_consume_failed_total{binding="test:test"} 1' in rendered
+    assert 'asynchron_acked_total{binding="test:test"} 1' in rendered
+    assert 'asynchron_nacked_total{binding="test:test"} 1' in rendered
+    assert 'asynchron_handle_seconds_count{binding="test:test"} 2' in rendered
+
+
+async def test_key_ordered_pipeline_rejects_message_with_unhashable_key(message: MagicMock) -> None:
+    bindings = AmqpConsumerBindings(exchange_name="test", binding_keys=("test",), ordering_key_header="device")
+    handler = AsyncMock()
+    consumer = ConsumerPipelineCompiler().compile(BodyDecoder(), CallableMessageConsumer(handler), bindings)
+
+    message.headers = {"device": bytearray(b"a")}
+    await consumer.func(message)
+    await consumer.drain()
+
+    message.headers = {"device": {"id": "a"}}
+    with pytest.raises(ValueError):
+        await consumer.func(message)
+
+    handler.assert_awaited_once_with(b"payload")
+    message.ack.assert_awaited_once()
+    message.reject.assert_awaited_once_with(requeue=False)
+
+
+async def test_router_runs_all_matched_consumers_when_one_fails(message: MagicMock) -> None:
+    first, second = AsyncMock(side_effect=ValueError()), AsyncMock()
+    compiler = ConsumerPipelineCompiler()
+    routes = [
+        (bindings, compiler.compile(BodyDecoder(), CallableMessageConsumer(handler), bindings,
+                                    is_processing_enabled=False))
+        for bindings, handler in (
+            (AmqpConsumerBindings(exchange_name="test", binding_keys=("sensor.*",)), first),
+            (AmqpConsumerBindings(exchange_name="test", binding_keys=("sensor.#",)), second),
+        )
+    ]
+    router = compiler.compile_router("topic", routes)
+    message.routing_key = "sensor.temperature"
+
+    with pytest.raises(ValueError):
+        await router.func(message)
+
+    first.assert_awaited_once_with(b"payload")
+    second.assert_awaited_once_with(b"payload")
+    message.ack.assert_not_awaited()
+    message.reject.assert_awaited_once_with(requeue=False)
+
+
+def test_controller_rejects_metrics_next_to_given_pipeline_compiler() -> None:
+    with pytest.raises(ValueError):
+        AioPikaBasedAmqpController(MagicMock(), pipeline_compiler=ConsumerPipelineCompiler(),
+                                   metrics=PrometheusMetrics())
@@ -0,0 +1,44 @@
+import typing as t
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aio_pika import Message
+from aio_pika.abc import AbstractIncomingMessage
+from pytest_cases import parametrize
+
+from asynchron.amqp.consumer.retry import DelayedRetry
+
+
+@parametrize("attempt, expected_routing_key", (
+        (None, "q.retry.1000"),
+        (1, "q.retry.5000"),
+        (2, "q.retry.5000"),
+        (3, "q.parking"),
+))
+async def test_retry_publishes_message_to_tier_by_attempt(
+        attempt: t.Optional[int],
+        expected_routing_key: str,
+) -> None:
+    exchange = MagicMock()
+    exchange.publish = AsyncMock()
+    message = Message(
+        body=b"payload",
+        headers={"foo": "bar"} if attempt is None else {"foo": "bar", DelayedRetry.ATTEMPT_HEADER: attempt},
+    )
+
+    retry = DelayedRetry(delays=(1000, 5000), max_attempts=3)
+    retry.attach(exchange, ("q.retry.1000", "q.retry.5000"), "q.parking")
+
+    await retry.retry(t.cast(AbstractIncomingMessage, message))
+
+    exchange.publish.assert_awaited_once()
+    assert exchange.publish.await_args is not None
+    published = exchange.publish.await_args.kwargs
+    assert published["routing_key"] == expected_routing_key
+    assert published["message"].body == b"payload"
+    assert published["message"].headers[DelayedRetry.ATTEMPT_HEADER] == (attempt or 0) + 1
+
+
+async def test_retry_is_not_available_before_attach() -> None:
+    with pytest.raises(RuntimeError):
+        await DelayedRetry(delays=(1000,)).retry(t.cast(AbstractIncomingMessage, Message(body=b"")))
@@ -0,0 +1,81 @@
+import threading
+import typing as t
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_cases import fixture
+
+from asynchron.amqp.consumer.offload import offload_decoding, offload_handler
+from asynchron.amqp.consumer.pipeline import ConsumerPipelineCompiler
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import CallableMessageConsumer, SyncCallableMessageConsumer
+from tests.asynchron.amqp.test_consumer_pipeline import BodyDecoder
+
+
+def fail_on_poison(message: bytes) -> None:
+    if message == b"poison":
+        raise ValueError(message)
+
+
+@fixture()
+def message() -> MagicMock:
+    message = MagicMock()
+    message.body = b"payload"
+    message.headers_raw = {}
+    message.content_type = "application/octet-stream"
+    message.content_encoding = None
+    message.correlation_id = None
+    message.reply_to = None
+    message.message_id = None
+    message.user_id = None
+    message.app_id = None
+    message.routing_key = "test"
+    message.processed = False
+    message.redelivered = False
+    message.channel.is_closed = False
+    message.ack = AsyncMock()
+    message.reject = AsyncMock()
+
+    return message
+
+
+async def test_thread_offloaded_handler_runs_outside_of_event_loop_thread(message: MagicMock) -> None:
+    bindings = AmqpConsumerBindings(exchange_name="test", binding_keys=("test",), handler_executor="thread")
+    calls: t.List[t.Tuple[bytes, int]] = []
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        def record(message: bytes) -> None:
+            calls.append((message, threading.get_ident()))
+
+        consumer = offload_handler(SyncCallableMessageConsumer(record), bindings, executor)
+        await ConsumerPipelineCompiler().compile(BodyDecoder(), consumer, bindings).func(message)
+
+    assert calls == [(b"payload", calls[0][1])]
+    assert calls[0][1] != threading.get_ident()
+    message.ack.assert_awaited_once()
+
+
+async def test_process_offloaded_handler_is_acked_and_rejected_on_event_loop(message: MagicMock) -> None:
+    bindings = AmqpConsumerBindings(exchange_name="test", binding_keys=("test",), handler_executor="process")
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        decoder, consumer = offload_decoding(BodyDecoder(), SyncCallableMessageConsumer(fail_on_poison), bindings,
+                                             executor)
+        compiled = ConsumerPipelineCompiler(requeue_on_exception=True).compile(decoder, consumer, bindings)
+
+        await compiled.func(message)
+        message.ack.assert_awaited_once()
+
+        message.body = b"poison"
+        with pytest.raises(ValueError):
+            await compiled.func(message)
+
+        message.reject.assert_awaited_once_with(requeue=True)
+
+
+def test_offload_requires_sync_handler() -> None:
+    bindings = AmqpConsumerBindings(exchange_name="test", binding_keys=("test",), handler_executor="thread")
+
+    with pytest.raises(ValueError):
+        offload_handler(CallableMessageConsumer(AsyncMock()), bindings, MagicMock())
@@ -0,0 +1,108 @@
+import asyncio
+import typing as t
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from asynchron.amqp.consumer.budget import InFlightByteBudget
+from asynchron.amqp.consumer.pipeline import ConsumerPipelineCompiler
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import CallableMessageConsumer
+
+
+class RecordingConsumer:
+    def __init__(self, name: str, records: t.List[t.Tuple[str, str]]) -> None:
+        self.__name = name
+        self.__records = records
+
+    async def pause(self) -> None:
+        self.__records.append(("pause", self.__name))
+
+    async def resume(self) -> None:
+        self.__records.append(("resume", self.__name))
+
+
+def create_message(size: int) -> MagicMock:
+    return MagicMock(body_size=size)
+
+
+async def settle() -> None:
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def test_global_budget_pauses_all_consumers_and_resumes_below_low_water() -> None:
+    records: t.List[t.Tuple[str, str]] = []
+    budget = InFlightByteBudget(max_bytes=100, low_water_ratio=0.5)
+    first = AmqpConsumerBindings(exchange_name="sensors", binding_keys=("first",))
+    second = AmqpConsumerBindings(exchange_name="sensors", binding_keys=("second",))
+    for bindings in (first, second):
+        consumer = RecordingConsumer(bindings.label, records)
+        budget.register([bindings.label], consumer.pause, consumer.resume)
+
+    small, large = create_message(40), create_message(70)
+    budget.before_consume(first, small)
+    budget.before_consume(second, large)
+    await settle()
+
+    assert sorted(records) == [("pause", "sensors:first"), ("pause", "sensors:second")]
+
+    records.clear()
+    budget.after_consume(first, small, None, None)
+    await settle()
+
+    assert records == []
+
+    budget.after_consume(second, large, None, None)
+    await settle()
+
+    assert sorted(records) == [("resume", "sensors:first"), ("resume", "sensors:second")]
+    assert budget.in_flight_bytes == 0
+
+
+async def test_binding_budget_pauses_only_its_consumer() -> None:
+    records: t.List[t.Tuple[str, str]] = []
+    budget = InFlightByteBudget()
+    limited = AmqpConsumerBindings(exchange_name="sensors", binding_keys=("limited",), max_in_flight_bytes=50)
+    unlimited = AmqpConsumerBindings(exchange_name="sensors", binding_keys=("unlimited",))
+    for bindings in (limited, unlimited):
+        consumer = RecordingConsumer(bindings.label, records)
+        budget.register([bindings.label], consumer.pause, consumer.resume)
+
+    message = create_message(60)
+    budget.before_consume(unlimited, message)
+    budget.before_consume(limited, message)
+    await settle()
+    budget.after_consume(limited, message, None, None)
+    await settle()
+
+    assert records == [("pause", "sensors:limited"), ("resume", "sensors:limited")]
+    assert budget.is_enabled_for(limited)
+    assert not budget.is_enabled_for(unlimited)
+
+
+async def test_budget_resumes_when_ack_fails() -> None:
+    records: t.List[t.Tuple[str, str]] = []
+    budget = InFlightByteBudget(max_bytes=50)
+    bindings = AmqpConsumerBindings(exchange_name="sensors", binding_keys=("temperature",))
+    recording = RecordingConsumer(bindings.label, records)
+    budget.register([bindings.label], recording.pause, recording.resume)
+
+    async def handle(message: object) -> None:
+        # the consumer is paused, while the message is being handled.
+        await settle()
+
+    consumer = ConsumerPipelineCompiler(middlewares=[budget]).compile(
+        MagicMock(), CallableMessageConsumer(handle), bindings)
+
+    message = create_message(60)
+    message.processed = False
+    message.ack = AsyncMock(side_effect=ConnectionError("channel is closed"))
+
+    with pytest.raises(ConnectionError):
+        await consumer.func(message)
+
+    await settle()
+
+    assert records == [("pause", "sensors:temperature"), ("resume", "sensors:temperature")]
+    assert budget.in_flight_bytes == 0
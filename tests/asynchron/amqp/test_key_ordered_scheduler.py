@@ -0,0 +1,76 @@
+import asyncio
+import random
+import typing as t
+
+from asynchron.amqp.consumer.ordering import KeyOrderedScheduler
+
+
+async def test_items_of_same_key_are_processed_in_order() -> None:
+    processed: t.Dict[str, t.List[int]] = {}
+
+    async def process(item: t.Tuple[str, int]) -> None:
+        key, value = item
+        await asyncio.sleep(random.random() / 1000)
+        processed.setdefault(key, []).append(value)
+
+    scheduler: KeyOrderedScheduler[str, t.Tuple[str, int]] = KeyOrderedScheduler(process, queue_size=2)
+
+    await asyncio.gather(*(
+        scheduler.submit(key, (key, value))
+        for value in range(20)
+        for key in ("a", "b", "c")
+    ))
+    await scheduler.drain()
+
+    assert processed == {key: list(range(20)) for key in ("a", "b", "c")}
+    assert scheduler.active_keys == 0
+
+
+async def test_keys_are_processed_in_parallel() -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+    processed: t.List[str] = []
+
+    async def process(key: str) -> None:
+        if key == "slow":
+            started.set()
+            await release.wait()
+
+        processed.append(key)
+
+    scheduler: KeyOrderedScheduler[str, str] = KeyOrderedScheduler(process, queue_size=10)
+
+    await scheduler.submit("slow", "slow")
+    await started.wait()
+    await scheduler.submit("fast", "fast")
+    await asyncio.sleep(0)
+
+    assert processed == ["fast"]
+
+    release.set()
+    await scheduler.drain()
+
+    assert processed == ["fast", "slow"]
+
+
+async def test_waiting_submitters_are_cancelled_with_worker() -> None:
+    workers: t.List["asyncio.Task[object]"] = []
+
+    async def process(item: int) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        workers.append(task)
+        await asyncio.Event().wait()
+
+    scheduler: KeyOrderedScheduler[str, int] = KeyOrderedScheduler(process, queue_size=1)
+    await scheduler.submit("a", 1)
+    await scheduler.submit("a", 2)
+    waiting = asyncio.create_task(scheduler.submit("a", 3))
+    await asyncio.sleep(0)
+
+    worker, = workers
+    worker.cancel()
+    await asyncio.wait_for(asyncio.gather(waiting, return_exceptions=True), 1.0)
+
+    assert waiting.cancelled()
+    assert scheduler.active_keys == 0
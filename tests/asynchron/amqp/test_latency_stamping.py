@@ -0,0 +1,61 @@
+import time
+import typing as t
+from unittest.mock import AsyncMock, MagicMock
+
+import aio_pika
+import pytest
+
+from asynchron.amqp.consumer.pipeline import ConsumerPipelineCompiler
+from asynchron.amqp.latency import (
+    HOPS_HEADER,
+    ORIGIN_PUBLISHED_AT_HEADER,
+    PUBLISHED_AT_HEADER,
+    LatencyStamper,
+    get_header_timestamp_ns,
+)
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import CallableMessageConsumer
+from tests.asynchron.amqp.test_consumer_pipeline import BodyDecoder
+
+
+# forwarded byte string headers are kept as bytearray.
+@pytest.mark.parametrize("hops", ["sensor", bytearray(b"sensor")])
+def test_stamper_keeps_origin_timestamp_and_appends_hop(hops: t.Union[str, bytearray]) -> None:
+    message = aio_pika.Message(body=b"", headers={ORIGIN_PUBLISHED_AT_HEADER: 1, HOPS_HEADER: hops})
+
+    LatencyStamper(hop_name="gateway").stamp(message)
+
+    assert message.headers[ORIGIN_PUBLISHED_AT_HEADER] == 1
+    assert message.headers[HOPS_HEADER] == "sensor,gateway"
+    assert get_header_timestamp_ns(message.headers, PUBLISHED_AT_HEADER) is not None
+
+
+def test_header_timestamp_is_parsed_from_forwarded_string() -> None:
+    assert get_header_timestamp_ns({PUBLISHED_AT_HEADER: "42"}, PUBLISHED_AT_HEADER) == 42
+    assert get_header_timestamp_ns({PUBLISHED_AT_HEADER: "invalid"}, PUBLISHED_AT_HEADER) is None
+    assert get_header_timestamp_ns(None, PUBLISHED_AT_HEADER) is None
+
+
+async def test_compiled_pipeline_skips_messages_older_than_max_age() -> None:
+    handler = AsyncMock()
+    bindings = AmqpConsumerBindings(exchange_name="test", binding_keys=("test",), max_message_age=1000)
+    consumer = ConsumerPipelineCompiler().compile(BodyDecoder(), CallableMessageConsumer(handler), bindings)
+
+    def create_message(age: float) -> MagicMock:
+        message = MagicMock()
+        message.body = b"payload"
+        message.processed = False
+        message.headers_raw = {ORIGIN_PUBLISHED_AT_HEADER: time.time_ns() - int(age * 1e9)}
+        message.ack = AsyncMock()
+        message.reject = AsyncMock()
+        return message
+
+    fresh, expired = create_message(0.1), create_message(10.0)
+
+    await consumer.func(fresh)
+    await consumer.func(expired)
+
+    handler.assert_awaited_once_with(b"payload")
+    fresh.ack.assert_awaited_once()
+    expired.ack.assert_not_awaited()
+    expired.reject.assert_awaited_once_with(requeue=False)
@@ -0,0 +1,118 @@
+import asyncio
+import typing as t
+from unittest.mock import AsyncMock, MagicMock
+
+import aio_pika
+import pytest
+from aio_pika.abc import AbstractMessage
+
+from asynchron.amqp.controller import AioPikaBasedAmqpController
+from asynchron.amqp.loopback import (
+    LOOPBACK_HEADER,
+    LoopbackMessagePublisher,
+    LoopbackRouter,
+    is_deliverable_locally,
+    skip_looped_back,
+)
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings
+from asynchron.core.consumer import CallableMessageConsumer
+from asynchron.core.message import MessageEncoder
+
+
+class CountingEncoder(MessageEncoder[bytes, AbstractMessage]):
+    def __init__(self) -> None:
+        self.encoded = 0
+
+    def encode(self, message: bytes) -> AbstractMessage:
+        self.encoded += 1
+        return aio_pika.Message(body=message)
+
+
+def test_router_matches_local_bindings_like_broker() -> None:
+    router = LoopbackRouter()
+    topic, direct, fanout, other = (CallableMessageConsumer(AsyncMock()) for _ in range(4))
+    router.add(AmqpConsumerBindings("events", ("temperature.*",), exchange_type="topic"), "topic", topic)
+    router.add(AmqpConsumerBindings("commands", ("calibrate",), exchange_type="direct"), "direct", direct)
+    router.add(AmqpConsumerBindings("broadcast", ("ignored",), exchange_type="fanout"), "fanout", fanout)
+    router.add(AmqpConsumerBindings("events", ("pressure.*",), exchange_type="topic"), "other", other)
+
+    assert router.match(AmqpPublisherBindings("events", "temperature.measured")) == (("topic", topic),)
+    assert router.match(AmqpPublisherBindings("commands", "calibrate")) == (("direct", direct),)
+    assert router.match(AmqpPublisherBindings("broadcast", "any")) == (("fanout", fanout),)
+    assert router.match(AmqpPublisherBindings("commands", "reset")) == ()
+
+
+async def test_local_consumer_gets_message_without_encoding() -> None:
+    handler = AsyncMock()
+    encoder = CountingEncoder()
+    exchange = MagicMock()
+    exchange.publish = AsyncMock()
+
+    publisher = LoopbackMessagePublisher(encoder, exchange, is_forwarding=False)
+    publisher.attach((("measures", CallableMessageConsumer(handler)),))
+
+    await publisher.publish(b"reading")
+    await publisher.drain()
+
+    handler.assert_awaited_once_with(b"reading")
+    assert encoder.encoded == 0
+    exchange.publish.assert_not_awaited()
+
+
+async def test_forwarded_message_is_skipped_by_consumers_that_got_it_locally() -> None:
+    forwarded: t.List[AbstractMessage] = []
+    exchange = MagicMock()
+    exchange.publish = AsyncMock(side_effect=forwarded.append)
+
+    publisher = LoopbackMessagePublisher(CountingEncoder(), exchange, is_forwarding=True)
+    publisher.attach((("measures", CallableMessageConsumer(AsyncMock())),))
+    await publisher.publish(b"reading")
+    await publisher.drain()
+
+    message, = forwarded
+    assert message.headers_raw[LOOPBACK_HEADER] == "measures"
+
+    delivery = MagicMock(headers_raw={LOOPBACK_HEADER: b"measures"}, ack=AsyncMock())
+    local, remote = AsyncMock(), AsyncMock()
+    await skip_looped_back("measures", local)(delivery)
+    await skip_looped_back("archive", remote)(delivery)
+
+    local.assert_not_awaited()
+    delivery.ack.assert_awaited_once()
+    remote.assert_awaited_once_with(delivery)
+
+
+async def test_local_consumer_error_is_passed_to_exception_handler() -> None:
+    error = ValueError("invalid reading")
+    contexts: t.List[t.Mapping[str, object]] = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: contexts.append(context))
+
+    publisher = LoopbackMessagePublisher(CountingEncoder(), MagicMock(), is_forwarding=False)
+    publisher.attach((("measures", CallableMessageConsumer(AsyncMock(side_effect=error))),))
+
+    await publisher.publish(b"reading")
+    await publisher.drain()
+
+    context, = contexts
+    assert context["exception"] is error
+
+
+@pytest.mark.parametrize("bindings, expected", [
+    (AmqpConsumerBindings("events", ("temperature",)), True),
+    (AmqpConsumerBindings("events", ("temperature",), handler_executor="thread"), True),
+    (AmqpConsumerBindings("events", ("temperature",), ordering_key_header="sensor"), False),
+    (AmqpConsumerBindings("events", ("temperature",), queue_name="measures", retry_delays=(1000,)), False),
+    (AmqpConsumerBindings("events", ("temperature",), max_message_age=1000), False),
+    (AmqpConsumerBindings("events", ("temperature",), admitted_app_ids=("sensors",)), False),
+    (AmqpConsumerBindings("events", ("temperature",), handler_executor="process"), False),
+])
+def test_consumers_with_delivery_stages_are_not_deliverable_locally(
+        bindings: AmqpConsumerBindings,
+        expected: bool,
+) -> None:
+    assert is_deliverable_locally(bindings) is expected
+
+
+def test_loopback_controller_rejects_tracer() -> None:
+    with pytest.raises(ValueError):
+        AioPikaBasedAmqpController(MagicMock(), loopback=True, tracer=MagicMock())
@@ -0,0 +1,46 @@
+import typing as t
+from unittest.mock import MagicMock
+
+from asynchron.amqp.consumer.memory import MemoryAttributionMiddleware
+from asynchron.amqp.consumer.pipeline import ConsumerPipelineCompiler
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import CallableMessageConsumer
+from tests.asynchron.amqp.test_consumer_pipeline import BodyDecoder
+
+LEAKED: t.List[bytes] = []
+
+
+async def test_memory_growth_is_attributed_to_binding_and_allocation_site() -> None:
+    middleware = MemoryAttributionMiddleware(sample_ratio=1.0)
+    compiler = ConsumerPipelineCompiler(is_processing_enabled=False, middlewares=[middleware])
+
+    async def leak(message: bytes) -> None:
+        LEAKED.append(bytes(100_000))
+
+    async def noop(message: bytes) -> None:
+        pass
+
+    leaking = compiler.compile(BodyDecoder(), CallableMessageConsumer(leak),
+                               AmqpConsumerBindings(exchange_name="sensors", binding_keys=("leaking",)))
+    healthy = compiler.compile(BodyDecoder(), CallableMessageConsumer(noop),
+                               AmqpConsumerBindings(exchange_name="sensors", binding_keys=("healthy",)))
+
+    middleware.start()
+    try:
+        for _ in range(3):
+            await leaking.func(MagicMock(body=b"payload", body_size=7, headers_raw={}))
+            await healthy.func(MagicMock(body=b"payload", body_size=7, headers_raw={}))
+
+    finally:
+        middleware.stop()
+        LEAKED.clear()
+
+    first, second = middleware.report(limit=1)
+
+    assert first.binding == "sensors:leaking"
+    assert first.sampled_handlers == 3
+    assert first.allocated_bytes >= 300_000
+    assert first.in_flight_bytes == 0
+    assert first.top_sites[0].filename == __file__
+    assert second.binding == "sensors:healthy"
+    assert second.allocated_bytes < first.allocated_bytes
@@ -0,0 +1,76 @@
+import typing as t
+
+import aio_pika
+from pamqp import commands
+from pydantic import BaseModel
+
+from asynchron.amqp.publisher.properties import MessagePropertiesTemplate
+from asynchron.amqp.raw.serializer import RawPydanticMessageSerializer
+from asynchron.core.amqp import AmqpPublisherBindings
+
+BINDINGS = AmqpPublisherBindings("events", "temperature.measured", expiration=4350, priority=3, delivery_mode=1,
+                                 cc=("temperature.archived",), user_id="guest")
+
+
+class Reading(BaseModel):
+    temperature: float
+
+
+def test_template_sets_properties_of_message() -> None:
+    template = MessagePropertiesTemplate.from_bindings(BINDINGS)
+    assert template is not None
+
+    message = aio_pika.Message(b"21.5", delivery_mode=2)
+    template.apply(message)
+    properties = message.properties
+
+    assert properties.delivery_mode == 1
+    assert properties.priority == 3
+    assert properties.expiration == "4350"
+    assert properties.user_id == "guest"
+    assert properties.headers == {"CC": ["temperature.archived"]}
+    assert properties.timestamp is None
+
+
+def test_messages_do_not_share_header_values() -> None:
+    template = MessagePropertiesTemplate.from_bindings(BINDINGS)
+    assert template is not None
+
+    first, second = aio_pika.Message(b"21.5"), aio_pika.Message(b"22.0")
+    template.apply(first)
+    t.cast(t.List[str], first.headers_raw["CC"]).append("temperature.audited")
+    template.apply(second)
+
+    assert second.headers_raw == {"CC": ["temperature.archived"]}
+
+
+def test_bindings_with_properties_are_hashable() -> None:
+    assert {BINDINGS: "publisher"}[BINDINGS] == "publisher"
+
+
+def test_template_is_not_created_without_properties() -> None:
+    assert MessagePropertiesTemplate.from_bindings(AmqpPublisherBindings("events", "temperature.measured")) is None
+
+
+def test_template_sets_timestamp() -> None:
+    template = MessagePropertiesTemplate.from_bindings(
+        AmqpPublisherBindings("events", "temperature.measured", is_timestamp_enabled=True))
+    assert template is not None
+
+    message = aio_pika.Message(b"21.5")
+    template.apply(message)
+
+    assert message.properties.timestamp is not None
+
+
+def test_raw_properties_are_pre_encoded() -> None:
+    serializer = RawPydanticMessageSerializer(Reading, properties={"delivery_mode": 1, "expiration": "4350"})
+    message = serializer.encode(Reading(temperature=21.5))
+
+    assert message.properties.marshal("id.1") == commands.Basic.Properties(
+        content_type="application/json",
+        content_encoding="utf-8",
+        delivery_mode=1,
+        expiration="4350",
+        message_id="id.1",
+    ).marshal()
@@ -0,0 +1,63 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from asynchron.amqp.controller import AioPikaBasedAmqpController
+from asynchron.amqp.declaration import ConsumerDeclaration, get_consumer_declaration
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import CallableMessageConsumer
+
+
+def test_quorum_queue_is_durable_with_arguments() -> None:
+    bindings = AmqpConsumerBindings("events", ("temperature.*",), queue_name="measures", queue_type="quorum",
+                                    max_length=1000, overflow="reject-publish", is_single_active_consumer=True)
+
+    assert get_consumer_declaration(bindings) == ConsumerDeclaration(
+        exchange_durable=False,
+        exchange_auto_delete=False,
+        queue_durable=True,
+        queue_exclusive=False,
+        queue_auto_delete=False,
+        queue_arguments={
+            "x-queue-type": "quorum",
+            "x-max-length": 1000,
+            "x-overflow": "reject-publish",
+            "x-single-active-consumer": True,
+        },
+    )
+
+
+@pytest.mark.parametrize("bindings", [
+    AmqpConsumerBindings("events", ("temperature.*",), queue_type="quorum"),
+    AmqpConsumerBindings("events", ("temperature.*",), queue_name="measures", queue_type="quorum", is_exclusive=True),
+    AmqpConsumerBindings("events", ("temperature.*",), queue_name="measures", queue_type="quorum", is_durable=False),
+    AmqpConsumerBindings("events", ("temperature.*",), queue_name="measures", queue_type="quorum", queue_mode="lazy"),
+])
+def test_invalid_quorum_queue_is_rejected(bindings: AmqpConsumerBindings) -> None:
+    with pytest.raises(ValueError):
+        get_consumer_declaration(bindings)
+
+
+async def test_controller_declares_lazy_queue() -> None:
+    connector = MagicMock()
+    connector.create_consumer = AsyncMock(return_value=(MagicMock(), MagicMock(), "consumer-tag"))
+    controller = AioPikaBasedAmqpController(connector)
+    controller.bind_consumer(MagicMock(), CallableMessageConsumer(AsyncMock()),
+                             AmqpConsumerBindings("events", ("temperature.*",), queue_name="measures",
+                                                  is_durable=True, is_exchange_durable=True, queue_mode="lazy"))
+
+    await controller.start()
+
+    kwargs = connector.create_consumer.call_args.kwargs
+    assert kwargs["exchange_durable"] and kwargs["queue_durable"]
+    assert kwargs["queue_arguments"] == {"x-queue-mode": "lazy"}
+
+
+def test_consolidated_bindings_must_declare_same_queue() -> None:
+    controller = AioPikaBasedAmqpController(MagicMock(), consolidated_queue_names={"events": "events.all"})
+    controller.bind_consumer(MagicMock(), CallableMessageConsumer(AsyncMock()),
+                             AmqpConsumerBindings("events", ("temperature.*",), exchange_type="topic"))
+
+    with pytest.raises(ValueError):
+        controller.bind_consumer(MagicMock(), CallableMessageConsumer(AsyncMock()),
+                                 AmqpConsumerBindings("events", ("pressure.*",), exchange_type="topic", max_length=10))
@@ -0,0 +1,97 @@
+import asyncio
+import typing as t
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pamqp import commands
+from pydantic import BaseModel
+
+from asynchron.amqp.raw.connector import AiormqConnector
+from asynchron.amqp.raw.consumer import RawProcessingConsumer
+from asynchron.amqp.raw.controller import AiormqBasedAmqpController, AiormqFacadeController
+from asynchron.amqp.raw.message import PropertiesTemplate
+from asynchron.amqp.serializer.pydantic import PydanticMessageSerializer
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings, AmqpServerBindings
+from asynchron.core.consumer import CallableMessageConsumer
+from tests.amqp_broker import AmqpBrokerEmulator, BytesSerializer
+
+
+class Reading(BaseModel):
+    sensor_id: str
+    value: float
+
+
+def test_properties_template_is_marshalled_like_properties() -> None:
+    values: t.Dict[str, t.Any] = dict(
+        content_type="application/json",
+        headers={"tenant": "a"},
+        delivery_mode=1,
+        expiration="1000",
+        app_id="sensors",
+    )
+    template = PropertiesTemplate(commands.Basic.Properties(**values))
+
+    assert template.create("id.1").marshal() == commands.Basic.Properties(message_id="id.1", **values).marshal()
+
+
+async def test_controller_consumes_published_pydantic_messages(broker: AmqpBrokerEmulator) -> None:
+    received: "asyncio.Queue[Reading]" = asyncio.Queue()
+
+    async def consume(message: Reading) -> None:
+        if message.value < 0:
+            raise ValueError(message)
+
+        await received.put(message)
+
+    async with AiormqConnector(AmqpServerBindings(connection_url=broker.url)) as connector:
+        controller = AiormqFacadeController(AiormqBasedAmqpController(connector))
+        # serializers of generated facades are replaced with raw ones.
+        controller.bind_consumer(PydanticMessageSerializer(Reading), CallableMessageConsumer(consume),
+                                 AmqpConsumerBindings("events", ("temperature.*",), exchange_type="topic",
+                                                      queue_name="measures"))
+        publisher = controller.bind_publisher(PydanticMessageSerializer(Reading),
+                                              AmqpPublisherBindings("events", "temperature.measured",
+                                                                    exchange_type="topic"))
+
+        await controller.start()
+        try:
+            await publisher.publish(Reading(sensor_id="a", value=-1.0))
+            await publisher.publish(Reading(sensor_id="a", value=21.5))
+
+            assert await asyncio.wait_for(received.get(), 1.0) == Reading(sensor_id="a", value=21.5)
+
+        finally:
+            await controller.stop()
+
+        assert received.empty()
+        assert broker.get_message_count("measures") == 0
+
+
+def test_facade_controller_rejects_serializers_and_rpc_it_cant_run() -> None:
+    controller = AiormqFacadeController(AiormqBasedAmqpController(MagicMock()))
+    bindings = AmqpConsumerBindings("commands", ("calibrate",), queue_name="calibrate")
+
+    with pytest.raises(ValueError):
+        controller.bind_consumer(BytesSerializer(), CallableMessageConsumer(AsyncMock()), bindings)
+
+    with pytest.raises(ValueError):
+        controller.bind_responder(PydanticMessageSerializer(Reading), PydanticMessageSerializer(Reading), AsyncMock(),
+                                  bindings)
+
+
+async def test_raw_consumer_error_is_passed_to_exception_handler() -> None:
+    error = ValueError("invalid reading")
+    contexts: t.List[t.Mapping[str, object]] = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: contexts.append(context))
+
+    message = MagicMock()
+    message.delivery = commands.Basic.Deliver(delivery_tag=7)
+    message.body = b"reading"
+    message.channel.basic_reject = AsyncMock()
+
+    consumer = RawProcessingConsumer(CallableMessageConsumer(AsyncMock(side_effect=error)), binding="measures")
+    await consumer(message)
+
+    context, = contexts
+    assert context["exception"] is error
+    message.channel.basic_reject.assert_awaited_once_with(7, requeue=False)
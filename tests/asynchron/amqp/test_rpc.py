@@ -0,0 +1,116 @@
+import asyncio
+import typing as t
+from unittest.mock import AsyncMock, MagicMock
+
+import aio_pika
+import pytest
+from aio_pika.abc import AbstractMessage
+
+from asynchron.amqp.rpc import DIRECT_REPLY_TO_QUEUE, DirectReplyToClient, ReplyPublisher, RespondingMessageConsumer
+from asynchron.amqp.serializer.context import MessageWithContext
+from asynchron.core.message import MessageEncoder
+
+
+class BytesEncoder(MessageEncoder[bytes, AbstractMessage]):
+    def encode(self, message: bytes) -> AbstractMessage:
+        return aio_pika.Message(body=message)
+
+
+def create_channel(publish: t.Callable[..., t.Awaitable[None]]) -> MagicMock:
+    channel = MagicMock()
+    channel.default_exchange.publish = AsyncMock(side_effect=publish)
+
+    return channel
+
+
+async def test_request_is_resolved_by_reply_with_its_correlation_id() -> None:
+    client = DirectReplyToClient()
+
+    async def reply(message: AbstractMessage, routing_key: str, mandatory: bool) -> None:
+        assert message.reply_to == DIRECT_REPLY_TO_QUEUE
+        asyncio.get_running_loop().call_soon(asyncio.ensure_future, client.consume(MagicMock(
+            correlation_id=message.correlation_id,
+            body=message.body.upper(),
+        )))
+
+    client.attach(create_channel(reply))
+
+    replies = await asyncio.gather(*(
+        client.request("", "echo", aio_pika.Message(body=body))
+        for body in (b"foo", b"bar")
+    ))
+
+    assert [reply.body for reply in replies] == [b"FOO", b"BAR"]
+    assert client.outstanding_requests == 0
+
+
+async def test_request_times_out_without_reply() -> None:
+    client = DirectReplyToClient(timeout=0.01)
+    client.attach(create_channel(AsyncMock()))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await client.request("", "void", aio_pika.Message(body=b""))
+
+    assert client.outstanding_requests == 0
+
+
+async def test_request_fails_when_it_is_returned_as_unroutable() -> None:
+    client = DirectReplyToClient()
+
+    async def return_(message: AbstractMessage, routing_key: str, mandatory: bool) -> None:
+        assert mandatory
+        on_return, = channel.return_callbacks.add.call_args.args
+        on_return(channel, MagicMock(correlation_id=message.correlation_id, exchange="", routing_key=routing_key))
+
+    channel = create_channel(return_)
+    client.attach(channel)
+
+    with pytest.raises(RuntimeError):
+        await client.request("", "void", aio_pika.Message(body=b""))
+
+    assert client.outstanding_requests == 0
+
+    client.detach()
+    channel.return_callbacks.discard.assert_called_once_with(*channel.return_callbacks.add.call_args.args)
+
+
+async def test_outstanding_requests_are_bounded() -> None:
+    client = DirectReplyToClient(max_outstanding_requests=1, timeout=0.05)
+    published: t.List[AbstractMessage] = []
+
+    async def record(message: AbstractMessage, routing_key: str, mandatory: bool) -> None:
+        published.append(message)
+
+    client.attach(create_channel(record))
+
+    first = asyncio.ensure_future(client.request("", "void", aio_pika.Message(body=b"first")))
+    second = asyncio.ensure_future(client.request("", "void", aio_pika.Message(body=b"second")))
+    await asyncio.sleep(0.01)
+
+    assert [message.body for message in published] == [b"first"]
+
+    await client.consume(MagicMock(correlation_id=published[0].correlation_id))
+    await first
+    await asyncio.sleep(0.01)
+
+    assert [message.body for message in published] == [b"first", b"second"]
+    second.cancel()
+
+
+async def test_responder_result_is_published_to_reply_to() -> None:
+    exchange = MagicMock()
+    exchange.publish = AsyncMock()
+    consumer = RespondingMessageConsumer(AsyncMock(return_value=b"pong"), BytesEncoder(), ReplyPublisher(exchange))
+
+    await consumer.consume(MessageWithContext(
+        data=b"ping",
+        headers={},
+        correlation_id="42",
+        reply_to=DIRECT_REPLY_TO_QUEUE,
+        user_id=None,
+        app_id=None,
+    ))
+
+    assert exchange.publish.await_args is not None
+    reply, routing_key = exchange.publish.await_args.args
+    assert (reply.body, reply.correlation_id, routing_key) == (b"pong", "42", DIRECT_REPLY_TO_QUEUE)
@@ -0,0 +1,114 @@
+import asyncio
+import time
+import typing as t
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from asynchron.amqp.connector import AmqpConnector
+from asynchron.amqp.consumer.pipeline import ConsumerPipelineCompiler
+from asynchron.amqp.consumer.stream import MessageStream
+from asynchron.amqp.controller import AioPikaBasedAmqpController
+from asynchron.amqp.latency import ORIGIN_PUBLISHED_AT_HEADER
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings, AmqpServerBindings
+from tests.amqp_broker import AmqpBrokerEmulator, BytesSerializer
+
+
+async def test_stream_buffer_is_bounded_by_prefetch_count(broker: AmqpBrokerEmulator) -> None:
+    async with AmqpConnector(AmqpServerBindings(connection_url=broker.url)) as connector:
+        controller = AioPikaBasedAmqpController(connector)
+        stream = controller.stream(BytesSerializer(), AmqpConsumerBindings("events", ("temperature",),
+                                                                           queue_name="measures", prefetch_count=2))
+        publisher = controller.bind_publisher(BytesSerializer(), AmqpPublisherBindings("events", "temperature"))
+
+        await controller.start()
+        try:
+            for value in range(5):
+                await publisher.publish(str(value).encode())
+
+            # the broker keeps messages, that don't fit into the buffer.
+            for _ in range(100):
+                if broker.get_message_count("measures") == 3:
+                    break
+
+                await asyncio.sleep(0.01)
+
+            assert broker.get_message_count("measures") == 3
+
+            received: t.List[bytes] = []
+            async for item in stream:
+                received.append(item.message)
+                await item.ack()
+
+                if len(received) == 5:
+                    break
+
+            assert received == [b"0", b"1", b"2", b"3", b"4"]
+            assert broker.get_message_count("measures") == 0
+
+        finally:
+            await controller.stop()
+
+        # the stream ends, when the controller is stopped.
+        assert [item async for item in stream] == []
+
+
+async def test_message_that_fails_to_decode_is_rejected_without_being_yielded() -> None:
+    decoder = MagicMock()
+    decoder.decode.side_effect = [ValueError("invalid"), b"21.5"]
+    stream: MessageStream[bytes] = MessageStream(decoder, buffer_size=10)
+
+    invalid, valid = MagicMock(), MagicMock()
+    for message in (invalid, valid):
+        message.reject = AsyncMock()
+        message.channel.is_closed = False
+
+    await stream.consume(invalid)
+    await stream.consume(valid)
+    stream.close()
+
+    assert [item.message async for item in stream] == [b"21.5"]
+    invalid.reject.assert_awaited_once_with(requeue=False)
+
+
+async def test_message_older_than_max_age_is_rejected_without_being_yielded() -> None:
+    stream: MessageStream[bytes] = MessageStream(BytesSerializer(), buffer_size=10, max_message_age=1000)
+
+    expired, fresh = MagicMock(), MagicMock()
+    expired.headers_raw = {ORIGIN_PUBLISHED_AT_HEADER: time.time_ns() - 2_000_000_000}
+    expired.body = b"20.0"
+    fresh.headers_raw = {ORIGIN_PUBLISHED_AT_HEADER: time.time_ns()}
+    fresh.body = b"21.5"
+    for message in (expired, fresh):
+        message.reject = AsyncMock()
+        message.channel.is_closed = False
+
+    await stream.consume(expired)
+    await stream.consume(fresh)
+    stream.close()
+
+    assert [item.message async for item in stream] == [b"21.5"]
+    expired.reject.assert_awaited_once_with(requeue=False)
+
+
+async def test_stream_requeues_messages_that_fail_to_decode_as_configured_by_controller() -> None:
+    decoder = MagicMock()
+    decoder.decode.side_effect = ValueError("invalid")
+    controller = AioPikaBasedAmqpController(
+        MagicMock(), pipeline_compiler=ConsumerPipelineCompiler(requeue_on_exception=True))
+    bindings = AmqpConsumerBindings("events", ("temperature",), queue_name="measures")
+    stream: MessageStream[bytes] = controller.stream(decoder, bindings)
+
+    message = MagicMock()
+    message.reject = AsyncMock()
+    await stream.consume(message)
+
+    message.reject.assert_awaited_once_with(requeue=True)
+
+
+def test_stream_rejects_unsupported_bindings() -> None:
+    controller = AioPikaBasedAmqpController(MagicMock())
+
+    with pytest.raises(ValueError):
+        controller.stream(BytesSerializer(), AmqpConsumerBindings("events", ("temperature",), queue_name="measures",
+                                                                  retry_delays=(1000,)))
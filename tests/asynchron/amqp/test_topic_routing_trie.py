@@ -0,0 +1,38 @@
+import typing as t
+
+from pytest_cases import parametrize
+
+from asynchron.amqp.consumer.routing import TopicRoutingTrie
+
+
+@parametrize("patterns, routing_key, expected", (
+        (("a.b.c",), "a.b.c", ("a.b.c",)),
+        (("a.b.c",), "a.b", ()),
+        (("a.*.c",), "a.b.c", ("a.*.c",)),
+        (("a.*.c",), "a.c", ()),
+        (("a.#",), "a", ("a.#",)),
+        (("a.#",), "a.b.c", ("a.#",)),
+        (("#",), "a.b.c", ("#",)),
+        (("#.c",), "c", ("#.c",)),
+        (("a.#.c",), "a.b.b.c", ("a.#.c",)),
+        (("a.#.c",), "a.b.b.d", ()),
+        (("a.*", "a.#", "#", "b.*"), "a.b", ("a.*", "a.#", "#")),
+        (("#.#", "*.#"), "a", ("#.#", "*.#")),
+))
+def test_match(patterns: t.Sequence[str], routing_key: str, expected: t.Sequence[str]) -> None:
+    trie: TopicRoutingTrie[str] = TopicRoutingTrie()
+    for pattern in patterns:
+        trie.add(pattern, pattern)
+
+    assert trie.match(routing_key) == expected
+    assert trie.match(routing_key) == expected
+
+
+def test_match_fans_out_to_all_values_of_pattern() -> None:
+    trie: TopicRoutingTrie[int] = TopicRoutingTrie()
+    trie.add("a.b", 1)
+    trie.add("a.*", 2)
+    trie.add("a.b", 3)
+
+    assert trie.match("a.b") == (1, 2, 3)
+    assert len(trie) == 3
@@ -0,0 +1,116 @@
+import json
+import typing as t
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import aio_pika
+from aio_pika.abc import AbstractMessage
+
+from asynchron.amqp.consumer.pipeline import ConsumerPipelineCompiler
+from asynchron.amqp.publisher.exchange import ExchangeMessagePublisher
+from asynchron.amqp.tracing import (
+    TRACEPARENT_HEADER,
+    CallbackSpanExporter,
+    JsonLinesFileSpanExporter,
+    Span,
+    SpanContext,
+    Tracer,
+)
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import CallableMessageConsumer
+from tests.asynchron.amqp.test_consumer_pipeline import BodyDecoder
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_SPAN_ID = "00f067aa0ba902b7"
+
+
+def create_message(headers: t.Dict[str, object]) -> MagicMock:
+    message = MagicMock()
+    message.body = b"payload"
+    message.processed = False
+    message.headers_raw = headers
+    message.ack = AsyncMock()
+    message.reject = AsyncMock()
+
+    return message
+
+
+async def test_unsampled_message_is_not_traced() -> None:
+    spans: t.List[Span] = []
+    handler = AsyncMock()
+    compiler = ConsumerPipelineCompiler(tracer=Tracer(CallbackSpanExporter(spans.append), sample_ratio=0.0))
+    consumer = compiler.compile(BodyDecoder(), CallableMessageConsumer(handler),
+                                AmqpConsumerBindings(exchange_name="test", binding_keys=("test",)))
+
+    await consumer.func(create_message({}))
+    await consumer.func(create_message({TRACEPARENT_HEADER: f"00-{TRACE_ID}-{PARENT_SPAN_ID}-00"}))
+
+    assert handler.await_count == 2
+    assert spans == []
+
+
+async def test_sampled_message_is_traced_through_consume_and_publish() -> None:
+    spans: t.List[Span] = []
+    published: t.List[AbstractMessage] = []
+    tracer = Tracer(CallbackSpanExporter(spans.append), sample_ratio=0.0)
+
+    exchange = MagicMock()
+    exchange.publish = AsyncMock(side_effect=lambda message, **_: published.append(message))
+    publisher = ExchangeMessagePublisher("output", True, exchange=exchange, binding="test:output", tracer=tracer)
+
+    async def handle(message: bytes) -> None:
+        await publisher.publish(aio_pika.Message(body=message))
+
+    consumer = ConsumerPipelineCompiler(tracer=tracer).compile(
+        BodyDecoder(),
+        CallableMessageConsumer(handle),
+        AmqpConsumerBindings(exchange_name="test", binding_keys=("test",)),
+    )
+
+    await consumer.func(create_message({TRACEPARENT_HEADER: f"00-{TRACE_ID}-{PARENT_SPAN_ID}-01"}))
+
+    by_name = {span.name: span for span in spans}
+    assert [span.name for span in spans] == ["decode", "publish", "handle", "consume"]
+    assert {span.trace_id for span in spans} == {TRACE_ID}
+    assert by_name["consume"].parent_span_id == PARENT_SPAN_ID
+    assert by_name["decode"].parent_span_id == by_name["consume"].span_id
+    assert by_name["handle"].parent_span_id == by_name["consume"].span_id
+    assert by_name["publish"].parent_span_id == by_name["handle"].span_id
+    assert published[0].headers[TRACEPARENT_HEADER] == f"00-{TRACE_ID}-{by_name['publish'].span_id}-01"
+
+
+async def test_key_ordered_handle_span_is_parented_by_its_own_consume_span() -> None:
+    spans: t.List[Span] = []
+    tracer = Tracer(CallbackSpanExporter(spans.append))
+    # decoded messages are the same object, spans are not keyed by identity.
+    consumer = ConsumerPipelineCompiler(tracer=tracer).compile(
+        BodyDecoder(),
+        CallableMessageConsumer(AsyncMock()),
+        AmqpConsumerBindings(exchange_name="test", binding_keys=("test",), ordering_key_header="key"),
+    )
+
+    for key in ("a", "b"):
+        message = create_message({"key": key})
+        message.headers = message.headers_raw
+        await consumer.func(message)
+
+    await consumer.drain()
+
+    consumes = {span.span_id for span in spans if span.name == "consume"}
+    handles = [span for span in spans if span.name == "handle"]
+    assert len(handles) == 2
+    assert {span.parent_span_id for span in handles} == consumes
+
+
+def test_file_exporter_appends_json_lines(tmp_path: Path) -> None:
+    path = tmp_path / "spans.jsonl"
+    exporter = JsonLinesFileSpanExporter(path)
+    tracer = Tracer(exporter)
+
+    tracer.finish("publish", "test:output", SpanContext(trace_id=TRACE_ID, span_id=PARENT_SPAN_ID), 1)
+    tracer.finish("publish", "test:output", SpanContext(trace_id=TRACE_ID, span_id=PARENT_SPAN_ID), 2)
+    exporter.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["started_at"] for line in lines] == [1, 2]
+    assert lines[0]["trace_id"] == TRACE_ID
@@ -0,0 +1,61 @@
+import asyncio
+import time
+import typing as t
+from unittest.mock import AsyncMock, MagicMock
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from asynchron.amqp.consumer.pipeline import ConsumerPipelineCompiler
+from asynchron.amqp.consumer.watchdog import WatchdogMiddleware
+from asynchron.amqp.controller import AioPikaBasedAmqpController
+from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.consumer import CallableMessageConsumer
+from asynchron.core.message import MessageDecoder
+from asynchron.core.prometheus import PrometheusMetrics
+from asynchron.core.watchdog import EventLoopWatchdog, SlowCallback
+
+
+class BlockingDecoder(MessageDecoder[AbstractIncomingMessage, bytes]):
+    def decode(self, message: AbstractIncomingMessage) -> bytes:
+        time.sleep(0.3)
+        return message.body
+
+
+async def test_watchdog_attributes_blocked_loop_to_binding() -> None:
+    metrics = PrometheusMetrics()
+    reports: t.List[SlowCallback] = []
+    watchdog = EventLoopWatchdog(metrics=metrics, interval=0.01, slow_callback_threshold=0.1,
+                                 on_slow_callback=reports.append)
+
+    async def handle(message: bytes) -> None:
+        pass
+
+    consumer = ConsumerPipelineCompiler(is_processing_enabled=False, middlewares=[WatchdogMiddleware(watchdog)]) \
+        .compile(BlockingDecoder(), CallableMessageConsumer(handle),
+                 AmqpConsumerBindings(exchange_name="sensors", binding_keys=("temperature",)))
+
+    await watchdog.start()
+    await consumer.func(MagicMock(body=b"payload", headers_raw={}))
+    await watchdog.stop()
+
+    assert len(reports) == 1
+    assert reports[0].binding == "sensors:temperature"
+    assert any("time.sleep" in line for line in reports[0].stack)
+    assert 'asynchron_blocked_event_loop_total{binding="sensors:temperature"} 1' in metrics.render()
+    assert 'asynchron_slow_handlers_total{binding="sensors:temperature"} 1' in metrics.render()
+
+
+async def test_controller_attributes_consumers_to_bindings() -> None:
+    watchdog = EventLoopWatchdog()
+    bindings: t.List[t.Optional[str]] = []
+
+    async def handle(message: bytes) -> None:
+        bindings.append(watchdog.get_task_binding(asyncio.current_task()))
+
+    controller = AioPikaBasedAmqpController(MagicMock(), watchdog=watchdog)
+    consumer = controller.bind_consumer(BlockingDecoder(), CallableMessageConsumer(handle),
+                                        AmqpConsumerBindings(exchange_name="sensors", binding_keys=("humidity",)))
+    await consumer.consume(MagicMock(body=b"payload", headers_raw={}, processed=False, ack=AsyncMock()))
+
+    assert bindings == ["sensors:humidity"]
+    assert watchdog.get_task_binding(asyncio.current_task()) is None
@@ -0,0 +1,106 @@
+import asyncio
+import builtins
+import os
+import signal
+import typing as t
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+from asynchron.core.application import Application, get_event_loop_factory
+from asynchron.core.controller import Runnable
+from asynchron.core.supervisor import WORKER_INDEX_ENV
+
+MARKER_DIR_ENV = "ASYNCHRON_TEST_MARKER_DIR"
+
+
+class StoppingRunnable(Runnable):
+    def __init__(self, app: t.Callable[[], Application]) -> None:
+        self.__app = app
+        self.loop: t.Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.__app().stop()
+
+    async def stop(self) -> None:
+        pass
+
+
+def test_run_sync_uses_loop_from_event_loop_factory() -> None:
+    created: t.List[asyncio.AbstractEventLoop] = []
+
+    def create_loop() -> asyncio.AbstractEventLoop:
+        created.append(asyncio.new_event_loop())
+        return created[-1]
+
+    runnable = StoppingRunnable(lambda: app)
+
+    @asynccontextmanager
+    async def runnable_factory() -> t.AsyncIterator[Runnable]:
+        yield runnable
+
+    app = Application(runnable_factory=runnable_factory, event_loop_policy=create_loop)
+    app.run_sync()
+
+    assert runnable.loop is created[0]
+    assert created[0].is_closed()
+
+
+def test_auto_policy_falls_back_to_asyncio_without_uvloop(monkeypatch: pytest.MonkeyPatch) -> None:
+    original_import = builtins.__import__
+
+    def import_without_uvloop(name: str, *args: t.Any, **kwargs: t.Any) -> t.Any:
+        if name == "uvloop":
+            raise ImportError(name)
+
+        return original_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", import_without_uvloop)
+
+    assert get_event_loop_factory("auto") is asyncio.new_event_loop
+    assert get_event_loop_factory("asyncio") is asyncio.new_event_loop
+    with pytest.raises(ImportError):
+        get_event_loop_factory("uvloop")
+
+
+class MarkingRunnable(Runnable):
+    async def start(self) -> None:
+        marker = Path(os.environ[MARKER_DIR_ENV]) / f"worker-{os.environ[WORKER_INDEX_ENV]}"
+        marker.write_text(str(os.getpid()))
+        # drains and exits like on shutdown of the supervisor.
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    async def stop(self) -> None:
+        pass
+
+
+def create_marking_application() -> Application:
+    @asynccontextmanager
+    async def runnable_factory() -> t.AsyncIterator[Runnable]:
+        yield MarkingRunnable()
+
+    return Application(runnable_factory=runnable_factory)
+
+
+def test_spawned_workers_import_application_from_entry_point(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv(MARKER_DIR_ENV, str(tmp_path))
+
+    create_marking_application().run_workers(
+        workers=2,
+        stagger_delay=0.01,
+        shutdown_timeout=5.0,
+        start_method="spawn",
+        entry_point=f"{__name__}:create_marking_application",
+    )
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["worker-0", "worker-1"]
+
+
+def test_spawned_workers_require_entry_point() -> None:
+    with pytest.raises(ValueError):
+        create_marking_application().run_workers(workers=1, start_method="spawn")
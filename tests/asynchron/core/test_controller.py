@@ -0,0 +1,40 @@
+import typing as t
+from unittest.mock import MagicMock
+
+import pytest
+
+from asynchron.core.consumer import MessageConsumer
+from asynchron.core.controller import Controller
+from asynchron.core.message import MessageDecoder, MessageEncoder
+from asynchron.core.publisher import MessagePublisher
+
+T = t.TypeVar("T")
+
+
+class PublishingController(Controller[bytes, str, bytes, str]):
+    def bind_consumer(
+            self,
+            decoder: MessageDecoder[bytes, T],
+            consumer: MessageConsumer[T],
+            bindings: str,
+    ) -> MessageConsumer[bytes]:
+        raise NotImplementedError
+
+    def bind_publisher(self, encoder: MessageEncoder[T, bytes], bindings: str) -> MessagePublisher[T]:
+        raise NotImplementedError
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+def test_controller_without_rpc_rejects_rpc_bindings() -> None:
+    controller = PublishingController()
+
+    with pytest.raises(ValueError):
+        controller.bind_requester(MagicMock(), MagicMock(), "requests")
+
+    with pytest.raises(ValueError):
+        controller.bind_responder(MagicMock(), MagicMock(), MagicMock(), "requests")
@@ -0,0 +1,31 @@
+from asynchron.core.prometheus import PrometheusMetrics
+
+
+def test_render_exposes_counters_gauges_and_cumulative_histograms() -> None:
+    metrics = PrometheusMetrics(buckets=(0.1, 1.0))
+    metrics.increment("published", "sensors:temperature")
+    metrics.increment("published", "sensors:temperature", 2)
+    metrics.set("prefetch_count", "sensors:#", 16)
+    metrics.observe("publish_seconds", "sensors:temperature", 0.05)
+    metrics.observe("publish_seconds", "sensors:temperature", 0.5)
+    metrics.observe("publish_seconds", "sensors:temperature", 5.0)
+
+    assert metrics.render().splitlines() == [
+        "# TYPE asynchron_published_total counter",
+        'asynchron_published_total{binding="sensors:temperature"} 3',
+        "# TYPE asynchron_prefetch_count gauge",
+        'asynchron_prefetch_count{binding="sensors:#"} 16',
+        "# TYPE asynchron_publish_seconds histogram",
+        'asynchron_publish_seconds_bucket{binding="sensors:temperature",le="0.1"} 1',
+        'asynchron_publish_seconds_bucket{binding="sensors:temperature",le="1.0"} 2',
+        'asynchron_publish_seconds_bucket{binding="sensors:temperature",le="+Inf"} 3',
+        'asynchron_publish_seconds_sum{binding="sensors:temperature"} 5.55',
+        'asynchron_publish_seconds_count{binding="sensors:temperature"} 3',
+    ]
+
+
+def test_render_escapes_label_values() -> None:
+    metrics = PrometheusMetrics()
+    metrics.increment("consumed", 'a"b\\c')
+
+    assert 'asynchron_consumed_total{binding="a\\"b\\\\c"} 1' in metrics.render()
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import os
+import signal
+import time
+from pathlib import Path
+
+import pytest
+
+from asynchron.core.profiler import SamplingProfiler
+from asynchron.core.watchdog import EventLoopWatchdog
+
+
+def burn_cpu(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+async def test_profiler_writes_collapsed_stacks_attributed_to_binding(tmp_path: Path) -> None:
+    watchdog = EventLoopWatchdog()
+    profiler = SamplingProfiler(output_dir=tmp_path, interval=0.001, signal_number=None, watchdog=watchdog)
+
+    async def handle() -> None:
+        task = watchdog.track("sensors:temperature")
+        for _ in range(20):
+            burn_cpu(0.01)
+            await asyncio.sleep(0)
+
+        watchdog.untrack(task, "sensors:temperature", 0.0)
+
+    handler = asyncio.create_task(handle())
+    path = await profiler.profile(0.15)
+    await handler
+
+    samples = [line.rsplit(" ", 1) for line in path.read_text().splitlines()]
+    burning = [(stack, int(count)) for stack, count in samples if "burn_cpu" in stack]
+
+    assert burning
+    assert all(stack.startswith("sensors:temperature;") for stack, _ in burning)
+    assert sum(count for _, count in burning) > 0
+
+
+async def test_profiler_is_triggered_by_control_socket(tmp_path: Path) -> None:
+    socket_path = tmp_path / "profiler.sock"
+    profiler = SamplingProfiler(output_dir=tmp_path, signal_number=None, control_socket_path=socket_path)
+
+    await profiler.start()
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+        writer.write(b"profile 0.05\n")
+        await writer.drain()
+        response = (await reader.readline()).decode().strip()
+        writer.close()
+
+    finally:
+        await profiler.stop()
+
+    assert Path(response).parent == tmp_path
+    assert Path(response).exists()
+    assert not socket_path.exists()
+
+
+async def test_profile_triggered_by_signal_is_logged(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    profiler = SamplingProfiler(output_dir=tmp_path, duration=0.05, signal_number=signal.SIGUSR2)
+
+    await profiler.start()
+    try:
+        with caplog.at_level(logging.INFO, logger="asynchron.core.profiler"):
+            os.kill(os.getpid(), signal.SIGUSR2)
+            for _ in range(100):
+                if caplog.records:
+                    break
+
+                await asyncio.sleep(0.01)
+
+    finally:
+        await profiler.stop()
+
+    assert [Path(record.getMessage().rsplit(" ", 1)[1]).parent for record in caplog.records] == [tmp_path]
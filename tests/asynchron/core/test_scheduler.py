@@ -0,0 +1,95 @@
+import asyncio
+import random
+import time
+import typing as t
+from pathlib import Path
+
+from asynchron.core.publisher import MessagePublisher
+from asynchron.core.scheduler import FileScheduleStore, ScheduledMessagePublisher
+from asynchron.core.timer import HierarchicalTimerWheel
+
+
+class RecordingPublisher(MessagePublisher[str]):
+    def __init__(self) -> None:
+        self.published: "asyncio.Queue[t.Tuple[str, float]]" = asyncio.Queue()
+
+    async def publish(self, message: str) -> None:
+        await self.published.put((message, time.time()))
+
+
+def test_wheel_returns_items_when_they_are_due() -> None:
+    # small slots, so items are cascaded through all levels and the overflow slot.
+    wheel: HierarchicalTimerWheel[int] = HierarchicalTimerWheel(resolution=1.0, slot_bits=2, levels=2)
+    rnd = random.Random(42)
+    dues = [rnd.randint(0, 100) for _ in range(1000)]
+    for item, due in enumerate(dues):
+        wheel.add(due, item)
+
+    now = 0.0
+    while len(wheel):
+        next_due = wheel.get_next_due()
+        assert next_due is not None
+
+        now = max(now, next_due)
+        for item in wheel.advance(now):
+            assert dues[item] <= now
+
+        assert all(dues[item] > now for _, item in wheel.iter_items())
+
+
+async def test_scheduled_message_is_published_when_due() -> None:
+    publisher = RecordingPublisher()
+    scheduled = ScheduledMessagePublisher(publisher)
+    await scheduled.start()
+
+    try:
+        started_at = time.time()
+        await scheduled.publish_after("later", 0.05)
+        await scheduled.publish("now")
+
+        assert (await asyncio.wait_for(publisher.published.get(), 1.0))[0] == "now"
+        message, published_at = await asyncio.wait_for(publisher.published.get(), 1.0)
+        assert message == "later"
+        assert published_at - started_at >= 0.05
+
+    finally:
+        await scheduled.stop()
+
+
+async def test_scheduled_messages_are_restored_from_file(tmp_path: Path) -> None:
+    path = tmp_path / "scheduled.log"
+    publisher = RecordingPublisher()
+
+    scheduled: ScheduledMessagePublisher[str] = ScheduledMessagePublisher(publisher, FileScheduleStore(path))
+    await scheduled.start()
+    await scheduled.publish_after("sent", 0.0)
+    await scheduled.publish_after("pending", 3600.0)
+    assert (await asyncio.wait_for(publisher.published.get(), 1.0))[0] == "sent"
+    await scheduled.stop()
+
+    restored: ScheduledMessagePublisher[str] = ScheduledMessagePublisher(publisher, FileScheduleStore(path))
+    await restored.start()
+    await restored.stop()
+
+    assert restored.scheduled_count == 1
+
+
+async def test_messages_scheduled_before_start_are_stored_after_restored_ones(tmp_path: Path) -> None:
+    path = tmp_path / "scheduled.log"
+    publisher = RecordingPublisher()
+
+    scheduled: ScheduledMessagePublisher[str] = ScheduledMessagePublisher(publisher, FileScheduleStore(path))
+    await scheduled.start()
+    await scheduled.publish_after("first", 3600.0)
+    await scheduled.stop()
+
+    restored: ScheduledMessagePublisher[str] = ScheduledMessagePublisher(publisher, FileScheduleStore(path))
+    await restored.publish_after("second", 3600.0)
+    assert restored.scheduled_count == 1
+
+    await restored.start()
+    await restored.stop()
+
+    store: FileScheduleStore[str] = FileScheduleStore(path)
+    assert sorted(message for _, _, message in store.load()) == ["first", "second"]
+    store.close()
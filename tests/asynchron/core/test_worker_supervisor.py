@@ -0,0 +1,52 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from asynchron.core.supervisor import WORKER_INDEX_ENV, WorkerSupervisor
+
+
+class CrashingOnceWorker:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def __call__(self) -> None:
+        index = os.environ[WORKER_INDEX_ENV]
+        marker = self.directory / f"started-{index}"
+
+        if not marker.exists():
+            marker.write_text(str(os.getpid()))
+            sys.exit(1)
+
+        (self.directory / f"restarted-{index}").write_text(str(os.getpid()))
+        time.sleep(60)
+
+
+def test_supervisor_restarts_crashed_workers_and_terminates_them_on_stop(tmp_path: Path) -> None:
+    supervisor = WorkerSupervisor(
+        target=CrashingOnceWorker(tmp_path),
+        workers=2,
+        stagger_delay=0.01,
+        restart_delay=0.01,
+        shutdown_timeout=5.0,
+        poll_interval=0.01,
+        start_method="fork",
+    )
+
+    def stop_when_restarted() -> None:
+        deadline = time.monotonic() + 10.0
+        while time.monotonic() < deadline and len(list(tmp_path.glob("restarted-*"))) < 2:
+            time.sleep(0.01)
+
+        supervisor.stop()
+
+    stopper = threading.Thread(target=stop_when_restarted)
+    stopper.start()
+    started_at = time.monotonic()
+    supervisor.run()
+    stopper.join()
+
+    assert sorted(path.name for path in tmp_path.glob("restarted-*")) == ["restarted-0", "restarted-1"]
+    assert supervisor.restarts == 2
+    assert time.monotonic() - started_at < 10.0
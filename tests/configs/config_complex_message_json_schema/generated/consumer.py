@@ -1,10 +1,12 @@
 # @formatter:off
 import abc
 
-from asynchron.amqp.controller import AioPikaBasedAmqpController
+from aio_pika.abc import AbstractIncomingMessage, AbstractMessage
+
 from asynchron.amqp.serializer.pydantic import PydanticMessageSerializer
-from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings
 from asynchron.core.consumer import CallableMessageConsumer
+from asynchron.core.controller import Controller
 
 from .message import (
     MainFoo,
@@ -18,7 +20,7 @@ class ComplexSchemaObjectsConsumerFacade(metaclass=abc.ABCMeta):
 
     def __init__(
             self,
-            controller: AioPikaBasedAmqpController,
+            controller: Controller[AbstractIncomingMessage, AmqpConsumerBindings, AbstractMessage, AmqpPublisherBindings],
     ) -> None:
         controller.bind_consumer(
             decoder=PydanticMessageSerializer(
@@ -36,7 +38,28 @@ class ComplexSchemaObjectsConsumerFacade(metaclass=abc.ABCMeta):
                 is_auto_delete_enabled=None,
                 is_exclusive=None,
                 is_durable=None,
+                is_exchange_auto_delete_enabled=None,
+                is_exchange_durable=None,
+                queue_type=None,
+                queue_mode=None,
+                max_length=None,
+                overflow=None,
+                is_single_active_consumer=None,
                 prefetch_count=None,
+                min_prefetch_count=None,
+                max_prefetch_count=None,
+                ordering_key_header=None,
+                ordering_key_field=None,
+                ordering_queue_size=None,
+                retry_delays=None,
+                retry_attempts=None,
+                max_message_age=None,
+                max_in_flight_bytes=None,
+                handler_executor=None,
+                admitted_headers=None,
+                admitted_app_ids=None,
+                max_timestamp_age=None,
+                inadmissible_action=None,
             ),
         )
 
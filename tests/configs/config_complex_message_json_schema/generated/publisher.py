@@ -1,7 +1,9 @@
 # @formatter:off
-from asynchron.amqp.controller import AioPikaBasedAmqpController
+from aio_pika.abc import AbstractIncomingMessage, AbstractMessage
+
 from asynchron.amqp.serializer.pydantic import PydanticMessageSerializer
-from asynchron.core.amqp import AmqpPublisherBindings
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings
+from asynchron.core.controller import Controller
 from asynchron.core.publisher import MessagePublisher
 
 from .message import (
@@ -16,7 +18,7 @@ class ComplexSchemaObjectsPublisherFacade:
 
     def __init__(
             self,
-            controller: AioPikaBasedAmqpController,
+            controller: Controller[AbstractIncomingMessage, AmqpConsumerBindings, AbstractMessage, AmqpPublisherBindings],
     ) -> None:
         self.__foo_publisher: MessagePublisher[MainFoo] = controller.bind_publisher(
             encoder=PydanticMessageSerializer(
@@ -27,6 +29,15 @@ class ComplexSchemaObjectsPublisherFacade:
                 routing_key="foo",
                 is_mandatory=None,
                 prefetch_count=None,
+                is_auto_delete_enabled=None,
+                is_durable=None,
+                expiration=None,
+                priority=None,
+                delivery_mode=None,
+                cc=None,
+                bcc=None,
+                is_timestamp_enabled=None,
+                user_id=None,
             ),
         )
 
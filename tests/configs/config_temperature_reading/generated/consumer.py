@@ -1,10 +1,12 @@
 # @formatter:off
 import abc
 
-from asynchron.amqp.controller import AioPikaBasedAmqpController
+from aio_pika.abc import AbstractIncomingMessage, AbstractMessage
+
 from asynchron.amqp.serializer.pydantic import PydanticMessageSerializer
-from asynchron.core.amqp import AmqpConsumerBindings
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings
 from asynchron.core.consumer import CallableMessageConsumer
+from asynchron.core.controller import Controller
 
 from .message import (
     SensorReading,
@@ -18,8 +20,49 @@ class TemperatureReadingsConsumerFacade(metaclass=abc.ABCMeta):
 
     def __init__(
             self,
-            controller: AioPikaBasedAmqpController,
+            controller: Controller[AbstractIncomingMessage, AmqpConsumerBindings, AbstractMessage, AmqpPublisherBindings],
     ) -> None:
+        controller.bind_responder(
+            decoder=PydanticMessageSerializer(
+                model=SensorReading,  # type: ignore[misc]
+            ),
+            encoder=PydanticMessageSerializer(
+                model=SensorReading,  # type: ignore[misc]
+            ),
+            responder=self.consume_temperature_calibrate,
+            bindings=AmqpConsumerBindings(
+                exchange_name="commands",
+                binding_keys=(
+                    "temperature.calibrate",
+                ),
+                queue_name=None,
+                is_auto_delete_enabled=None,
+                is_exclusive=None,
+                is_durable=None,
+                is_exchange_auto_delete_enabled=None,
+                is_exchange_durable=None,
+                queue_type=None,
+                queue_mode=None,
+                max_length=None,
+                overflow=None,
+                is_single_active_consumer=None,
+                prefetch_count=None,
+                min_prefetch_count=None,
+                max_prefetch_count=None,
+                ordering_key_header=None,
+                ordering_key_field=None,
+                ordering_queue_size=None,
+                retry_delays=None,
+                retry_attempts=None,
+                max_message_age=None,
+                max_in_flight_bytes=None,
+                handler_executor=None,
+                admitted_headers=None,
+                admitted_app_ids=None,
+                max_timestamp_age=None,
+                inadmissible_action=None,
+            ),
+        )
         controller.bind_consumer(
             decoder=PydanticMessageSerializer(
                 model=SensorReading,  # type: ignore[misc]
@@ -36,10 +79,44 @@ class TemperatureReadingsConsumerFacade(metaclass=abc.ABCMeta):
                 is_auto_delete_enabled=True,
                 is_exclusive=None,
                 is_durable=None,
+                is_exchange_auto_delete_enabled=True,
+                is_exchange_durable=None,
+                queue_type=None,
+                queue_mode=None,
+                max_length=100000,
+                overflow="reject-publish",
+                is_single_active_consumer=None,
                 prefetch_count=100,
+                min_prefetch_count=None,
+                max_prefetch_count=None,
+                ordering_key_header=None,
+                ordering_key_field="sensor_id",
+                ordering_queue_size=None,
+                retry_delays=(
+                    1000,
+                    10000,
+                ),
+                retry_attempts=3,
+                max_message_age=60000,
+                max_in_flight_bytes=10485760,
+                handler_executor=None,
+                admitted_headers=(
+                    ("tenant", ("acme", "globex",)),
+                ),
+                admitted_app_ids=None,
+                max_timestamp_age=60000,
+                inadmissible_action=None,
             ),
         )
 
+    @abc.abstractmethod
+    async def consume_temperature_calibrate(
+            self,
+            message: SensorReading,
+    ) -> SensorReading:
+        """Calibrates a sensor reading and replies with the calibrated one"""
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def consume_temperature_measured(
             self,
@@ -1,8 +1,13 @@
 # @formatter:off
-from asynchron.amqp.controller import AioPikaBasedAmqpController
+import typing as t
+
+from aio_pika.abc import AbstractIncomingMessage, AbstractMessage
+
 from asynchron.amqp.serializer.pydantic import PydanticMessageSerializer
-from asynchron.core.amqp import AmqpPublisherBindings
+from asynchron.core.amqp import AmqpConsumerBindings, AmqpPublisherBindings
+from asynchron.core.controller import Controller
 from asynchron.core.publisher import MessagePublisher
+from asynchron.core.requester import MessageRequester
 
 from .message import (
     SensorReading,
@@ -16,8 +21,31 @@ class TemperatureReadingsPublisherFacade:
 
     def __init__(
             self,
-            controller: AioPikaBasedAmqpController,
+            controller: Controller[AbstractIncomingMessage, AmqpConsumerBindings, AbstractMessage, AmqpPublisherBindings],
     ) -> None:
+        self.__temperature_calibrate_requester: MessageRequester[SensorReading, SensorReading] = controller.bind_requester(
+            encoder=PydanticMessageSerializer(
+                model=SensorReading,  # type: ignore[misc]
+            ),
+            decoder=PydanticMessageSerializer(
+                model=SensorReading,  # type: ignore[misc]
+            ),
+            bindings=AmqpPublisherBindings(
+                exchange_name="commands",
+                routing_key="temperature.calibrate",
+                is_mandatory=None,
+                prefetch_count=None,
+                is_auto_delete_enabled=None,
+                is_durable=None,
+                expiration=None,
+                priority=None,
+                delivery_mode=None,
+                cc=None,
+                bcc=None,
+                is_timestamp_enabled=None,
+                user_id=None,
+            ),
+        )
         self.__temperature_measured_publisher: MessagePublisher[SensorReading] = controller.bind_publisher(
             encoder=PydanticMessageSerializer(
                 model=SensorReading,  # type: ignore[misc]
@@ -27,9 +55,26 @@ class TemperatureReadingsPublisherFacade:
                 routing_key="temperature.measured",
                 is_mandatory=None,
                 prefetch_count=None,
+                is_auto_delete_enabled=True,
+                is_durable=None,
+                expiration=60000,
+                priority=None,
+                delivery_mode=1,
+                cc=None,
+                bcc=None,
+                is_timestamp_enabled=True,
+                user_id=None,
             ),
         )
 
+    async def request_temperature_calibrate(
+            self,
+            message: SensorReading,
+            timeout: t.Optional[float] = None,
+    ) -> SensorReading:
+        """Calibrates a sensor reading and replies with the calibrated one"""
+        return await self.__temperature_calibrate_requester.request(message, timeout)
+
     async def publish_temperature_measured(
             self,
             message: SensorReading,
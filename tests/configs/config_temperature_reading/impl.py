@@ -28,6 +28,16 @@ class TemperatureReadingsConsumerFacadeImpl(TemperatureReadingsConsumerFacade):
             temperature=message.temperature,
         ))
 
+    async def consume_temperature_calibrate(
+            self,
+            message: SensorReading,
+    ) -> SensorReading:
+        return SensorReading(
+            baseUnit=message.base_unit,
+            sensorId=message.sensor_id,
+            temperature=message.temperature,
+        )
+
 
 @builder.runnable_factory
 async def startup() -> t.AsyncIterator[Runnable]:
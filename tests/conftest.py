@@ -3,9 +3,11 @@ from collections import OrderedDict
 from pathlib import Path
 
 import click
+import pytest
 from click.testing import CliRunner, Result
 from pytest_cases import fixture
 
+from tests.amqp_broker import AmqpBrokerEmulator
 from tests.cli import CliInput
 
 
@@ -69,3 +71,10 @@ def dir_files_loader(file_loader: t.Callable[[Path], str]) -> t.Callable[[Path],
         return OrderedDict(sorted(results.items(), key=lambda pair: str(pair[0])))
 
     return load_dir
+
+
+# async fixtures are declared with pytest itself, so pytest-asyncio runs them.
+@pytest.fixture()
+async def broker() -> t.AsyncIterator[AmqpBrokerEmulator]:
+    async with AmqpBrokerEmulator() as broker:
+        yield broker